@@ -0,0 +1,66 @@
+"""Shared CSS animation classes — quantized replacements for per-element SMIL.
+
+Background stars used to carry their own ``<animate>`` with a unique
+duration and opacity range. Quantizing those parameters lets many stars
+share one CSS class (and one ``@keyframes``), so each star is a single
+element and the browser tracks a handful of animation timelines instead of
+one per star.
+"""
+
+import math
+
+OPACITY_STEP = 0.1
+DURATION_STEP = 2.0
+
+
+def quantize(value: float, step: float) -> float:
+    """Round value to the nearest multiple of step (half up), never below one step."""
+    # round() first so 0.15 / 0.1 == 1.4999... still counts as a half
+    return max(round(math.floor(round(value / step, 6) + 0.5) * step, 2), step)
+
+
+class AnimationClasses:
+    """Collects quantized animation classes for one SVG.
+
+    Args:
+        prefix: class/keyframes name prefix, unique per template
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._keyframes = {}  # name -> css
+        self._classes = {}    # name -> css
+
+    def __len__(self):
+        return len(self._classes)
+
+    def twinkle(self, low: float, high: float, duration: float) -> str:
+        """Return the class for an opacity low -> high -> low loop.
+
+        Equivalent to ``<animate attributeName="opacity" values="low;high;low"
+        dur="duration" repeatCount="indefinite"/>`` after quantization.
+        """
+        low = quantize(low, OPACITY_STEP)
+        high = quantize(high, OPACITY_STEP)
+        duration = quantize(duration, DURATION_STEP)
+        frames = f"{self.prefix}-tw-{round(low * 100)}-{round(high * 100)}"
+        name = f"{frames}-{duration:g}"
+        if frames not in self._keyframes:
+            self._keyframes[frames] = (
+                f"      @keyframes {frames} {{\n"
+                f"        0%, 100% {{ opacity: {low:g}; }}\n"
+                f"        50% {{ opacity: {high:g}; }}\n"
+                f"      }}"
+            )
+        if name not in self._classes:
+            self._classes[name] = (
+                f"      .{name} {{ animation: {frames} {duration:g}s linear infinite; }}"
+            )
+        return name
+
+    def render(self) -> str:
+        """Return a <style> block with every keyframes and class, or "" if empty."""
+        if not self._classes:
+            return ""
+        rules = "\n".join([*self._keyframes.values(), *self._classes.values()])
+        return f"    <style>\n{rules}\n    </style>"
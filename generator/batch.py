@@ -0,0 +1,284 @@
+"""Batch mode — render many profiles from a roster in one process.
+
+A roster is either a directory of config files (one full config per user)
+or a YAML file:
+
+    base: config.yml          # optional config every user starts from
+    users:
+      - alice                 # just a username
+      - username: bob         # or overrides deep-merged onto the base
+        profile:
+          name: Bob
+
+All users share one data source (and so one HTTP session), the process-wide
+fragment cache and the imported templates. Users are processed on a thread
+pool: fetching is network-bound, so threads overlap the API round trips.
+Each user is written to ``<output>/<username>/`` and ``summary.json`` in the
+output root records per-user timing and failures.
+
+With a WorkQueue the run is resumable: per-user progress is persisted, transient
+failures are retried with backoff, and users rendered from still-fresh data
+are skipped (see generator.work_queue).
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import requests
+import yaml
+
+from generator.config import ConfigError, validate_config
+from generator.output import write_svgs
+from generator.sources import FETCH_ERRORS
+from generator.svg_builder import SVGBuilder
+from generator.utils import resolve_named_theme
+
+logger = logging.getLogger(__name__)
+
+# GitHub logins: letters, digits and single hyphens (also keeps paths safe)
+USERNAME_RE = re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9]|-(?=[A-Za-z0-9])){0,38}$")
+
+SUMMARY_FILE = "summary.json"
+QUEUE_FILE = "queue.sqlite"
+
+
+class RosterEntry(NamedTuple):
+    """One user to render: a name for reporting and the raw (unvalidated) config."""
+
+    name: str
+    config: dict
+
+
+class BatchOptions(NamedTuple):
+    """Render options applied to every user of a batch."""
+
+    themes: tuple = ()
+    bundle: bool = False
+    lite: bool = False
+    variants: tuple = ()
+
+
+def _merge(base: dict, overrides: dict) -> dict:
+    """Deep-merge overrides onto a copy of base (mappings merge, the rest replaces)."""
+    merged = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def _load_yaml(path: str):
+    with open(path, "r") as f:
+        return yaml.safe_load(f)
+
+
+def load_roster(path: str) -> list:
+    """Load a roster file or directory into a list of RosterEntry.
+
+    Raises:
+        ConfigError: if the roster itself is malformed
+    """
+    if os.path.isdir(path):
+        entries = []
+        for filename in sorted(os.listdir(path)):
+            if filename.endswith((".yml", ".yaml")):
+                config = _load_yaml(os.path.join(path, filename)) or {}
+                name = config.get("username") if isinstance(config, dict) else None
+                entries.append(RosterEntry(name or filename, config))
+        return entries
+
+    roster = _load_yaml(path)
+    if not isinstance(roster, dict) or not isinstance(roster.get("users"), list):
+        raise ConfigError("Roster must be a mapping with a 'users' list.")
+    base = {}
+    if roster.get("base"):
+        base_path = os.path.join(os.path.dirname(os.path.abspath(path)), roster["base"])
+        base = _load_yaml(base_path) or {}
+    entries = []
+    for user in roster["users"]:
+        if isinstance(user, str):
+            user = {"username": user}
+        if not isinstance(user, dict) or not user.get("username"):
+            raise ConfigError(f"Roster users must be usernames or mappings with a username, got {user!r}.")
+        entries.append(RosterEntry(str(user["username"]), _merge(base, user)))
+    return entries
+
+
+def _result(name: str, **fields) -> dict:
+    result = {"user": name, "ok": False, "skipped": False, "error": None, "attempts": 1,
+              "fetch_s": 0.0, "render_s": 0.0, "files": 0, "written": 0}
+    result.update(fields)
+    return result
+
+
+def _digest(entry: RosterEntry, options: BatchOptions) -> str:
+    """Fingerprint of everything besides the data that shapes a user's output."""
+    payload = json.dumps([entry.config, options], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _is_transient(error: Exception) -> bool:
+    """Network errors, rate limits and server errors are worth retrying."""
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status in (403, 429) or status >= 500
+    return isinstance(error, requests.exceptions.RequestException)
+
+
+def render_user(entry: RosterEntry, source, output_root: str, options: BatchOptions,
+                queue=None) -> dict:
+    """Fetch, render and write one user's profile.
+
+    With a queue, data stored by an earlier fetch is reused and the user's
+    state is recorded after each step.
+
+    Returns:
+        result dict with keys: user, ok, skipped, error, attempts, fetch_s,
+        render_s, files, written
+    """
+    result = _result(entry.name)
+    start = time.perf_counter()
+    try:
+        config = validate_config(copy.deepcopy(entry.config))
+        username = config["username"]
+        if not USERNAME_RE.match(username):
+            raise ConfigError(f"'{username}' is not a valid GitHub username.")
+        try:
+            palettes = {name: resolve_named_theme(name, config) for name in options.themes}
+        except KeyError as e:
+            raise ConfigError(f"Unknown theme {e}.") from None
+
+        data = queue.load_data(entry.name) if queue else None
+        if data is None:
+            data = source.fetch(username, strict=True)
+            if queue:
+                queue.mark_fetched(entry.name, data)
+        fetched = time.perf_counter()
+        result["fetch_s"] = fetched - start
+
+        builder = SVGBuilder(config, *data, lite=options.lite)
+        files = builder.render_files(palettes, options.bundle)
+        output_dir = os.path.join(output_root, username)
+        os.makedirs(output_dir, exist_ok=True)
+        summary = write_svgs(output_dir, files, options.variants)
+
+        result["render_s"] = time.perf_counter() - fetched
+        result["files"] = len(summary)
+        result["written"] = sum(1 for row in summary if row["written"])
+        result["ok"] = True
+        if queue:
+            queue.mark_rendered(entry.name)
+    except (ConfigError, *FETCH_ERRORS, OSError) as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        if queue:
+            queue.mark_failed(entry.name, result["error"], transient=_is_transient(e))
+    except Exception as e:
+        # A rendering bug for one user must not abort the batch; retrying won't help
+        logger.exception("Rendering %s failed", entry.name)
+        result["error"] = f"{type(e).__name__}: {e}"
+        if queue:
+            queue.mark_failed(entry.name, result["error"], transient=False)
+    if queue:
+        result["attempts"] = queue.state(entry.name)[1] + result["ok"]
+    return result
+
+
+def _run_queue(jobs: dict, source, output_root: str, options: BatchOptions, workers: int,
+               queue, resume: bool, fresh_for: float) -> list:
+    """Work the queue until every user is rendered or failed."""
+    queue.enqueue({name: _digest(entry, options) for name, entry in jobs.items()}, resume, fresh_for)
+    results = {}
+
+    def work(name):
+        return render_user(jobs[name], source, output_root, options, queue)
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        while True:
+            names = queue.ready()
+            if not names:
+                delay = queue.next_retry()
+                if delay is None:
+                    break
+                logger.info("Waiting %.1fs before retrying failed users...", delay)
+                time.sleep(delay)
+                continue
+            results.update((r["user"], r) for r in pool.map(work, names))
+
+    ordered = []
+    for name in jobs:
+        if name not in results:
+            # Not worked this run: fresh, or already settled by the run being resumed
+            state, attempts, error = queue.state(name)
+            results[name] = _result(name, ok=state == "rendered", skipped=True,
+                                    error=error, attempts=attempts)
+        ordered.append(results[name])
+    return ordered
+
+
+def run_batch(entries: list, source, output_root: str, options: BatchOptions = BatchOptions(),
+              workers: int = 4, queue=None, resume: bool = False, fresh_for: float = 0.0) -> list:
+    """Render every roster entry on a thread pool.
+
+    Args:
+        entries: RosterEntry list from load_roster()
+        source: data source shared by all users (GitHubSource or DemoSource)
+        output_root: each user is written to output_root/<username>/
+        options: render options applied to every user
+        workers: thread pool size
+        queue: optional WorkQueue making the run resumable with retries
+        resume: continue the queue's previous run instead of starting over
+        fresh_for: skip users rendered from data fetched less than this many
+            seconds ago (queue only)
+
+    Returns:
+        list of render_user() results, in roster order
+    """
+    jobs = {}
+    for entry in entries:
+        if entry.name in jobs:
+            logger.warning("Skipping duplicate roster entry '%s'.", entry.name)
+            continue
+        jobs[entry.name] = entry
+
+    os.makedirs(output_root, exist_ok=True)
+    if queue is not None:
+        results = _run_queue(jobs, source, output_root, options, workers, queue, resume, fresh_for)
+    else:
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            results = list(pool.map(
+                lambda entry: render_user(entry, source, output_root, options), jobs.values()
+            ))
+
+    with open(os.path.join(output_root, SUMMARY_FILE), "w") as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+def log_batch_summary(results: list, elapsed: float):
+    """Log per-user timing and failures, then the totals."""
+    for r in results:
+        if r["skipped"]:
+            status = "skip" if r["ok"] else "failed"
+        else:
+            status = "ok" if r["ok"] else "FAILED"
+        logger.info(
+            "  %-24s %-6s fetch %6.2fs  render %6.2fs  files %3d (%d changed)%s",
+            r["user"], status, r["fetch_s"], r["render_s"], r["files"], r["written"],
+            f"  {r['error']}" if r["error"] else "",
+        )
+    failed = [r["user"] for r in results if not r["ok"]]
+    skipped = sum(1 for r in results if r["skipped"] and r["ok"])
+    logger.info(
+        "Batch done in %.2fs: %d users, %d ok (%d skipped), %d failed%s",
+        elapsed, len(results), len(results) - len(failed), skipped, len(failed),
+        f" ({', '.join(failed)})" if failed else "",
+    )
@@ -0,0 +1,366 @@
+"""Benchmarks for the Galaxy Profile generator.
+
+    python -m generator.main bench render [--iterations N] [--warm-cache]
+    python -m generator.main bench serve [--users N] [--concurrency C] [--duration T] [--url URL]
+
+``bench serve`` is the acceptance test for caching and concurrency changes
+to serve mode: C client threads request cards for N users as fast as they
+can for T seconds, picking users with a Zipf-like skew (a few popular
+profiles, a long tail) and cards and themes uniformly. By default it drives
+an in-process server over DemoSource, whose fetches can be slowed down to
+stand in for GitHub round trips; with --url it drives a running server,
+e.g. ``serve --demo --workers 4``.
+"""
+
+import http.client
+import itertools
+import json
+import os
+import random
+import signal
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+import yaml
+
+from generator import fragment_cache
+from generator.config import validate_config
+from generator.sources import DEMO_LANGUAGES, DEMO_STATS, DemoSource, demo_contributions
+from generator.svg_builder import CARDS, SVGBuilder
+
+_EXAMPLE_CONFIG = os.path.join(os.path.dirname(__file__), "..", "config.example.yml")
+
+
+def _demo_builder(config_path: str = None) -> SVGBuilder:
+    with open(config_path or _EXAMPLE_CONFIG, "r") as f:
+        config = validate_config(yaml.safe_load(f))
+    return SVGBuilder(config, DEMO_STATS, DEMO_LANGUAGES, demo_contributions())
+
+
+def bench_render(iterations: int = 200, config_path: str = None, warm_cache: bool = False) -> list:
+    """Time each card's render() over demo data.
+
+    The fragment cache is disabled unless warm_cache is set, so the numbers
+    measure full renders.
+
+    Returns:
+        list of dicts with keys: card, mean_ms, p50_ms, min_ms, size
+    """
+    previous = fragment_cache.get_cache()
+    fragment_cache.configure(maxsize=fragment_cache.DEFAULT_MAXSIZE if warm_cache else 0)
+    try:
+        builder = _demo_builder(config_path)
+        results = []
+        for card, method in CARDS.items():
+            render = getattr(builder, method)
+            svg = render()  # warm-up (imports, caches)
+            timings = []
+            for _ in range(iterations):
+                builder.reset()  # time the full layout, not just the paint pass
+                start = time.perf_counter()
+                render()
+                timings.append((time.perf_counter() - start) * 1000)
+            results.append({
+                "card": card,
+                "mean_ms": statistics.fmean(timings),
+                "p50_ms": statistics.median(timings),
+                "min_ms": min(timings),
+                "size": len(svg),
+            })
+        return results
+    finally:
+        fragment_cache.set_cache(previous)
+
+
+class SlowDemoSource(DemoSource):
+    """DemoSource whose fetches take latency seconds, like a GitHub round trip."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def fetch_dataset(self, username: str, dataset: str):
+        if self.latency:
+            time.sleep(self.latency)
+        return super().fetch_dataset(username, dataset)
+
+
+def _rss_mb(pid="self"):
+    """Resident set size of a process in MiB (None where it can't be read).
+
+    Falls back to this process's peak RSS where /proc is missing.
+    """
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        if pid != "self":
+            return None
+        import resource  # Unix only, like /proc
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _workers_rss_mb(stats: dict):
+    """Summed RSS of the server workers seen in /_stats samples (None if unknown)."""
+    sizes = [_rss_mb(worker) for worker in stats]
+    return None if None in sizes else sum(sizes)
+
+
+def _start_server(config: dict, latency: float, refresh: bool, disk_path: str, workers: int):
+    """Start serve mode on a free local port the way ``serve`` would.
+
+    Returns:
+        (host, port, stop): stop() shuts the server (and its workers) down
+    """
+    from generator.disk_cache import DiskCache
+    from generator.refresher import Refresher
+    from generator.server import ProfileService, make_server, run_workers
+
+    disk = DiskCache(disk_path) if disk_path else None
+
+    def build_service():
+        service = ProfileService(config, SlowDemoSource(latency), disk=disk)
+        if refresh:
+            Refresher(service).start()
+        return service
+
+    if workers > 1:
+        listener = socket.create_server(("127.0.0.1", 0), backlog=128)
+        host, port = listener.getsockname()[:2]
+        supervisor = os.fork()
+        if supervisor == 0:
+            code = 0
+            try:
+                run_workers(build_service, workers=workers, listener=listener)
+            except BaseException:
+                code = 1
+            finally:
+                os._exit(code)
+        listener.close()
+
+        def stop():
+            os.kill(supervisor, signal.SIGTERM)
+            os.waitpid(supervisor, 0)
+
+        return host, port, stop
+
+    service = build_service()
+    server = make_server(service, "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def stop():
+        server.shutdown()
+        server.server_close()
+        if service.refresher is not None:
+            service.refresher.stop()
+
+    return (*server.server_address[:2], stop)
+
+
+def _server_stats(host: str, port: int, samples: int = 20) -> dict:
+    """Cache counters per server worker, keyed by worker pid (None for one process).
+
+    Each /_stats request is answered by whichever worker accepts it, so
+    several are sampled to see every worker.
+    """
+    stats = {}
+    for _ in range(samples):
+        conn = http.client.HTTPConnection(host, port, timeout=10)
+        try:
+            conn.request("GET", "/_stats")
+            body = json.loads(conn.getresponse().read())
+        finally:
+            conn.close()
+        stats[body.get("worker")] = {cache: body[cache] for cache in ("data", "renders")}
+        if body.get("worker") is None:
+            break
+    return stats
+
+
+def _hit_ratio(before: dict, after: dict, cache: str):
+    hits = misses = 0
+    for worker, counters in after.items():
+        old = before.get(worker, {}).get(cache, {"hits": 0, "misses": 0})
+        hits += counters[cache]["hits"] - old["hits"]
+        misses += counters[cache]["misses"] - old["misses"]
+    return hits / (hits + misses) if hits + misses else None
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(q / 100 * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def bench_serve(users: int = 100, concurrency: int = 8, duration: float = 10.0,
+                cards: list = None, themes: list = None, skew: float = 1.1,
+                latency: float = 0.05, url: str = None, config_path: str = None,
+                seed: int = 0, refresh: bool = True, disk_cache: str = None,
+                workers: int = 1) -> dict:
+    """Load-test serve mode and report throughput, latency and cache behaviour.
+
+    Args:
+        users: distinct logins requested (bench0001, bench0002, ...)
+        concurrency: client threads, each with one keep-alive connection
+        duration: seconds to run
+        cards: cards to mix (default: all)
+        themes: theme query values to mix; None means no theme parameter
+        skew: Zipf exponent of user popularity (0 for uniform)
+        latency: seconds per dataset fetch of the in-process DemoSource
+        url: drive a running server at this base URL instead of an in-process one
+        seed: makes the request mix reproducible
+        refresh: run a background Refresher, as serve does by default
+        disk_cache: SQLite file shared by the workers (see serve --disk-cache)
+        workers: pre-forked server processes; more than one needs os.fork()
+            and uses a temporary disk cache unless disk_cache is given
+
+    Returns:
+        dict with keys: requests, errors, rps, p50_ms, p95_ms, p99_ms,
+        data_hit_ratio, render_hit_ratio, rss_start_mb, rss_end_mb (the
+        RSS values are None for a remote server)
+
+    Raises:
+        ValueError: for an unknown card
+    """
+    cards = cards or list(CARDS)
+    unknown = [card for card in cards if card not in CARDS]
+    if unknown:
+        raise ValueError(f"Unknown cards: {', '.join(unknown)} (expected: {', '.join(CARDS)})")
+    if workers > 1 and not hasattr(os, "fork"):
+        raise ValueError("workers > 1 needs os.fork(), which this platform lacks")
+    themes = themes or [None, "light"]
+    logins = [f"bench{i:04d}" for i in range(1, users + 1)]
+    # Cumulative once, so each pick is a bisect instead of an O(users) pass
+    cum_weights = list(itertools.accumulate(1 / rank ** skew for rank in range(1, users + 1)))
+
+    stop = None
+    temporary = None
+    if url:
+        parts = urlsplit(url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        with open(config_path or _EXAMPLE_CONFIG, "r") as f:
+            config = validate_config(yaml.safe_load(f))
+        if workers > 1 and not disk_cache:
+            fd, temporary = tempfile.mkstemp(prefix="galaxy-bench-", suffix=".sqlite")
+            os.close(fd)
+        host, port, stop = _start_server(config, latency, refresh, disk_cache or temporary, workers)
+
+    try:
+        before = _server_stats(host, port)
+        rss_start = None if url else _workers_rss_mb(before) if workers > 1 else _rss_mb()
+        latencies, errors = [], [0]
+        lock = threading.Lock()
+        deadline = time.monotonic() + duration
+
+        def client(n):
+            rng = random.Random(seed + n)
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            mine, failed = [], 0
+            try:
+                while time.monotonic() < deadline:
+                    user = rng.choices(logins, cum_weights=cum_weights)[0]
+                    theme = rng.choice(themes)
+                    path = f"/{user}/{rng.choice(cards)}.svg" + (f"?theme={theme}" if theme else "")
+                    start = time.perf_counter()
+                    try:
+                        conn.request("GET", path)
+                        response = conn.getresponse()
+                        response.read()
+                        ok = response.status == 200
+                    except (OSError, http.client.HTTPException):
+                        conn.close()
+                        ok = False
+                    mine.append((time.perf_counter() - start) * 1000)
+                    failed += not ok
+            finally:
+                conn.close()
+                with lock:
+                    latencies.extend(mine)
+                    errors[0] += failed
+
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        after = _server_stats(host, port)
+        rss_end = None if url else _workers_rss_mb(after) if workers > 1 else _rss_mb()
+    finally:
+        if stop is not None:
+            stop()
+        if temporary:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(temporary + suffix):
+                    os.remove(temporary + suffix)
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "data_hit_ratio": _hit_ratio(before, after, "data"),
+        "render_hit_ratio": _hit_ratio(before, after, "renders"),
+        "rss_start_mb": rss_start,
+        "rss_end_mb": rss_end,
+    }
+
+
+def run_bench(args):
+    """Entry point for the ``bench`` subcommand."""
+    if args.bench_command == "render":
+        results = bench_render(args.iterations, args.config, args.warm_cache)
+        print(f"{'card':<26}{'mean ms':>10}{'p50 ms':>10}{'min ms':>10}{'bytes':>10}")
+        for row in results:
+            print(
+                f"{row['card']:<26}{row['mean_ms']:>10.3f}{row['p50_ms']:>10.3f}"
+                f"{row['min_ms']:>10.3f}{row['size']:>10}"
+            )
+        total = sum(row["mean_ms"] for row in results)
+        print(f"{'total':<26}{total:>10.3f}")
+    elif args.bench_command == "serve":
+        try:
+            result = bench_serve(
+                users=args.users,
+                concurrency=args.concurrency,
+                duration=args.duration,
+                cards=args.cards.split(",") if args.cards else None,
+                themes=[t or None for t in args.themes.split(",")] if args.themes else None,
+                skew=args.skew,
+                latency=args.latency / 1000,
+                url=args.url,
+                config_path=args.config,
+                seed=args.seed,
+                refresh=not args.no_refresh,
+                disk_cache=args.disk_cache,
+                workers=args.workers,
+            )
+        except (ValueError, OSError) as e:
+            print(f"bench serve: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        def ratio(value):
+            return "n/a" if value is None else f"{value:.1%}"
+
+        print(f"requests      {result['requests']} ({result['errors']} errors)")
+        print(f"throughput    {result['rps']:.1f} req/s")
+        print(f"latency       p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms  "
+              f"p99 {result['p99_ms']:.2f} ms")
+        print(f"cache hits    data {ratio(result['data_hit_ratio'])}  "
+              f"renders {ratio(result['render_hit_ratio'])}")
+        if result["rss_start_mb"] is not None:
+            growth = result["rss_end_mb"] - result["rss_start_mb"]
+            print(f"memory        {result['rss_start_mb']:.1f} -> {result['rss_end_mb']:.1f} MiB "
+                  f"({growth:+.1f} MiB)")
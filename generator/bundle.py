@@ -0,0 +1,125 @@
+"""Sprite bundle — every card packed into one SVG with <view> fragments.
+
+The README can then reference ``bundle.svg#stats-card`` for each card, so a
+profile makes a single image request instead of one per card. Cards are
+stacked vertically as nested <svg> elements; their <defs> are hoisted into
+one shared block, deduplicated by content, with ids renamed only when two
+cards define different content under the same id.
+"""
+
+import re
+
+_ROOT_RE = re.compile(r'<svg\b[^>]*\bwidth="([\d.]+)"[^>]*\bheight="([\d.]+)"[^>]*>')
+_DEFS_RE = re.compile(r"\s*<defs\s*/>|\s*<defs>(.*?)</defs>", re.S)
+# Top-level tokens inside <defs>: comments, <style> blocks (opaque CSS) and tags
+_TOKEN_RE = re.compile(r"<!--.*?-->|<style\b.*?</style>|<(/?)[\w:-]+[^>]*?(/?)>", re.S)
+_ID_RE = re.compile(r'\bid="([^"]+)"')
+
+
+def _split_card(svg: str):
+    """Return (width, height, defs_markup, body) of a rendered card."""
+    root = _ROOT_RE.search(svg)
+    if root is None:
+        raise ValueError("Card is not an SVG document with width and height")
+    width, height = float(root.group(1)), float(root.group(2))
+    body = svg[root.end():svg.rindex("</svg>")]
+    defs = ""
+    match = _DEFS_RE.search(body)
+    if match:
+        defs = match.group(1) or ""
+        body = body[:match.start()] + body[match.end():]
+    return width, height, defs, body
+
+
+def _defs_entries(defs: str) -> list:
+    """Split the inner markup of a <defs> block into its top-level elements."""
+    entries = []
+    depth = 0
+    start = None
+    for token in _TOKEN_RE.finditer(defs):
+        if depth == 0:
+            start = token.start()
+        closing, self_closing = token.group(1), token.group(2)
+        if closing:
+            depth -= 1
+        elif not self_closing and not token.group(0).startswith(("<!--", "<style")):
+            depth += 1
+        if depth == 0:
+            entries.append(defs[start:token.end()].strip())
+    return entries
+
+
+def _rename(markup: str, renames: dict) -> str:
+    for old, new in renames.items():
+        markup = (
+            markup.replace(f'id="{old}"', f'id="{new}"')
+            .replace(f"url(#{old})", f"url(#{new})")
+            .replace(f'href="#{old}"', f'href="#{new}"')
+        )
+    return markup
+
+
+def _fmt(value: float) -> str:
+    return f"{value:g}"
+
+
+def build_bundle(cards: dict, gap: int = 0) -> str:
+    """Pack rendered cards into a single SVG sprite.
+
+    Args:
+        cards: dict of card name -> SVG string; names become <view> ids
+        gap: vertical space between stacked cards
+
+    Returns:
+        SVG document with one ``<view id="<card>">`` per card
+    """
+    shared = []     # hoisted defs entries in first-seen order
+    owners = {}     # id -> defs markup that claimed it (None: a card body element)
+    seen = set()    # markup already emitted (after renames)
+    views = []
+    bodies = []
+    y = 0.0
+    total_width = 0.0
+
+    for name, svg in cards.items():
+        width, height, defs, body = _split_card(svg)
+        entries = _defs_entries(defs)
+
+        renames = {}
+        for entry in entries:
+            for def_id in _ID_RE.findall(entry):
+                if owners.get(def_id, entry) != entry:
+                    renames[def_id] = f"{name}--{def_id}"
+        for body_id in _ID_RE.findall(body):
+            if body_id in owners:
+                renames[body_id] = f"{name}--{body_id}"
+        for entry in entries:
+            entry = _rename(entry, renames)
+            for def_id in _ID_RE.findall(entry):
+                owners.setdefault(def_id, entry)
+            if entry not in seen:
+                seen.add(entry)
+                shared.append(entry)
+        body = _rename(body, renames)
+        for body_id in _ID_RE.findall(body):
+            owners[body_id] = None
+
+        w, h = _fmt(width), _fmt(height)
+        views.append(f'  <view id="{name}" viewBox="0 {_fmt(y)} {w} {h}"/>')
+        bodies.append(
+            f'  <svg x="0" y="{_fmt(y)}" width="{w}" height="{h}" viewBox="0 0 {w} {h}">'
+            f"{body}</svg>"
+        )
+        total_width = max(total_width, width)
+        y += height + gap
+
+    total_height = max(y - gap, 0)
+    tw, th = _fmt(total_width), _fmt(total_height)
+    defs_block = "\n".join(f"    {entry}" for entry in shared)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{tw}" height="{th}" viewBox="0 0 {tw} {th}">\n'
+        f"  <defs>\n{defs_block}\n  </defs>\n"
+        + "\n".join(views) + "\n"
+        + "\n".join(bodies) + "\n"
+        "</svg>"
+    )
@@ -1,6 +1,11 @@
 """Config validation and defaults for the Galaxy Profile generator."""
 
-from generator.utils import resolve_theme, HEX_COLOR_RE
+import re
+
+from generator.utils import LINK_MODES, PLACEMENTS, resolve_theme, HEX_COLOR_RE
+
+# Theme variant names end up in output filenames (galaxy-header-<name>.svg)
+THEME_NAME_RE = re.compile(r"^[A-Za-z0-9_-]+$")
 
 
 class ConfigError(ValueError):
@@ -90,6 +95,58 @@ def validate_config(config: dict) -> dict:
                 f"theme.{key} must be a valid hex color (e.g. #00d4ff), got '{value}'."
             )
 
+    # themes — optional named palettes for `generate --themes`
+    themes = config.get("themes", {})
+    if not isinstance(themes, dict):
+        raise ConfigError("'themes' must be a mapping.")
+    for name, palette in themes.items():
+        if not isinstance(name, str) or not THEME_NAME_RE.match(name):
+            raise ConfigError(
+                f"themes.{name} is not a valid theme name (use letters, digits, '-' or '_')."
+            )
+        if not isinstance(palette, dict):
+            raise ConfigError(f"themes.{name} must be a mapping.")
+        for key, value in palette.items():
+            if not isinstance(value, str) or not HEX_COLOR_RE.match(value):
+                raise ConfigError(
+                    f"themes.{name}.{key} must be a valid hex color (e.g. #00d4ff), got '{value}'."
+                )
+
+    # heatmap — optional rendering options
+    heatmap = config.get("heatmap", {})
+    if not isinstance(heatmap, dict):
+        raise ConfigError("'heatmap' must be a mapping.")
+    if not isinstance(heatmap.get("compact", False), bool):
+        raise ConfigError("heatmap.compact must be true or false.")
+    if not isinstance(heatmap.get("month_totals", False), bool):
+        raise ConfigError("heatmap.month_totals must be true or false.")
+
+    # starfield — optional background star placement
+    star_cfg = config.get("starfield", {})
+    if not isinstance(star_cfg, dict):
+        raise ConfigError("'starfield' must be a mapping.")
+    if star_cfg.get("placement", "uniform") not in PLACEMENTS:
+        raise ConfigError(f"starfield.placement must be one of: {', '.join(PLACEMENTS)}.")
+
+    # constellation — optional skill constellation scaling
+    const_cfg = config.get("constellation", {})
+    if not isinstance(const_cfg, dict):
+        raise ConfigError("'constellation' must be a mapping.")
+    if const_cfg.get("links", "chain") not in LINK_MODES:
+        raise ConfigError(f"constellation.links must be one of: {', '.join(LINK_MODES)}.")
+    budget = const_cfg.get("max_items_per_arm", 0)
+    if not isinstance(budget, int) or isinstance(budget, bool) or budget < 0 or budget == 1:
+        raise ConfigError("constellation.max_items_per_arm must be 0 (no limit) or an integer of at least 2.")
+
+    # stats — optional stats card metrics
+    stats_cfg = config.get("stats", {})
+    if not isinstance(stats_cfg, dict):
+        raise ConfigError("'stats' must be a mapping.")
+    metrics = stats_cfg.get("metrics")
+    if metrics is not None:
+        if not isinstance(metrics, list) or not metrics:
+            raise ConfigError("stats.metrics must be a non-empty list.")
+
     # Apply theme defaults
     config["theme"] = resolve_theme(user_theme)
 
@@ -105,5 +162,13 @@ def validate_config(config: dict) -> dict:
     lang_cfg.setdefault("exclude", [])
     lang_cfg.setdefault("max_display", 8)
     config.setdefault("timeline", [])
+    config.setdefault("themes", {})
+    heatmap = config.setdefault("heatmap", {})
+    heatmap.setdefault("compact", False)
+    heatmap.setdefault("month_totals", False)
+    config.setdefault("starfield", {}).setdefault("placement", "uniform")
+    const_cfg = config.setdefault("constellation", {})
+    const_cfg.setdefault("links", "chain")
+    const_cfg.setdefault("max_items_per_arm", 0)
 
     return config
@@ -0,0 +1,107 @@
+"""Contribution analytics — streaks, totals and distributions in one pass.
+
+``ContributionIndex`` walks a ContributionCalendar once and keeps:
+
+- prefix sums of the daily counts, so the total of any date range is O(1);
+- the current and longest streaks (consecutive days with contributions);
+- totals per weekday and per calendar month.
+
+SVGBuilder builds one index per calendar and hands the results to the
+templates, which then never re-scan the days themselves.
+"""
+
+import datetime
+from array import array
+
+from generator.contrib_calendar import gh_weekday
+
+# Stats card metrics derived from the calendar (see ContributionIndex.metrics)
+CALENDAR_METRICS = ("streak", "longest_streak", "last_30d")
+
+
+class ContributionIndex:
+    """Precomputed analytics for one ContributionCalendar.
+
+    The current streak ends on the calendar's last day, or on the day before
+    when the last day has no contributions yet (it is usually today).
+    """
+
+    def __init__(self, calendar):
+        self.start = calendar.start
+        self.days = len(calendar)
+        self.prefix = array("Q", [0])
+        self.weekday_totals = [0] * 7
+        self.month_totals = {}  # (year, month) -> total, in date order
+        self.longest_streak = 0
+        self.active_days = 0
+
+        run = 0
+        weekday = gh_weekday(self.start) if self.start else 0
+        month_key = None
+        month_left = 0  # days remaining in the current month
+        total = 0
+        for i, count in enumerate(calendar.counts):
+            if month_left == 0:
+                date = self.start + datetime.timedelta(days=i)
+                month_key = (date.year, date.month)
+                month_left = _days_in_month(*month_key) - date.day + 1
+                self.month_totals[month_key] = 0
+            month_left -= 1
+
+            total += count
+            self.prefix.append(total)
+            self.weekday_totals[weekday] += count
+            self.month_totals[month_key] += count
+            weekday = (weekday + 1) % 7
+
+            if count:
+                run += 1
+                self.active_days += 1
+                self.longest_streak = max(self.longest_streak, run)
+            else:
+                run = 0
+
+        if self.days and not calendar.counts[-1]:
+            # Today is still in progress: the streak may end yesterday
+            run = 0
+            for count in reversed(calendar.counts[:-1]):
+                if not count:
+                    break
+                run += 1
+        self.current_streak = run
+
+    @property
+    def end(self):
+        """Date of the last indexed day, or None when empty."""
+        if not self.days:
+            return None
+        return self.start + datetime.timedelta(days=self.days - 1)
+
+    def total(self, first: datetime.date = None, last: datetime.date = None) -> int:
+        """Contributions from first to last inclusive, clamped to the calendar (O(1))."""
+        if not self.days:
+            return 0
+        lo = 0 if first is None else max((first - self.start).days, 0)
+        hi = self.days if last is None else min((last - self.start).days + 1, self.days)
+        return self.prefix[hi] - self.prefix[lo] if hi > lo else 0
+
+    def rolling(self, days: int = 30, last: datetime.date = None) -> int:
+        """Total of the `days` days ending on last (default: the last indexed day)."""
+        last = last or self.end
+        if last is None:
+            return 0
+        return self.total(last - datetime.timedelta(days=days - 1), last)
+
+    def metrics(self) -> dict:
+        """Values for the calendar metrics of the stats card (CALENDAR_METRICS)."""
+        return {
+            "streak": self.current_streak,
+            "longest_streak": self.longest_streak,
+            "last_30d": self.rolling(30),
+        }
+
+
+def _days_in_month(year: int, month: int) -> int:
+    if month == 12:
+        return 31
+    return (datetime.date(year, month + 1, 1) - datetime.date(year, month, 1)).days
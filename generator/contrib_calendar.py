@@ -0,0 +1,138 @@
+"""Compact contribution calendar — a start date plus one count per day.
+
+The GitHub API (and the old in-memory format) describe a year as a list of
+weeks, each a list of ``{"date", "count", "weekday"}`` dicts: ~365 dicts per
+user per year. ``ContributionCalendar`` keeps only the first date and an
+``array('H')`` of daily counts (2 bytes a day); dates and weekdays are
+derived on demand. ``from_weeks``/``to_dict`` convert losslessly to and from
+the dict shape, for any calendar of consecutive days split into
+Sunday-started weeks, which is what GitHub returns.
+"""
+
+import datetime
+from array import array
+
+# Largest daily count an array('H') slot holds; larger counts are clamped
+MAX_COUNT = 0xFFFF
+
+
+def gh_weekday(date: datetime.date) -> int:
+    """GitHub weekday of a date: 0 = Sunday ... 6 = Saturday."""
+    return (date.weekday() + 1) % 7
+
+
+class ContributionCalendar:
+    """Daily contribution counts for a run of consecutive days.
+
+    Args:
+        start: date of the first count (None for an empty calendar)
+        counts: iterable of daily counts, clamped to 0..MAX_COUNT
+        total_count: reported total; defaults to the sum of counts
+    """
+
+    __slots__ = ("start", "counts", "total_count")
+
+    def __init__(self, start: datetime.date = None, counts=(), total_count: int = None):
+        self.start = start
+        self.counts = array("H", (min(max(int(c), 0), MAX_COUNT) for c in counts))
+        if self.counts and start is None:
+            raise ValueError("A calendar with counts needs a start date")
+        self.total_count = sum(self.counts) if total_count is None else total_count
+
+    @classmethod
+    def from_weeks(cls, weeks: list, total_count: int = None) -> "ContributionCalendar":
+        """Build a calendar from a list of weeks of day dicts.
+
+        Raises:
+            ValueError: if the days are not consecutive or weeks don't start on Sunday
+        """
+        days = [day for week in weeks for day in week]
+        if not days:
+            return cls(total_count=total_count or 0)
+        start = datetime.date.fromisoformat(days[0]["date"])
+        i = 0
+        for col, week in enumerate(weeks):
+            for pos, day in enumerate(week):
+                date = start + datetime.timedelta(days=i)
+                weekday = gh_weekday(date)
+                if day["date"] != date.isoformat():
+                    raise ValueError(f"Contribution days must be consecutive, got {day['date']} after {start}")
+                if day.get("weekday", weekday) != weekday:
+                    raise ValueError(f"Wrong weekday for {day['date']}")
+                # Every week after the first opens on a Sunday, and only there
+                if (weekday == 0) != (pos == 0) and (col > 0 or pos > 0):
+                    raise ValueError("Contribution weeks must run Sunday to Saturday")
+                i += 1
+        return cls(start, (day.get("count", 0) for day in days), total_count)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ContributionCalendar":
+        """Build a calendar from ``{"total_count": int, "weeks": [...]}``."""
+        return cls.from_weeks(data.get("weeks", []), data.get("total_count", 0))
+
+    @classmethod
+    def coerce(cls, data) -> "ContributionCalendar":
+        """Return data as a calendar: calendars pass through, dicts are converted."""
+        if isinstance(data, cls):
+            return data
+        return cls.from_dict(data or {})
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __eq__(self, other):
+        if not isinstance(other, ContributionCalendar):
+            return NotImplemented
+        return (self.start, self.counts, self.total_count) == (other.start, other.counts, other.total_count)
+
+    def __repr__(self):
+        return f"ContributionCalendar(start={self.start!r}, days={len(self)}, total_count={self.total_count})"
+
+    @property
+    def end(self):
+        """Date of the last count, or None when empty."""
+        if not self.counts:
+            return None
+        return self.start + datetime.timedelta(days=len(self.counts) - 1)
+
+    def iter_weeks(self):
+        """Yield (week_start_date, [(weekday, count), ...]) per Sunday-started week.
+
+        The first and last weeks may be partial; week_start_date is the
+        first date actually present in that week.
+        """
+        if not self.counts:
+            return
+        counts = self.counts
+        weekday = gh_weekday(self.start)
+        i = 0
+        while i < len(counts):
+            length = min(7 - weekday, len(counts) - i)
+            yield (
+                self.start + datetime.timedelta(days=i),
+                [(weekday + d, counts[i + d]) for d in range(length)],
+            )
+            i += length
+            weekday = 0
+
+    @property
+    def num_weeks(self) -> int:
+        """Number of (possibly partial) week columns."""
+        if not self.counts:
+            return 0
+        return (gh_weekday(self.start) + len(self.counts) + 6) // 7
+
+    def to_dict(self) -> dict:
+        """Return the ``{"total_count", "weeks"}`` dict shape."""
+        weeks = []
+        for week_start, days in self.iter_weeks():
+            first = week_start - datetime.timedelta(days=days[0][0])
+            weeks.append([
+                {
+                    "date": (first + datetime.timedelta(days=weekday)).isoformat(),
+                    "count": count,
+                    "weekday": weekday,
+                }
+                for weekday, count in days
+            ])
+        return {"total_count": self.total_count, "weeks": weeks}
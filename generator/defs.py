@@ -0,0 +1,97 @@
+"""Shared <defs> registry — deduplicated filters, gradients and reusable shapes."""
+
+
+class DefsRegistry:
+    """Collects <defs> entries for one SVG, deduplicating them by content.
+
+    Templates register markup containing an ``{id}`` placeholder and get back
+    the id to reference. Registering identical markup again returns the
+    existing id instead of emitting a second copy, so the number of defs
+    grows with the number of *distinct* entries rather than with the number
+    of arms, cards or stars that use them.
+    """
+
+    def __init__(self):
+        self._ids = {}      # markup (with placeholder) -> assigned id
+        self._taken = set()
+        self._entries = []  # rendered markup in registration order
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _allocate(self, prefix):
+        candidate = prefix
+        n = 2
+        while candidate in self._taken:
+            candidate = f"{prefix}-{n}"
+            n += 1
+        self._taken.add(candidate)
+        return candidate
+
+    def add(self, prefix: str, markup: str) -> str:
+        """Register a def and return its id.
+
+        Args:
+            prefix: preferred id; suffixed (-2, -3...) if already taken
+            markup: element markup containing an ``{id}`` placeholder
+        """
+        existing = self._ids.get(markup)
+        if existing is not None:
+            return existing
+        def_id = self._allocate(prefix)
+        self._ids[markup] = def_id
+        self._entries.append(markup.replace("{id}", def_id))
+        return def_id
+
+    def glow_filter(self, std_dev, opacity=0.5, region=100, color=None, prefix="glow") -> str:
+        """Register a soft glow filter and return its id.
+
+        Without ``color`` the glow is the blurred element itself at
+        ``opacity``, which matches a colored flood for solid-filled shapes
+        while letting every arm or card share a single filter.
+        """
+        if color is None:
+            glow = (
+                f'      <feComponentTransfer in="blur" result="glow">\n'
+                f'        <feFuncA type="linear" slope="{opacity}"/>\n'
+                f'      </feComponentTransfer>\n'
+            )
+        else:
+            glow = (
+                f'      <feFlood flood-color="{color}" flood-opacity="{opacity}" result="color"/>\n'
+                f'      <feComposite in="color" in2="blur" operator="in" result="glow"/>\n'
+            )
+        return self.add(prefix, (
+            f'    <filter id="{{id}}" x="-{region}%" y="-{region}%" '
+            f'width="{100 + 2 * region}%" height="{100 + 2 * region}%">\n'
+            f'      <feGaussianBlur stdDeviation="{std_dev}" in="SourceGraphic" result="blur"/>\n'
+            f'{glow}'
+            f'      <feMerge>\n'
+            f'        <feMergeNode in="glow"/>\n'
+            f'        <feMergeNode in="SourceGraphic"/>\n'
+            f'      </feMerge>\n'
+            f'    </filter>'
+        ))
+
+    def blur_filter(self, std_dev, region=None, prefix="blur") -> str:
+        """Register a plain Gaussian blur filter and return its id."""
+        bounds = ""
+        if region is not None:
+            bounds = (
+                f' x="-{region}%" y="-{region}%" '
+                f'width="{100 + 2 * region}%" height="{100 + 2 * region}%"'
+            )
+        return self.add(prefix, (
+            f'    <filter id="{{id}}"{bounds}>\n'
+            f'      <feGaussianBlur stdDeviation="{std_dev}"/>\n'
+            f'    </filter>'
+        ))
+
+    def render(self) -> str:
+        """Return all registered defs, one entry per block, in registration order."""
+        return "\n".join(self._entries)
+
+
+def use(ref_id: str, x: float, y: float) -> str:
+    """Return a <use> element placing a registered shape at (x, y)."""
+    return f'<use href="#{ref_id}" x="{x:.1f}" y="{y:.1f}"/>'
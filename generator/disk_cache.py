@@ -0,0 +1,181 @@
+"""Shared on-disk cache for multi-worker serve mode (SQLite in WAL mode).
+
+Every worker process keeps its own in-memory caches in front of one
+SQLite file holding fetched datasets and rendered cards, so a dataset
+fetched by one worker is seen by all the others. WAL mode lets readers
+proceed while a worker writes.
+
+Workers also take short leases on dataset keys before fetching, so two
+processes missing the same dataset at once make one GitHub call: the
+other waits for the shared copy to appear.
+
+Cards are stored once per (user, card, theme, metrics, config digest),
+with the data versions they were built from as a column that each write
+replaces, so new data does not add rows. Rows not written for a day are
+pruned about once an hour by whichever worker writes next.
+
+Connections are opened lazily per process and thread, which keeps the
+object safe to create before forking.
+"""
+
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from generator.contrib_calendar import ContributionCalendar
+
+# Bumped when the tables change; an older file is emptied and recreated
+SCHEMA_VERSION = 2
+PRUNE_INTERVAL = 3600
+DEFAULT_KEEP = 24 * 3600
+
+_TABLES = ("datasets", "cards", "renders", "leases")
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS datasets (
+        user TEXT NOT NULL,
+        name TEXT NOT NULL,
+        version TEXT NOT NULL,
+        expires REAL NOT NULL,
+        value TEXT NOT NULL,
+        PRIMARY KEY (user, name)
+    )""",
+    """CREATE TABLE IF NOT EXISTS cards (
+        user TEXT NOT NULL,
+        card TEXT NOT NULL,
+        variant TEXT NOT NULL,
+        config TEXT NOT NULL,
+        versions TEXT NOT NULL,
+        body BLOB NOT NULL,
+        etag TEXT NOT NULL,
+        created REAL NOT NULL,
+        PRIMARY KEY (user, card, variant, config)
+    )""",
+    """CREATE TABLE IF NOT EXISTS leases (
+        key TEXT PRIMARY KEY,
+        expires REAL NOT NULL
+    )""",
+)
+
+
+def encode_dataset(value) -> str:
+    """JSON text of a dataset value (calendars as start/counts/total)."""
+    if isinstance(value, ContributionCalendar):
+        value = {
+            "start": value.start.isoformat() if value.start else None,
+            "counts": list(value.counts),
+            "total_count": value.total_count,
+        }
+    return json.dumps(value, sort_keys=True)
+
+
+def decode_dataset(name: str, text: str):
+    """Inverse of encode_dataset for the dataset called name."""
+    value = json.loads(text)
+    if name == "contributions":
+        start = datetime.date.fromisoformat(value["start"]) if value["start"] else None
+        return ContributionCalendar(start, value["counts"], value["total_count"])
+    return value
+
+
+class DiskCache:
+    """Datasets, rendered cards and fetch leases in one SQLite file.
+
+    Args:
+        path: database file, shared by every worker
+        clock: wall-clock time source (expiry times are compared across processes)
+    """
+
+    def __init__(self, path: str, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self._local = threading.local()
+        self._next_prune = clock() + PRUNE_INTERVAL
+        with self._db() as db:
+            if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                for table in _TABLES:
+                    db.execute(f"DROP TABLE IF EXISTS {table}")
+                db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            for statement in _SCHEMA:
+                db.execute(statement)
+
+    def _db(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.conn = sqlite3.connect(self.path, timeout=30)
+            local.conn.execute("PRAGMA journal_mode=WAL")
+            local.conn.execute("PRAGMA synchronous=NORMAL")
+            local.pid = os.getpid()
+        return local.conn
+
+    def get_dataset(self, user: str, name: str):
+        """(value, version, expires) of a stored dataset, or None."""
+        row = self._db().execute(
+            "SELECT value, version, expires FROM datasets WHERE user = ? AND name = ?", (user, name)
+        ).fetchone()
+        if row is None:
+            return None
+        return decode_dataset(name, row[0]), row[1], row[2]
+
+    def put_dataset(self, user: str, name: str, value, version: str, expires: float):
+        with self._db() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO datasets (user, name, version, expires, value) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (user, name, version, expires, encode_dataset(value)),
+            )
+
+    def get_render(self, key: tuple, versions: str):
+        """(body, etag) of a stored card built from these data versions, or None.
+
+        Args:
+            key: (user, card, variant, config digest); variant names theme and metrics
+            versions: the data versions the card must have been built from
+        """
+        return self._db().execute(
+            "SELECT body, etag FROM cards WHERE user = ? AND card = ? AND variant = ? "
+            "AND config = ? AND versions = ?", (*key, versions)
+        ).fetchone()
+
+    def put_render(self, key: tuple, versions: str, body: bytes, etag: str):
+        """Store a card, replacing the copy built from older data."""
+        with self._db() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO cards (user, card, variant, config, versions, body, etag, "
+                "created) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, versions, body, etag, self.clock()),
+            )
+        if self.clock() >= self._next_prune:
+            self._next_prune = self.clock() + PRUNE_INTERVAL
+            self.prune()
+
+    def claim(self, key: str, lease: float = 30.0) -> bool:
+        """Try to take the fetch lease on key; False if another worker holds it."""
+        now = self.clock()
+        with self._db() as db:
+            db.execute("DELETE FROM leases WHERE key = ? AND expires <= ?", (key, now))
+            cursor = db.execute(
+                "INSERT OR IGNORE INTO leases (key, expires) VALUES (?, ?)", (key, now + lease)
+            )
+            return cursor.rowcount == 1
+
+    def release(self, key: str):
+        with self._db() as db:
+            db.execute("DELETE FROM leases WHERE key = ?", (key,))
+
+    def prune(self, keep: float = DEFAULT_KEEP):
+        """Delete datasets expired and cards written more than keep seconds ago."""
+        cutoff = self.clock() - keep
+        with self._db() as db:
+            db.execute("DELETE FROM datasets WHERE expires < ?", (cutoff,))
+            db.execute("DELETE FROM cards WHERE created < ?", (cutoff,))
+            db.execute("DELETE FROM leases WHERE expires < ?", (self.clock(),))
+
+    def close(self):
+        """Close this thread's connection (others close when their thread ends)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        self._local.__dict__.clear()
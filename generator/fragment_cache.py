@@ -0,0 +1,162 @@
+"""Fragment cache — memoizes expensive SVG subtrees across renders.
+
+Template helpers opt in with the ``@fragment`` decorator. Results are keyed
+by the helper's identity (module, name and bytecode, so editing a helper
+invalidates its entries), the generator's code version and the arguments,
+kept in an in-memory LRU and optionally persisted as JSON files in a
+directory so later runs can reuse them. The code version (a hash of every
+module in the package) covers what the bytecode cannot see: module-level
+constants and the helpers a fragment calls.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAXSIZE = 512
+
+
+class FragmentCache:
+    """Thread-safe LRU of rendered fragments with optional on-disk persistence."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, directory: str = None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _disk_path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load(self, key):
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                value = json.load(f)["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+        # JSON has no tuples; fragments returning several strings come back as lists
+        return tuple(value) if isinstance(value, list) else value
+
+    def _store(self, key, value):
+        path = self._disk_path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"value": value}, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Could not persist fragment %s: %s", key, e)
+
+    def get(self, key):
+        """Return the cached fragment for key, or None."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        if self.directory:
+            value = self._load(key)
+            if value is not None:
+                self._remember(key, value)
+                with self._lock:
+                    self.hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def set(self, key, value):
+        """Store a fragment in memory (and on disk when persistence is enabled)."""
+        self._remember(key, value)
+        if self.directory:
+            self._store(key, value)
+
+    def clear(self):
+        """Drop all in-memory entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_cache = FragmentCache()
+
+
+def get_cache() -> FragmentCache:
+    """Return the process-wide fragment cache."""
+    return _cache
+
+
+def set_cache(cache: FragmentCache) -> FragmentCache:
+    """Install cache as the process-wide fragment cache (e.g. to restore one from get_cache())."""
+    global _cache
+    _cache = cache
+    return _cache
+
+
+def configure(maxsize: int = DEFAULT_MAXSIZE, directory: str = None) -> FragmentCache:
+    """Replace the process-wide fragment cache (e.g. to enable persistence)."""
+    return set_cache(FragmentCache(maxsize=maxsize, directory=directory))
+
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    """Hash of the generator package's source files; changes with any upgrade or edit."""
+    package = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(package):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, package).encode())
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def _function_id(func):
+    code = func.__code__
+    digest = hashlib.sha256(code.co_code + repr(code.co_consts).encode()).hexdigest()
+    return f"{func.__module__}.{func.__qualname__}:{digest[:16]}:{code_version()}"
+
+
+def fragment(func):
+    """Decorator: cache a pure fragment-building function by its arguments.
+
+    Arguments must be JSON-serializable (strings, numbers, lists, dicts such
+    as the theme). The result must be a string or a tuple of strings.
+    """
+    func_id = _function_id(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        payload = json.dumps([func_id, args, kwargs], sort_keys=True, default=repr)
+        key = hashlib.sha256(payload.encode()).hexdigest()
+        value = _cache.get(key)
+        if value is None:
+            value = func(*args, **kwargs)
+            _cache.set(key, value)
+        return value
+
+    return wrapper
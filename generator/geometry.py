@@ -0,0 +1,219 @@
+"""Geometry kernel — batched coordinate math shared by the templates.
+
+Spirals, polar points, arc sectors and jittered grids are computed for a
+whole card at once: with NumPy installed each batch is a handful of array
+operations, otherwise the same formulas run in plain Python. Results are
+returned as tuples/lists of floats either way, so callers never see arrays.
+
+Angles follow the radar convention: ``polar_points`` and ``arc_paths`` take
+degrees clockwise from 12 o'clock, ``spirals`` takes the raw start angle.
+"""
+
+import functools
+import math
+
+try:
+    import numpy as np
+except ImportError:  # optional: pure-Python fallback below
+    np = None
+
+
+@functools.lru_cache(maxsize=32)
+def spirals(
+    cx: float,
+    cy: float,
+    start_angles: tuple,
+    num_points: int,
+    max_radius: float,
+    turns: float,
+    x_scale: float = 1.0,
+    y_scale: float = 1.0,
+) -> tuple:
+    """Generate one Archimedean spiral per start angle in a single batch.
+
+    Cached: templates call this with module constants (START_ANGLES,
+    NUM_POINTS, ...), so every render after the first is a lookup.
+
+    Args:
+        cx, cy: center coordinates
+        start_angles: tuple of starting angles in degrees, one per arm
+        num_points: points per spiral
+        max_radius: maximum radius of the spiral
+        turns: number of full turns
+        x_scale, y_scale: stretch factors
+
+    Returns:
+        tuple (per arm) of tuples of (x, y) points; treat as read-only
+    """
+    denom = max(num_points - 1, 1)
+    if np is not None and num_points:
+        t = np.arange(num_points) / denom
+        angle = np.radians(np.asarray(start_angles, dtype=float))[:, None] + t * turns * 2 * math.pi
+        r = t * max_radius
+        xs = (cx + r * np.cos(angle) * x_scale).tolist()
+        ys = (cy + r * np.sin(angle) * y_scale).tolist()
+        return tuple(tuple(zip(x, y)) for x, y in zip(xs, ys))
+
+    arms = []
+    for start in start_angles:
+        base = math.radians(start)
+        points = []
+        for i in range(num_points):
+            t = i / denom
+            angle = base + t * turns * 2 * math.pi
+            r = t * max_radius
+            points.append((cx + r * math.cos(angle) * x_scale, cy + r * math.sin(angle) * y_scale))
+        arms.append(tuple(points))
+    return tuple(arms)
+
+
+def polar_points(cx: float, cy: float, radii, degrees) -> list:
+    """Convert angles (clockwise from 12 o'clock) to (x, y) points.
+
+    Args:
+        cx, cy: center coordinates
+        radii: one radius for every point, or a sequence matching degrees
+        degrees: sequence of angles in degrees
+
+    Returns:
+        list of (x, y) tuples
+    """
+    if isinstance(radii, (int, float)):
+        radii = [radii] * len(degrees)
+    if np is not None and len(degrees):
+        rad = np.radians(np.asarray(degrees, dtype=float) - 90)
+        r = np.asarray(radii, dtype=float)
+        return list(zip((cx + r * np.cos(rad)).tolist(), (cy + r * np.sin(rad)).tolist()))
+    points = []
+    for r, deg in zip(radii, degrees):
+        rad = math.radians(deg - 90)
+        points.append((cx + r * math.cos(rad), cy + r * math.sin(rad)))
+    return points
+
+
+# typed: cx/cy/r are printed as given, so 425 and 425.0 must not share an entry
+@functools.lru_cache(maxsize=64, typed=True)
+def arc_paths(cx: float, cy: float, r: float, spans: tuple) -> tuple:
+    """Build SVG path data for several pie-slice sectors at once.
+
+    Args:
+        cx, cy: center coordinates
+        r: sector radius
+        spans: tuple of (start_deg, end_deg), clockwise from 12 o'clock
+
+    Returns:
+        tuple of 'd' attribute strings, one per span
+    """
+    ends = polar_points(cx, cy, r, [deg for span in spans for deg in span])
+    paths = []
+    for i, (start_deg, end_deg) in enumerate(spans):
+        (x1, y1), (x2, y2) = ends[2 * i], ends[2 * i + 1]
+        large_arc = 1 if (end_deg - start_deg) > 180 else 0
+        paths.append(f"M {cx} {cy} L {x1:.1f} {y1:.1f} A {r} {r} 0 {large_arc} 1 {x2:.1f} {y2:.1f} Z")
+    return tuple(paths)
+
+
+def grid_shape(n: int, width: float, height: float) -> tuple:
+    """Pick a grid for n items that roughly matches the box aspect ratio.
+
+    Returns:
+        (cols, rows, cell_w, cell_h)
+    """
+    cols = max(math.ceil(math.sqrt(n * (width / max(height, 1)))), 1)
+    rows = math.ceil(n / cols)
+    return cols, rows, width / cols, height / max(rows, 1)
+
+
+def jittered_grid(x: float, y: float, width: float, height: float, jitter_x, jitter_y) -> list:
+    """Lay out len(jitter_x) points on a grid over a box, offset and clamped.
+
+    Each point sits at its cell center plus its jitter, clamped to the box.
+
+    Args:
+        x, y, width, height: the box
+        jitter_x, jitter_y: per-point offsets (e.g. from deterministic_random)
+
+    Returns:
+        list of (x, y) tuples in row-major order
+    """
+    n = len(jitter_x)
+    if n == 0:
+        return []
+    cols, _, cell_w, cell_h = grid_shape(n, width, height)
+    if np is not None:
+        i = np.arange(n)
+        px = x + (i % cols) * cell_w + cell_w / 2 + np.asarray(jitter_x, dtype=float)
+        py = y + (i // cols) * cell_h + cell_h / 2 + np.asarray(jitter_y, dtype=float)
+        px = np.maximum(x, np.minimum(px, x + width))
+        py = np.maximum(y, np.minimum(py, y + height))
+        return list(zip(px.tolist(), py.tolist()))
+    points = []
+    for i in range(n):
+        px = x + (i % cols) * cell_w + cell_w / 2 + jitter_x[i]
+        py = y + (i // cols) * cell_h + cell_h / 2 + jitter_y[i]
+        points.append((max(x, min(px, x + width)), max(y, min(py, y + height))))
+    return points
+
+
+def _neighbour_edges(points, cell):
+    """(length, i, j) for every pair in the same or adjacent grid cells."""
+    buckets = {}
+    for i, (x, y) in enumerate(points):
+        buckets.setdefault((math.floor(x / cell), math.floor(y / cell)), []).append(i)
+    edges = []
+    for (gx, gy), members in buckets.items():
+        # Half of the 3x3 neighbourhood, so every pair of cells is visited once
+        for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+            others = members if (dx, dy) == (0, 0) else buckets.get((gx + dx, gy + dy), ())
+            for a_pos, i in enumerate(members):
+                start = a_pos + 1 if (dx, dy) == (0, 0) else 0
+                xi, yi = points[i]
+                for j in others[start:]:
+                    xj, yj = points[j]
+                    edges.append((math.hypot(xj - xi, yj - yi), min(i, j), max(i, j)))
+    return edges
+
+
+def minimum_spanning_tree(points, cell: float = None) -> list:
+    """Connect points with a minimum spanning tree of their neighbour graph.
+
+    Points are bucketed into a grid; only pairs in the same or adjacent
+    cells become candidate edges, which Kruskal's algorithm then sorts and
+    joins with a union-find. For evenly spread points (such as a jittered
+    grid) that is O(n log n). If the neighbour graph leaves the points
+    disconnected, the cell size doubles and the search repeats.
+
+    Args:
+        points: sequence of (x, y)
+        cell: bucket size; defaults to the mean spacing of the points
+
+    Returns:
+        list of (i, j) index pairs with i < j, shortest first (n - 1 edges)
+    """
+    n = len(points)
+    if n < 2:
+        return []
+    if cell is None:
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        w, h = max(xs) - min(xs), max(ys) - min(ys)
+        cell = max(math.sqrt(w * h / n), (w + h) / n, 1e-6)
+
+    while True:
+        parent = list(range(n))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        tree = []
+        for _, i, j in sorted(_neighbour_edges(points, cell)):
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[ri] = rj
+                tree.append((i, j))
+                if len(tree) == n - 1:
+                    return tree
+        cell *= 2
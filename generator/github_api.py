@@ -2,23 +2,73 @@
 
 import logging
 import os
+import threading
 import time
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 
 import requests
 
+from generator.contrib_calendar import ContributionCalendar
+
 logger = logging.getLogger(__name__)
 
 
+class RateLimit:
+    """Remaining GitHub API calls, as last reported by response headers.
+
+    GitHub keeps separate budgets per resource (core, graphql, search...);
+    ``remaining`` is the smallest one that has not been reset yet. One
+    instance can be shared by every GitHubAPI of a source.
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._resources = {}  # resource -> (remaining, reset epoch seconds)
+        self._lock = threading.Lock()
+
+    def update(self, headers):
+        """Record the X-RateLimit-* headers of a response."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        resource = headers.get("X-RateLimit-Resource", "core")
+        reset = int(headers.get("X-RateLimit-Reset", 0))
+        with self._lock:
+            self._resources[resource] = (int(remaining), reset)
+
+    def _current(self):
+        now = self.clock()
+        return [(left, reset) for left, reset in self._resources.values() if reset > now]
+
+    @property
+    def remaining(self):
+        """Calls left in the tightest budget, or None when unknown (or all reset)."""
+        with self._lock:
+            current = self._current()
+        return min(left for left, _ in current) if current else None
+
+    def reset_in(self) -> float:
+        """Seconds until the tightest budget resets (0 when unknown)."""
+        with self._lock:
+            current = self._current()
+        if not current:
+            return 0.0
+        return max(min(current)[1] - self.clock(), 0.0)
+
+
 class GitHubAPI:
     """Fetches GitHub stats via GraphQL (with token) or REST (fallback)."""
 
     GRAPHQL_URL = "https://api.github.com/graphql"
     REST_URL = "https://api.github.com"
 
-    def __init__(self, username: str, token: str = None):
+    def __init__(self, username: str, token: str = None, session: requests.Session = None,
+                 rate_limit: RateLimit = None):
         self.username = username
         self.token = token or os.environ.get("GITHUB_TOKEN", "")
+        # A shared Session reuses connections across users in batch runs
+        self.session = session
+        self.rate_limit = rate_limit or RateLimit()
         self.headers = {"Accept": "application/vnd.github.v3+json"}
         if self.token:
             self.headers["Authorization"] = f"Bearer {self.token}"
@@ -32,7 +82,9 @@ class GitHubAPI:
         kwargs.setdefault("headers", self.headers)
         kwargs.setdefault("timeout", 15)
 
-        resp = requests.request(method, url, **kwargs)
+        http = self.session or requests
+        resp = http.request(method, url, **kwargs)
+        self.rate_limit.update(resp.headers)
 
         # Check rate limit headers
         remaining = resp.headers.get("X-RateLimit-Remaining")
@@ -50,7 +102,8 @@ class GitHubAPI:
             wait = max(reset_ts - int(time.time()), 1)
             logger.warning("Rate limited. Waiting %ds for reset...", wait)
             time.sleep(wait)
-            resp = requests.request(method, url, **kwargs)
+            resp = http.request(method, url, **kwargs)
+            self.rate_limit.update(resp.headers)
 
         return resp
 
@@ -184,6 +237,27 @@ class GitHubAPI:
                 break
             page += 1
 
+    def fetch_org_members(self) -> list:
+        """Fetch member logins of the organization named by ``username``.
+
+        Without a token (or membership) only public members are listed.
+        """
+        members = []
+        page = 1
+        while True:
+            resp = self._request(
+                "GET",
+                f"{self.REST_URL}/orgs/{self.username}/members",
+                params={"per_page": 100, "page": page},
+            )
+            resp.raise_for_status()
+            batch = resp.json()
+            members.extend(member["login"] for member in batch)
+            if len(batch) < 100:
+                break
+            page += 1
+        return members
+
     def _search_count(self, query: str) -> int:
         """Use the GitHub Search API to get a total_count for a query."""
         try:
@@ -199,15 +273,15 @@ class GitHubAPI:
             logger.warning("Search API failed for '%s': %s", query, e)
         return 0
 
-    def fetch_contributions(self) -> dict:
+    def fetch_contributions(self) -> ContributionCalendar:
         """Fetch contribution calendar data via GraphQL.
 
         Returns:
-            dict with total_count (int) and weeks (list of lists of day dicts).
+            ContributionCalendar (empty when unavailable).
         """
         if not self.token:
             logger.warning("Token required for contributions API.")
-            return {"total_count": 0, "weeks": []}
+            return ContributionCalendar()
 
         # Explicit date range: last 365 days
         now = datetime.now(timezone.utc)
@@ -252,30 +326,22 @@ class GitHubAPI:
 
             if "errors" in data:
                 logger.warning("GraphQL errors fetching contributions: %s", data["errors"])
-                return {"total_count": 0, "weeks": []}
+                return ContributionCalendar()
 
             calendar = data["data"]["user"]["contributionsCollection"]["contributionCalendar"]
-            weeks = []
-            for week in calendar["weeks"]:
-                days = []
-                for day in week["contributionDays"]:
-                    days.append({
-                        "date": day["date"],
-                        "count": day["contributionCount"],
-                        "weekday": day["weekday"],
-                    })
-                weeks.append(days)
-
+            days = [day for week in calendar["weeks"] for day in week["contributionDays"]]
             total = calendar["totalContributions"]
-            logger.info("Contributions fetched: total=%d, weeks=%d", total, len(weeks))
+            contributions = ContributionCalendar(
+                date.fromisoformat(days[0]["date"]) if days else None,
+                (day["contributionCount"] for day in days),
+                total,
+            )
+            logger.info("Contributions fetched: total=%d, weeks=%d", total, contributions.num_weeks)
 
-            return {
-                "total_count": total,
-                "weeks": weeks,
-            }
+            return contributions
         except (requests.exceptions.RequestException, ValueError, KeyError) as e:
             logger.warning("Could not fetch contributions: %s", e)
-            return {"total_count": 0, "weeks": []}
+            return ContributionCalendar()
 
     def fetch_languages(self) -> dict:
         """Fetch language byte counts aggregated across all owned non-fork repos."""
@@ -0,0 +1,112 @@
+"""Label placement — greedy collision avoidance for text labels.
+
+Templates describe each label by its text, font size and a short list of
+candidate positions, best first (the first is the label's classic spot).
+``LabelPlacer`` keeps every placed box in a spatial hash, takes the first
+candidate that overlaps nothing and, when all of them collide, the one with
+the least overlap. Each query only visits the few grid cells a box covers,
+so placing n labels costs O(n) box tests on top of the caller's ordering,
+instead of comparing every pair.
+
+Text extents are estimated for monospace fonts; nothing here needs a real
+font metric to keep labels apart.
+"""
+
+import math
+from typing import NamedTuple
+
+# Advance width of one monospace glyph, as a fraction of the font size
+CHAR_WIDTH = 0.6
+# Ascent above the baseline and descent below it, as fractions of the font size
+ASCENT, DESCENT = 0.8, 0.25
+
+
+class Candidate(NamedTuple):
+    """A possible label position: baseline point and SVG text-anchor."""
+
+    x: float
+    y: float
+    anchor: str = "middle"
+
+
+def text_box(text: str, font_size: float, x: float, y: float, anchor: str = "middle") -> tuple:
+    """Estimate the (x0, y0, x1, y1) box of a monospace <text> at baseline (x, y)."""
+    width = len(text) * font_size * CHAR_WIDTH
+    if anchor == "start":
+        x0 = x
+    elif anchor == "end":
+        x0 = x - width
+    else:
+        x0 = x - width / 2
+    return (x0, y - font_size * ASCENT, x0 + width, y + font_size * DESCENT)
+
+
+def _overlap(a, b) -> float:
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    return w * h if w > 0 and h > 0 else 0.0
+
+
+class LabelPlacer:
+    """Places labels one at a time, avoiding everything placed or blocked so far.
+
+    Args:
+        bounds: optional (x0, y0, x1, y1) labels should stay inside
+        cell: spatial hash cell size, roughly a typical label width
+        padding: clearance kept around every label
+    """
+
+    def __init__(self, bounds=None, cell: float = 40, padding: float = 1):
+        self.bounds = bounds
+        self.cell = cell
+        self.padding = padding
+        self._cells = {}  # (cx, cy) -> list of boxes
+
+    def _keys(self, box):
+        c = self.cell
+        for gx in range(math.floor(box[0] / c), math.floor(box[2] / c) + 1):
+            for gy in range(math.floor(box[1] / c), math.floor(box[3] / c) + 1):
+                yield gx, gy
+
+    def block(self, box):
+        """Reserve an (x0, y0, x1, y1) area, e.g. a star, that labels must avoid."""
+        for key in self._keys(box):
+            self._cells.setdefault(key, []).append(box)
+
+    def cost(self, box) -> float:
+        """Overlap area of box with blocked areas, plus any part outside bounds."""
+        seen = set()
+        total = 0.0
+        for key in self._keys(box):
+            for other in self._cells.get(key, ()):
+                if id(other) not in seen:
+                    seen.add(id(other))
+                    total += _overlap(box, other)
+        if self.bounds is not None:
+            area = (box[2] - box[0]) * (box[3] - box[1])
+            total += area - _overlap(box, self.bounds)
+        return total
+
+    def place(self, text: str, font_size: float, candidates) -> Candidate:
+        """Pick the first collision-free candidate (else the least overlapping) and block it.
+
+        Args:
+            text: label text (unescaped)
+            font_size: font size in px
+            candidates: Candidate positions, best first
+
+        Returns:
+            the chosen Candidate
+        """
+        pad = self.padding
+        best, best_box, best_cost = None, None, None
+        for cand in candidates:
+            x0, y0, x1, y1 = text_box(text, font_size, *cand)
+            box = (x0 - pad, y0 - pad, x1 + pad, y1 + pad)
+            cost = self.cost(box)
+            if best_cost is None or cost < best_cost:
+                best, best_box, best_cost = cand, box, cost
+            if cost == 0:
+                break
+        self.block(best_box)
+        return best
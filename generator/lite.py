@@ -0,0 +1,242 @@
+"""Lite render mode — a low-motion, filter-free pass over rendered cards.
+
+Viewers pay for every infinite animation and every filtered element on
+each frame. ``simplify()`` rewrites a card so that:
+
+- at most ``max_animations`` infinite animations survive, spread evenly
+  through the document so every layer keeps a little motion;
+- Gaussian blur and glow filters become precomputed radial-gradient halos
+  (blurred duplicate texts are dropped, other filters are simply removed);
+- a ``prefers-reduced-motion`` rule stops CSS animations for viewers who
+  asked their OS for less motion.
+
+It works on markup only, so it applies equally to painted SVGs and to the
+tokenized layouts of ``generator.paint``.
+"""
+
+import re
+
+MAX_ANIMATIONS = 16
+
+REDUCED_MOTION_CSS = (
+    "    <style>\n"
+    "      @media (prefers-reduced-motion: reduce) {\n"
+    "        * {\n"
+    "          animation-duration: 0.01s !important;\n"
+    "          animation-iteration-count: 1 !important;\n"
+    "          animation-delay: 0s !important;\n"
+    "        }\n"
+    "      }\n"
+    "    </style>"
+)
+
+_SMIL_RE = re.compile(r"<(?:animate|animateTransform|animateMotion|set)\b")
+_TAG_RE = re.compile(r"<[a-zA-Z]")
+_FILTERED_RE = re.compile(r'\sfilter="url\(#[^)]+\)"')
+_STYLE_RE = re.compile(r"<style>(.*?)</style>", re.S)
+_RULE_RE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+_CLASS_RE = re.compile(r'\sclass="([^"]*)"')
+_INLINE_STYLE_RE = re.compile(r'\sstyle="([^"]*)"')
+_FILTER_DEF_RE = re.compile(r'\s*<filter id="([^"]+)"[^>]*>(.*?)</filter>', re.S)
+
+# Infinite-animation candidates, tried in this order at each tag:
+#   moving: an element whose only child is an infinite <animateMotion>
+#   smil:   any other infinite SMIL animation element
+#   tag:    an opening tag, animated through CSS when its class or inline
+#           style names an infinite animation
+_CANDIDATE_RE = re.compile(
+    r"(?P<moving>\s*<(?P<mtag>\w+)\b[^<>]*>\s*<animateMotion\b[^>]*indefinite[^>]*/>\s*</(?P=mtag)>)"
+    r"|(?P<smil>\s*<(?:animate|animateTransform|animateMotion)\b[^>]*indefinite[^>]*/>)"
+    r"|(?P<tag><\w+\b[^<>]*>)"
+)
+
+
+def _css_classes(svg: str):
+    """Return (animated, infinite) sets of class names from the <style> blocks."""
+    animated, infinite = set(), set()
+    for css in _STYLE_RE.findall(svg):
+        for selectors, body in _RULE_RE.findall(css):
+            if "animation" not in body:
+                continue
+            names = set(re.findall(r"\.([\w-]+)", selectors))
+            animated |= names
+            if "infinite" in body:
+                infinite |= names
+    return animated, infinite
+
+
+def _css_animated(tag: str, classes: set) -> bool:
+    style = _INLINE_STYLE_RE.search(tag)
+    if style and "animation: none" in style.group(1):
+        return False
+    if style and ("animation:" in style.group(1) or "animation-name" in style.group(1)):
+        return True
+    cls = _CLASS_RE.search(tag)
+    return bool(cls and classes.intersection(cls.group(1).split()))
+
+
+def measure(svg: str) -> dict:
+    """Count animations, filtered elements and elements in an SVG.
+
+    Returns:
+        dict with keys: animations (SMIL elements plus CSS-animated
+        elements), filters (elements rendered through a filter), elements
+    """
+    animated, _ = _css_classes(svg)
+    css = sum(
+        1 for m in re.finditer(r"<\w+\b[^<>]*>", svg)
+        if not m.group(0).startswith("<style") and _css_animated(m.group(0), animated)
+    )
+    return {
+        "animations": len(_SMIL_RE.findall(svg)) + css,
+        "filters": len(_FILTERED_RE.findall(svg)),
+        "elements": len(_TAG_RE.findall(svg)),
+    }
+
+
+def _stop_animation(tag: str) -> str:
+    style = _INLINE_STYLE_RE.search(tag)
+    if style:
+        value = style.group(1).rstrip("; ")
+        return f'{tag[:style.start()]} style="{value}; animation: none"{tag[style.end():]}'
+    end = -2 if tag.endswith("/>") else -1
+    return f'{tag[:end]} style="animation: none"{tag[end:]}'
+
+
+def _cap_animations(svg: str, max_animations: int) -> str:
+    _, infinite = _css_classes(svg)
+
+    def is_candidate(m):
+        tag = m.group("tag")
+        if tag is None:
+            return True
+        if tag.startswith("<style"):
+            return False
+        style = _INLINE_STYLE_RE.search(tag)
+        inline = style.group(1) if style else ""
+        if "animation:" in inline:
+            # An inline shorthand overrides whatever the class sets
+            return "infinite" in inline and "animation: none" not in inline
+        cls = _CLASS_RE.search(tag)
+        return bool(cls and infinite.intersection(cls.group(1).split()))
+
+    total = sum(1 for m in _CANDIDATE_RE.finditer(svg) if is_candidate(m))
+    if total <= max_animations:
+        return svg
+
+    index = 0
+
+    def drop(m):
+        nonlocal index
+        if not is_candidate(m):
+            return m.group(0)
+        i = index
+        index += 1
+        # Keep exactly max_animations candidates, evenly spaced
+        if (i * max_animations) // total != ((i + 1) * max_animations) // total:
+            return m.group(0)
+        if m.group("tag") is not None:
+            return _stop_animation(m.group("tag"))
+        return ""
+
+    return _CANDIDATE_RE.sub(drop, svg)
+
+
+def _filter_specs(svg: str) -> dict:
+    """Map filter id -> (std_dev, glow_opacity or None for a plain blur)."""
+    specs = {}
+    for fid, body in _FILTER_DEF_RE.findall(svg):
+        std = re.search(r'stdDeviation="([\d.]+)"', body)
+        if std is None:
+            continue
+        glow = None
+        if "feMerge" in body:
+            slope = re.search(r'(?:slope|flood-opacity)="([\d.]+)"', body)
+            glow = float(slope.group(1)) if slope else 0.5
+        specs[fid] = (float(std.group(1)), glow)
+    return specs
+
+
+def _attr(tag: str, name: str):
+    m = re.search(rf'\s{name}="([^"]*)"', tag)
+    return m.group(1) if m else None
+
+
+def _set_attr(tag: str, name: str, value: str) -> str:
+    return re.sub(rf'(\s{name}=")[^"]*(")', rf"\g<1>{value}\g<2>", tag, count=1)
+
+
+def _replace_filters(svg: str):
+    """Swap filters for gradient halos; return (svg, {halo_id: color})."""
+    specs = _filter_specs(svg)
+    halos = {}
+
+    def halo_id(fill):
+        hid = "lite-halo-" + re.sub(r"[^\w-]", "", fill)
+        halos[hid] = fill
+        return hid
+
+    # Blurred duplicates of text carry no content of their own
+    blurred = [fid for fid, (_, glow) in specs.items() if glow is None]
+    if blurred:
+        ids = "|".join(re.escape(fid) for fid in blurred)
+        svg = re.sub(rf'\s*<text\b[^<>]*\sfilter="url\(#(?:{ids})\)"[^<>]*>[^<]*</text>', "", svg)
+
+    def rewrite(m):
+        tag, fid = m.group(0), m.group(2)
+        plain = tag.replace(m.group(1), "", 1)
+        spec = specs.get(fid)
+        fill = _attr(plain, "fill")
+        r = _attr(plain, "r")
+        if (
+            spec is None or not plain.startswith("<circle") or not plain.endswith("/>")
+            or not fill or fill.startswith("url(") or r is None
+        ):
+            return plain
+        std, glow = spec
+        if glow is None:
+            # A blurred disc: a gradient circle reaching past the edge by one sigma
+            return _set_attr(_set_attr(plain, "fill", f"url(#{halo_id(fill)})"), "r", f"{float(r) + std:g}")
+        opacity = float(_attr(plain, "opacity") or 1) * glow
+        halo = (
+            f'<circle cx="{_attr(plain, "cx") or 0}" cy="{_attr(plain, "cy") or 0}" '
+            f'r="{float(r) + 2 * std:g}" fill="url(#{halo_id(fill)})" opacity="{opacity:.2f}"/>'
+        )
+        return halo + plain
+
+    svg = re.sub(r'<\w+\b[^<>]*?(\sfilter="url\(#([^)]+)\)")[^<>]*>', rewrite, svg)
+
+    # Drop filter definitions nothing references any more
+    def unused(m):
+        return "" if f"url(#{m.group(1)})" not in svg else m.group(0)
+
+    svg = _FILTER_DEF_RE.sub(unused, svg)
+    return svg, halos
+
+
+def simplify(svg: str, max_animations: int = MAX_ANIMATIONS) -> str:
+    """Return the lite version of a rendered card.
+
+    Args:
+        svg: card markup
+        max_animations: infinite animations to keep
+    """
+    svg = _cap_animations(svg, max_animations)
+    svg, halos = _replace_filters(svg)
+
+    extra = [
+        f'    <radialGradient id="{hid}">\n'
+        f'      <stop offset="0%" stop-color="{color}" stop-opacity="1"/>\n'
+        f'      <stop offset="100%" stop-color="{color}" stop-opacity="0"/>\n'
+        f'    </radialGradient>'
+        for hid, color in halos.items()
+    ]
+    extra.append(REDUCED_MOTION_CSS)
+    block = "\n".join(extra)
+    end = re.search(r"\s*</defs>", svg)
+    if end:
+        return f"{svg[:end.start()]}\n{block}\n  </defs>{svg[end.end():]}"
+    if "<defs/>" in svg:
+        return svg.replace("<defs/>", f"<defs>\n{block}\n  </defs>", 1)
+    root = re.search(r"<svg\b[^>]*>", svg)
+    return f"{svg[:root.end()]}\n  <defs>\n{block}\n  </defs>{svg[root.end():]}"
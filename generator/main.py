@@ -1,80 +1,32 @@
 """Entry point for the Galaxy Profile README generator."""  # noqa
 
 import argparse
-import datetime
 import logging
 import os
 import sys
+import tempfile
+import time
 
 import requests
 import yaml
 
+from generator import fragment_cache
 from generator.config import ConfigError, validate_config
-from generator.github_api import GitHubAPI
+from generator.output import log_summary, resolve_variants, write_svgs
+from generator.sources import DemoSource, GitHubSource
 from generator.svg_builder import SVGBuilder
-from generator.utils import deterministic_random
+from generator.utils import THEME_PRESETS, resolve_named_theme
 
 logger = logging.getLogger(__name__)
 
-DEMO_STATS = {"commits": 1847, "stars": 342, "prs": 156, "issues": 89, "repos": 42}
-DEMO_LANGUAGES = {
-    "Python": 450000,
-    "TypeScript": 380000,
-    "JavaScript": 120000,
-    "Go": 95000,
-    "Rust": 45000,
-    "Shell": 30000,
-    "Dockerfile": 15000,
-    "CSS": 10000,
-}
-
-
-def _generate_demo_contributions() -> dict:
-    """Generate synthetic contribution calendar data for demo mode."""
-    today = datetime.date.today()
-    # Go back ~52 weeks, align to Sunday
-    start = today - datetime.timedelta(weeks=52)
-    start = start - datetime.timedelta(days=(start.weekday() + 1) % 7)
-
-    total_days = 52 * 7
-    counts = deterministic_random("demo_contributions", total_days, 0, 15)
-    counts = [int(c) for c in counts]
-
-    weeks = []
-    total_count = 0
-    day_idx = 0
-    for w in range(52):
-        week_days = []
-        for d in range(7):
-            date = start + datetime.timedelta(weeks=w, days=d)
-            count = counts[day_idx]
-            # Reduce weekend activity
-            if d in (0, 6):
-                count = int(count * 0.3)
-            count = max(0, count)
-            total_count += count
-            week_days.append({
-                "date": date.isoformat(),
-                "count": count,
-                "weekday": d,
-            })
-            day_idx += 1
-        weeks.append(week_days)
-
-    return {"total_count": total_count, "weeks": weeks}
 
+def _theme_names(args) -> list:
+    """Names given to --themes, in order."""
+    return [n for n in (n.strip() for n in (getattr(args, "themes", None) or "").split(",")) if n]
 
-def generate(args):
-    """Generate SVGs from config (existing behavior extracted into a function)."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
 
-    demo = getattr(args, "demo", False)
-
-    # Load config
+def _load_config(demo: bool) -> dict:
+    """Load and validate config.yml (config.example.yml in demo mode), exiting on errors."""
     if demo:
         config_path = os.path.join(os.path.dirname(__file__), "..", "config.example.yml")
     else:
@@ -95,73 +47,319 @@ def generate(args):
     except ConfigError as e:
         logger.error("Invalid config: %s", e)
         sys.exit(1)
+    return config
+
+
+def generate_roster(args):
+    """Render every profile of a roster (--roster) in one process."""
+    from generator.batch import QUEUE_FILE, BatchOptions, load_roster, log_batch_summary, run_batch
+    from generator.shards import parse_shard, select_shard, write_manifest
+    from generator.work_queue import WorkQueue
+
+    try:
+        entries = load_roster(args.roster)
+        shard = parse_shard(args.shard) if args.shard else None
+    except (ConfigError, ValueError, OSError, yaml.YAMLError) as e:
+        logger.error("Invalid roster: %s", e)
+        sys.exit(1)
+    if shard:
+        entries = select_shard(entries, *shard)
+        logger.info("Shard %d/%d: %d users.", *shard, len(entries))
+
+    options = BatchOptions(
+        themes=tuple(_theme_names(args)),
+        bundle=getattr(args, "bundle", False),
+        lite=getattr(args, "lite", False),
+        variants=resolve_variants(
+            precompress=getattr(args, "precompress", False),
+            svgz=getattr(args, "svgz", False),
+        ),
+    )
+    source = DemoSource() if getattr(args, "demo", False) else GitHubSource()
+    output_root = args.output or os.path.join(os.path.dirname(__file__), "..", "assets", "generated")
+
+    os.makedirs(output_root, exist_ok=True)
+    queue = WorkQueue(os.path.join(output_root, QUEUE_FILE))
+
+    logger.info("Batch: %d users, %d workers -> %s%s", len(entries), args.workers, output_root,
+                " (resuming)" if args.resume else "")
+    start = time.perf_counter()
+    try:
+        results = run_batch(entries, source, output_root, options, workers=args.workers,
+                            queue=queue, resume=args.resume, fresh_for=args.fresh_for * 3600)
+    finally:
+        queue.close()
+    write_manifest(output_root, results, shard)
+    log_batch_summary(results, time.perf_counter() - start)
+
+    cache = fragment_cache.get_cache()
+    logger.info("Fragment cache: %d hits, %d misses.", cache.hits, cache.misses)
+    if not all(r["ok"] for r in results):
+        sys.exit(1)
+
+
+def org(args):
+    """Render one profile aggregated over an organization's members."""
+    from generator.batch import load_roster
+    from generator.org import OrgAggregate, fetch_members
+    from generator.work_queue import WorkQueue
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    demo = getattr(args, "demo", False)
+    config = _load_config(demo)
+    name = config["username"]
+    source = DemoSource() if demo else GitHubSource()
+
+    palettes = {}
+    for theme in _theme_names(args):
+        try:
+            palettes[theme] = resolve_named_theme(theme, config)
+        except KeyError:
+            logger.error("Unknown theme '%s'.", theme)
+            sys.exit(1)
+
+    try:
+        if args.roster:
+            members = [entry.name for entry in load_roster(args.roster)]
+        else:
+            members = source.org_members(name)
+    except (ConfigError, OSError, yaml.YAMLError, requests.exceptions.RequestException) as e:
+        logger.error("Could not list members: %s", e)
+        sys.exit(1)
+    logger.info("Aggregating %d members of %s...", len(members), name)
+
+    output_dir = args.output or os.path.join(os.path.dirname(__file__), "..", "assets", "generated")
+    os.makedirs(output_dir, exist_ok=True)
+    # Run state stays out of the output directory, which the workflow publishes
+    state_dir = args.state_dir or os.path.join(os.path.dirname(__file__), "..", ".cache", "org")
+    os.makedirs(state_dir, exist_ok=True)
+    queue = WorkQueue(os.path.join(state_dir, f"{name}.members.sqlite"))
+    try:
+        profiles, failures = fetch_members(members, source, args.workers, queue,
+                                           fresh_for=args.fresh_for * 3600)
+    finally:
+        queue.close()
+    for member, error in failures.items():
+        logger.warning("Could not fetch member %s, keeping its previous data: %s", member, error)
+
+    aggregate_path = os.path.join(state_dir, f"{name}.aggregate.json")
+    try:
+        aggregate = OrgAggregate.load(aggregate_path)
+    except FileNotFoundError:
+        aggregate = OrgAggregate()
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Rebuilding the aggregate, could not read %s: %s", aggregate_path, e)
+        aggregate = OrgAggregate()
+    changed = aggregate.update(profiles, members)
+    logger.info("Aggregate updated for %d of %d members.", changed, len(members))
+    if not len(aggregate):
+        logger.error("No member data could be fetched.")
+        sys.exit(1)
+    aggregate.save(aggregate_path)
+    stats, languages, contributions = aggregate.profile()
+    logger.info("Org stats: %s", stats)
+    logger.info("Languages: %d found", len(languages))
+
+    builder = SVGBuilder(config, stats, languages, contributions)
+    summary = write_svgs(output_dir, builder.render_files(palettes))
+    log_summary(summary)
+    logger.info("Done! %d members aggregated (%d failed to refresh), %d SVGs generated.",
+                len(aggregate), len(failures), len(summary))
+
+
+def _parse_ttls(specs: list) -> dict:
+    """--ttl DATASET=SECONDS options as a dict."""
+    from generator.sources import DATASETS
+
+    ttls = {}
+    for spec in specs or ():
+        dataset, _, seconds = spec.partition("=")
+        try:
+            ttls[dataset] = float(seconds)
+        except ValueError:
+            dataset = None
+        if dataset not in DATASETS or ttls[dataset] < 0:
+            logger.error("--ttl must look like DATASET=SECONDS with DATASET one of: %s",
+                         ", ".join(DATASETS))
+            sys.exit(1)
+    return ttls
+
+
+def serve(args):
+    """Serve cards over HTTP, rendering on demand."""
+    from generator.batch import load_roster
+    from generator.disk_cache import DiskCache
+    from generator.refresher import Refresher
+    from generator.server import ProfileService, load_users, make_server, run_workers
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    demo = getattr(args, "demo", False)
+    config = _load_config(demo)
+    users = None
+    if args.roster:
+        try:
+            users = load_users(load_roster(args.roster))
+        except (ConfigError, OSError, yaml.YAMLError) as e:
+            logger.error("Invalid roster: %s", e)
+            sys.exit(1)
+
+    if args.workers > 1 and not hasattr(os, "fork"):
+        logger.error("--workers needs os.fork(), which this platform lacks")
+        sys.exit(1)
+    disk_path = args.disk_cache
+    temporary = disk_path is None and args.workers > 1
+    if temporary:
+        fd, disk_path = tempfile.mkstemp(prefix="galaxy-serve-", suffix=".sqlite")
+        os.close(fd)
+    disk = None
+    if disk_path:
+        disk = DiskCache(disk_path)
+        disk.prune()
+
+    def build_service():
+        service = ProfileService(
+            config,
+            DemoSource() if demo else GitHubSource(),
+            users=users,
+            ttls=_parse_ttls(args.ttl),
+            cache_size=args.cache_size,
+            disk=disk,
+        )
+        if not args.no_refresh:
+            Refresher(service, reserve=args.reserve, idle_after=args.evict_after * 3600).start()
+        return service
+
+    logger.info("Serving %s on /<user>/<card>.svg",
+                f"{len(users)} roster users" if users is not None else "any user")
+    try:
+        if args.workers > 1:
+            run_workers(build_service, args.host, args.port, args.workers)
+            return
+        service = build_service()
+        server = make_server(service, args.host, args.port)
+        logger.info("Listening on http://%s:%d", *server.server_address[:2])
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if service.refresher is not None:
+                service.refresher.stop()
+    finally:
+        if temporary:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(disk_path + suffix):
+                    os.remove(disk_path + suffix)
+
+
+def merge(args):
+    """Combine the manifests and run reports of sharded roster runs into one index."""
+    from generator.shards import INDEX_FILE, merge_shards
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    try:
+        index = merge_shards(args.shard_dirs, args.output)
+    except (ValueError, KeyError, OSError) as e:
+        logger.error("Cannot merge shards: %s", e)
+        sys.exit(1)
+    totals = index["totals"]
+    logger.info(
+        "Merged %d/%d shards: %d users (%d ok, %d failed), %d files -> %s",
+        index["shards"] - len(index["missing"]), index["shards"], totals["users"], totals["ok"],
+        totals["failed"], totals["files"], os.path.join(args.output, INDEX_FILE),
+    )
+
+
+def generate(args):
+    """Generate SVGs from config (existing behavior extracted into a function)."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    cache_dir = getattr(args, "fragment_cache", None)
+    if cache_dir:
+        fragment_cache.configure(directory=cache_dir)
+
+    if getattr(args, "roster", None):
+        generate_roster(args)
+        return
+    if getattr(args, "shard", None):
+        logger.error("--shard only applies to --roster runs.")
+        sys.exit(1)
+
+    demo = getattr(args, "demo", False)
+    config = _load_config(demo)
 
     username = config["username"]
 
+    palettes = {}
+    for name in _theme_names(args):
+        try:
+            palettes[name] = resolve_named_theme(name, config)
+        except KeyError:
+            available = sorted({*THEME_PRESETS, *config["themes"]})
+            logger.error("Unknown theme '%s'. Available: %s", name, ", ".join(available))
+            sys.exit(1)
+
     logger.info("Generating profile SVGs for @%s...", username)
 
     if demo:
         logger.info("Demo mode: using hardcoded stats and languages.")
-        stats = DEMO_STATS
-        languages = DEMO_LANGUAGES
-        contributions = _generate_demo_contributions()
+        source = DemoSource()
     else:
         # Fetch GitHub data
-        api = GitHubAPI(username)
-        token_status = "PAT/token present" if api.token else "NO token found"
+        source = GitHubSource()
+        token_status = "PAT/token present" if source.api(username).token else "NO token found"
         logger.info("Token status: %s", token_status)
-
-        logger.info("Fetching stats...")
-        try:
-            stats = api.fetch_stats()
-        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
-            logger.warning("Could not fetch stats (%s). Using defaults.", e)
-            stats = {"commits": 0, "stars": 0, "prs": 0, "issues": 0, "repos": 0}
-
-        logger.info("Fetching languages...")
-        try:
-            languages = api.fetch_languages()
-        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
-            logger.warning("Could not fetch languages (%s). Using defaults.", e)
-            languages = {}
-
-        logger.info("Fetching contributions...")
-        try:
-            contributions = api.fetch_contributions()
-        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
-            logger.warning("Could not fetch contributions (%s). Using defaults.", e)
-            contributions = {"total_count": 0, "weeks": []}
+    stats, languages, contributions = source.fetch(username)
 
     logger.info("Stats: %s", stats)
     logger.info("Languages: %d found", len(languages))
     logger.info(
-        "Contributions: total=%d, weeks=%d",
-        contributions.get("total_count", 0),
-        len(contributions.get("weeks", [])),
+        "Contributions: total=%d, weeks=%d", contributions.total_count, contributions.num_weeks
     )
 
     # Build SVGs
-    builder = SVGBuilder(config, stats, languages, contributions)
+    builder = SVGBuilder(config, stats, languages, contributions, lite=getattr(args, "lite", False))
     output_dir = os.path.join(os.path.dirname(__file__), "..", "assets", "generated")
     os.makedirs(output_dir, exist_ok=True)
 
-    svgs = {
-        "galaxy-header.svg": builder.render_galaxy_header(),
-        "stats-card.svg": builder.render_stats_card(),
-        "tech-stack.svg": builder.render_tech_stack(),
-        "projects-constellation.svg": builder.render_projects_constellation(),
-        "contribution-heatmap.svg": builder.render_contribution_heatmap(),
-        "skill-constellation.svg": builder.render_skill_constellation(),
-        "coding-timeline.svg": builder.render_coding_timeline(),
-    }
+    svgs = builder.render_files(palettes, bundle=getattr(args, "bundle", False))
 
-    for filename, content in svgs.items():
-        path = os.path.join(output_dir, filename)
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(content)
-        logger.info("Wrote %s", path)
+    variants = resolve_variants(
+        precompress=getattr(args, "precompress", False),
+        svgz=getattr(args, "svgz", False),
+    )
+    summary = write_svgs(output_dir, svgs, variants)
+    log_summary(summary)
 
-    logger.info("Done! %d SVGs generated.", len(svgs))
+    for card, report in builder.lite_report.items():
+        before, after = report["before"], report["after"]
+        logger.info(
+            "Lite %-24s animations %4d -> %-4d filters %3d -> %-3d elements %4d -> %d",
+            card, before["animations"], after["animations"], before["filters"],
+            after["filters"], before["elements"], after["elements"],
+        )
+
+    written = sum(1 for row in summary if row["written"])
+    cache = fragment_cache.get_cache()
+    logger.info("Fragment cache: %d hits, %d misses.", cache.hits, cache.misses)
+    logger.info("Done! %d SVGs generated (%d changed).", len(svgs), written)
 
 
 def main():
@@ -178,6 +376,230 @@ def main():
         action="store_true",
         help="Generate SVGs with demo data (no API calls, uses config.example.yml)",
     )
+    gen_parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="Also write .svg.gz (and .svg.br if brotli is installed) next to each SVG",
+    )
+    gen_parser.add_argument(
+        "--svgz",
+        action="store_true",
+        help="Also write a gzip-compressed .svgz copy of each SVG",
+    )
+    gen_parser.add_argument(
+        "--lite",
+        action="store_true",
+        help="Low-motion render: cap infinite animations, replace blur filters with "
+             "gradient halos and honor prefers-reduced-motion",
+    )
+    gen_parser.add_argument(
+        "--bundle",
+        action="store_true",
+        help="Write all cards into a single bundle.svg, referenced as bundle.svg#<card>",
+    )
+    gen_parser.add_argument(
+        "--themes",
+        metavar="NAMES",
+        help="Comma-separated theme variants to render, e.g. dark,light "
+             "(writes <card>-<theme>.svg; custom names come from 'themes:' in config)",
+    )
+    gen_parser.add_argument(
+        "--fragment-cache",
+        metavar="DIR",
+        help="Persist cached SVG fragments (starfields, nebulae, legends) in DIR across runs",
+    )
+    gen_parser.add_argument(
+        "--roster",
+        metavar="PATH",
+        help="Render many profiles in one process: a roster YAML file (optional 'base' "
+             "config plus a 'users' list) or a directory of config files",
+    )
+    gen_parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Users processed concurrently with --roster (default: 4)",
+    )
+    gen_parser.add_argument(
+        "--output",
+        metavar="DIR",
+        help="Output root for --roster; each user is written to DIR/<username>/ "
+             "(default: assets/generated)",
+    )
+    gen_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted --roster run from its queue (DIR/queue.sqlite) "
+             "instead of starting over",
+    )
+    gen_parser.add_argument(
+        "--fresh-for",
+        type=float,
+        default=0.0,
+        metavar="HOURS",
+        help="With --roster, skip users rendered from data fetched less than HOURS ago",
+    )
+    gen_parser.add_argument(
+        "--shard",
+        metavar="i/N",
+        help="With --roster, render only shard i of N (1-based); users are assigned by a "
+             "stable hash of their username",
+    )
+
+    # Subcommand: org
+    org_parser = subparsers.add_parser(
+        "org", help="Render one profile aggregated over an organization's members"
+    )
+    org_parser.add_argument(
+        "--demo",
+        action="store_true",
+        help="Use demo member data (no API calls, uses config.example.yml)",
+    )
+    org_parser.add_argument(
+        "--roster",
+        metavar="PATH",
+        help="Take the members from a roster instead of the GitHub org named by 'username'",
+    )
+    org_parser.add_argument("--workers", type=int, default=4, help="Parallel member fetches")
+    org_parser.add_argument("--themes", metavar="NAMES", help="Comma-separated theme variants")
+    org_parser.add_argument(
+        "--output",
+        metavar="DIR",
+        help="Output directory (default: assets/generated)",
+    )
+    org_parser.add_argument(
+        "--state-dir",
+        metavar="DIR",
+        help="Where the member queue and saved aggregate are kept between runs "
+             "(default: .cache/org)",
+    )
+    org_parser.add_argument(
+        "--fresh-for",
+        type=float,
+        default=0.0,
+        metavar="HOURS",
+        help="Reuse member data fetched less than HOURS ago instead of refetching it",
+    )
+
+    # Subcommand: serve
+    serve_parser = subparsers.add_parser("serve", help="Serve cards over HTTP, rendered on demand")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    serve_parser.add_argument(
+        "--demo",
+        action="store_true",
+        help="Serve demo data for every user (no API calls, uses config.example.yml)",
+    )
+    serve_parser.add_argument(
+        "--roster",
+        metavar="PATH",
+        help="Serve only the users of this roster, each with its own config "
+             "(default: any user, with config.yml)",
+    )
+    serve_parser.add_argument(
+        "--ttl",
+        action="append",
+        metavar="DATASET=SECONDS",
+        help="Freshness of a dataset (stats, languages, contributions); repeatable",
+    )
+    serve_parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1024,
+        help="Entries kept in each of the data and render caches (default: 1024)",
+    )
+    serve_parser.add_argument(
+        "--no-refresh",
+        action="store_true",
+        help="Refetch expired data inline instead of serving it stale while a background "
+             "refresher updates it",
+    )
+    serve_parser.add_argument(
+        "--reserve",
+        type=int,
+        default=100,
+        help="GitHub API calls the background refresher leaves for first-time requests "
+             "(default: 100)",
+    )
+    serve_parser.add_argument(
+        "--evict-after",
+        type=float,
+        default=24.0,
+        metavar="HOURS",
+        help="Drop cached data of users not requested for HOURS (default: 24)",
+    )
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes sharing the port and an on-disk cache (default: 1)",
+    )
+    serve_parser.add_argument(
+        "--disk-cache",
+        metavar="PATH",
+        help="SQLite file shared by the workers for fetched data and rendered cards "
+             "(default: a temporary file when --workers > 1)",
+    )
+
+    # Subcommand: merge
+    merge_parser = subparsers.add_parser(
+        "merge", help="Combine the manifests and reports of --shard runs into index.json"
+    )
+    merge_parser.add_argument("shard_dirs", nargs="+", metavar="DIR", help="Shard output roots")
+    merge_parser.add_argument(
+        "--output",
+        default=".",
+        metavar="DIR",
+        help="Directory to write index.json into (default: current directory)",
+    )
+
+    # Subcommand: bench
+    bench_parser = subparsers.add_parser("bench", help="Run performance benchmarks")
+    bench_sub = bench_parser.add_subparsers(dest="bench_command", required=True)
+    bench_render = bench_sub.add_parser("render", help="Time each template's render()")
+    bench_render.add_argument("--iterations", type=int, default=200)
+    bench_render.add_argument("--config", help="Config file (default: config.example.yml)")
+    bench_render.add_argument(
+        "--warm-cache",
+        action="store_true",
+        help="Keep the fragment cache enabled between iterations",
+    )
+    bench_serve = bench_sub.add_parser("serve", help="Load-test serve mode")
+    bench_serve.add_argument("--users", type=int, default=100, help="Distinct users requested")
+    bench_serve.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    bench_serve.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    bench_serve.add_argument("--cards", help="Comma-separated cards to request (default: all)")
+    bench_serve.add_argument(
+        "--themes",
+        help="Comma-separated themes to request; an empty item means no theme "
+             "parameter (default: ',light')",
+    )
+    bench_serve.add_argument(
+        "--skew", type=float, default=1.1, help="Zipf exponent of user popularity, 0 for uniform"
+    )
+    bench_serve.add_argument(
+        "--latency",
+        type=float,
+        default=50.0,
+        metavar="MS",
+        help="Simulated GitHub latency per dataset fetch of the in-process server (default: 50)",
+    )
+    bench_serve.add_argument(
+        "--url", help="Drive a running server (e.g. http://127.0.0.1:8080) instead of an in-process one"
+    )
+    bench_serve.add_argument("--config", help="Config file (default: config.example.yml)")
+    bench_serve.add_argument("--seed", type=int, default=0, help="Seed of the request mix")
+    bench_serve.add_argument(
+        "--no-refresh",
+        action="store_true",
+        help="Run the in-process server without the background refresher (as serve --no-refresh)",
+    )
+    bench_serve.add_argument(
+        "--disk-cache", metavar="PATH", help="Shared SQLite cache of the in-process server (as serve)"
+    )
+    bench_serve.add_argument(
+        "--workers", type=int, default=1, help="Pre-forked in-process server workers (as serve)"
+    )
 
     # Top-level --demo for backward compatibility (python -m generator.main --demo)
     parser.add_argument(
@@ -191,6 +613,15 @@ def main():
     if args.command == "init":
         from generator.cli_init import run_init
         run_init()
+    elif args.command == "org":
+        org(args)
+    elif args.command == "serve":
+        serve(args)
+    elif args.command == "merge":
+        merge(args)
+    elif args.command == "bench":
+        from generator.bench import run_bench
+        run_bench(args)
     else:
         # Default behavior: generate (supports both `generate --demo` and `--demo`)
         generate(args)
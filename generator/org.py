@@ -0,0 +1,223 @@
+"""Organization profiles — one galaxy aggregated over many members.
+
+Member profiles are fetched in parallel (the map step) and folded into one
+ProfileData with ``combine`` (the reduce step). ``combine`` is associative
+with ``EMPTY_PROFILE`` as its identity, so members can be merged in any
+grouping: stats and language bytes are summed per key, contribution
+calendars are summed per day over the union of their date ranges.
+
+``OrgAggregate`` keeps the same sums in invertible form: replacing or
+removing one member subtracts its old contribution and adds the new one,
+without re-reducing the rest of the organization. The ``org`` command
+saves it between runs (``save``/``load``) and only applies the members
+whose data changed.
+"""
+
+import datetime
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from generator.contrib_calendar import ContributionCalendar
+from generator.sources import FETCH_ERRORS, ProfileData, decode_profile, encode_profile
+
+logger = logging.getLogger(__name__)
+
+EMPTY_PROFILE = ProfileData({}, {}, ContributionCalendar())
+
+
+def combine_counts(a: dict, b: dict) -> dict:
+    """Sum two mappings of counts key by key."""
+    merged = dict(a)
+    for key, value in b.items():
+        merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def combine_calendars(a: ContributionCalendar, b: ContributionCalendar) -> ContributionCalendar:
+    """Sum two calendars day by day over the union of their ranges."""
+    if not len(a):
+        return ContributionCalendar(b.start, b.counts, a.total_count + b.total_count)
+    if not len(b):
+        return ContributionCalendar(a.start, a.counts, a.total_count + b.total_count)
+    start = min(a.start, b.start)
+    counts = [0] * ((max(a.end, b.end) - start).days + 1)
+    for calendar in (a, b):
+        offset = (calendar.start - start).days
+        for i, count in enumerate(calendar.counts):
+            counts[offset + i] += count
+    return ContributionCalendar(start, counts, a.total_count + b.total_count)
+
+
+def combine(a: ProfileData, b: ProfileData) -> ProfileData:
+    """Merge two (member or partial org) profiles."""
+    return ProfileData(
+        combine_counts(a.stats, b.stats),
+        combine_counts(a.languages, b.languages),
+        combine_calendars(a.contributions, b.contributions),
+    )
+
+
+class _Sums:
+    """Per-key totals supporting subtraction; a key lives while a member has it."""
+
+    def __init__(self, totals: dict = None):
+        self._totals = totals or {}  # key -> [total, members with the key]
+
+    def apply(self, values: dict, sign: int):
+        for key, value in values.items():
+            slot = self._totals.setdefault(key, [0, 0])
+            slot[0] += sign * value
+            slot[1] += sign
+            if not slot[1]:
+                del self._totals[key]
+
+    def as_dict(self) -> dict:
+        return {key: slot[0] for key, slot in self._totals.items()}
+
+
+class OrgAggregate:
+    """Running org profile, updated one member at a time."""
+
+    def __init__(self):
+        self.members = {}  # name -> ProfileData
+        self._stats = _Sums()
+        self._languages = _Sums()
+        self._days = _Sums()  # date ordinal -> contributions
+        self._total_count = 0
+
+    def __len__(self):
+        return len(self.members)
+
+    def _apply(self, data: ProfileData, sign: int):
+        self._stats.apply(data.stats, sign)
+        self._languages.apply(data.languages, sign)
+        calendar = data.contributions
+        if len(calendar):
+            first = calendar.start.toordinal()
+            self._days.apply({first + i: count for i, count in enumerate(calendar.counts)}, sign)
+        self._total_count += sign * calendar.total_count
+
+    def set(self, name: str, data: ProfileData):
+        """Add a member, or replace its previous data."""
+        self.remove(name)
+        self.members[name] = data
+        self._apply(data, 1)
+
+    def remove(self, name: str):
+        """Drop a member (no-op if absent)."""
+        old = self.members.pop(name, None)
+        if old is not None:
+            self._apply(old, -1)
+
+    def update(self, profiles: dict, members: list = None) -> int:
+        """Apply freshly fetched profiles (name -> ProfileData), touching only changes.
+
+        Args:
+            profiles: the members fetched this run
+            members: the full member list; members missing from it are removed,
+                while members missing only from profiles (a failed fetch) keep
+                their previous data. Defaults to the names in profiles.
+
+        Returns:
+            number of members added, replaced or removed
+        """
+        keep = set(profiles if members is None else members)
+        changed = 0
+        for name in [name for name in self.members if name not in keep]:
+            self.remove(name)
+            changed += 1
+        for name, data in profiles.items():
+            if self.members.get(name) != data:
+                self.set(name, data)
+                changed += 1
+        return changed
+
+    def save(self, path: str):
+        """Write the members and running sums as JSON (atomically)."""
+        state = {
+            "members": {name: encode_profile(data) for name, data in self.members.items()},
+            "stats": self._stats._totals,
+            "languages": self._languages._totals,
+            "days": self._days._totals,
+            "total_count": self._total_count,
+        }
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "OrgAggregate":
+        """Read an aggregate written by save().
+
+        Raises:
+            OSError, ValueError, KeyError: if the file is missing or malformed
+        """
+        with open(path) as f:
+            state = json.load(f)
+        aggregate = cls()
+        aggregate.members = {name: decode_profile(raw) for name, raw in state["members"].items()}
+        aggregate._stats = _Sums(state["stats"])
+        aggregate._languages = _Sums(state["languages"])
+        # JSON object keys are strings; the days are date ordinals
+        aggregate._days = _Sums({int(day): slot for day, slot in state["days"].items()})
+        aggregate._total_count = state["total_count"]
+        return aggregate
+
+    def profile(self) -> ProfileData:
+        """The aggregated org profile (equal to combine() over all members)."""
+        days = self._days.as_dict()
+        if days:
+            first, last = min(days), max(days)
+            calendar = ContributionCalendar(
+                datetime.date.fromordinal(first),
+                (days.get(day, 0) for day in range(first, last + 1)),
+                self._total_count,
+            )
+        else:
+            calendar = ContributionCalendar(total_count=self._total_count)
+        return ProfileData(self._stats.as_dict(), self._languages.as_dict(), calendar)
+
+
+def fetch_members(members: list, source, workers: int = 4, queue=None, fresh_for: float = 0.0):
+    """Fetch member profiles in parallel (the map step).
+
+    Args:
+        members: member logins
+        source: data source (GitHubSource or DemoSource)
+        workers: thread pool size
+        queue: optional WorkQueue caching member data between runs
+        fresh_for: with a queue, reuse data fetched less than this many seconds ago
+
+    Returns:
+        (profiles, failures): dicts of login -> ProfileData and login -> error
+    """
+    if queue is not None:
+        queue.enqueue(dict.fromkeys(members, ""), fresh_for=fresh_for)
+
+    def fetch(name):
+        try:
+            data = queue.load_data(name) if queue else None
+            if data is None:
+                data = source.fetch(name, strict=True)
+                if queue:
+                    queue.mark_fetched(name, data)
+            if queue:
+                queue.mark_rendered(name)
+            return name, data, None
+        except FETCH_ERRORS as e:
+            error = f"{type(e).__name__}: {e}"
+            if queue:
+                queue.mark_failed(name, error)
+            return name, None, error
+
+    profiles, failures = {}, {}
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        for name, data, error in pool.map(fetch, members):
+            if error:
+                failures[name] = error
+            else:
+                profiles[name] = data
+    return profiles, failures
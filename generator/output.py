@@ -0,0 +1,124 @@
+"""Output writers — skip-if-unchanged SVG files and precompressed variants."""
+
+import gzip
+import logging
+import os
+
+try:
+    import brotli
+except ImportError:  # optional: .svg.br variants are skipped without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+def _gzip(data: bytes) -> bytes:
+    # mtime=0 keeps the output byte-identical across runs
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=11)
+
+
+# suffix appended to the .svg filename -> compressor
+VARIANTS = {
+    "gzip": (".gz", _gzip),
+    "br": (".br", _brotli),
+}
+
+
+def write_if_changed(path: str, data: bytes) -> bool:
+    """Write data to path unless the file already holds exactly these bytes.
+
+    Returns:
+        True if the file was written, False if it was left untouched.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, "wb") as f:
+        f.write(data)
+    return True
+
+
+def _variant_path(path: str, name: str) -> str:
+    if name == "svgz":
+        return os.path.splitext(path)[0] + ".svgz"
+    return path + VARIANTS[name][0]
+
+
+def _compressor(name: str):
+    return _gzip if name == "svgz" else VARIANTS[name][1]
+
+
+def resolve_variants(precompress: bool = False, svgz: bool = False) -> list:
+    """Return the list of compressed variants to write for each SVG."""
+    variants = []
+    if precompress:
+        variants.append("gzip")
+        if brotli is not None:
+            variants.append("br")
+        else:
+            logger.info("brotli not installed; skipping .svg.br variants.")
+    if svgz:
+        variants.append("svgz")
+    return variants
+
+
+def write_svgs(output_dir: str, svgs: dict, variants: list = ()) -> list:
+    """Write each SVG and its compressed variants, skipping unchanged files.
+
+    A variant is only recompressed when its SVG changed or the variant file
+    is missing, so a no-op regeneration touches nothing on disk.
+
+    Args:
+        output_dir: directory to write into (must exist)
+        svgs: dict mapping filename to SVG markup
+        variants: names from resolve_variants() ("gzip", "br", "svgz")
+
+    Returns:
+        list of dicts with keys: file, path, size, written, variants
+        (variants maps variant name to compressed size in bytes)
+    """
+    summary = []
+    for filename, content in svgs.items():
+        path = os.path.join(output_dir, filename)
+        data = content.encode("utf-8")
+        written = write_if_changed(path, data)
+
+        sizes = {}
+        for name in variants:
+            vpath = _variant_path(path, name)
+            if not written and os.path.exists(vpath):
+                sizes[name] = os.path.getsize(vpath)
+                continue
+            compressed = _compressor(name)(data)
+            write_if_changed(vpath, compressed)
+            sizes[name] = len(compressed)
+
+        summary.append({
+            "file": filename,
+            "path": path,
+            "size": len(data),
+            "written": written,
+            "variants": sizes,
+        })
+    return summary
+
+
+def _kb(n: int) -> str:
+    return f"{n / 1024:.1f} KB"
+
+
+def log_summary(summary: list) -> None:
+    """Log one line per file with raw and compressed sizes."""
+    for row in summary:
+        sizes = "  ".join(f"{name} {_kb(size)}" for name, size in row["variants"].items())
+        status = "wrote" if row["written"] else "unchanged"
+        logger.info(
+            "%-28s %9s  %s  (%s)", row["file"], _kb(row["size"]), sizes, status
+        )
@@ -0,0 +1,49 @@
+"""Theme paint pass — theme-independent layouts painted with a palette.
+
+Rendering a card against ``theme_tokens()`` instead of a real palette
+yields markup where every theme color is a placeholder token. All of the
+expensive work (spirals, star positions, label wrapping, string building)
+happens once in that layout pass; ``Layout.paint()`` then only splices the
+colors of a palette into the pre-split markup, so every additional theme
+variant costs a single string join.
+"""
+
+import re
+
+from generator.utils import DEFAULT_THEME, PAINT_CLOSE, PAINT_OPEN
+
+_TOKEN_RE = re.compile(f"{PAINT_OPEN}([^{PAINT_CLOSE}]*){PAINT_CLOSE}")
+
+
+def token(key: str) -> str:
+    """Return the placeholder token standing in for theme[key]."""
+    return f"{PAINT_OPEN}{key}{PAINT_CLOSE}"
+
+
+def theme_tokens(theme: dict = None) -> dict:
+    """Return a theme dict mapping every color key to its placeholder token.
+
+    Args:
+        theme: palette whose extra (non-default) keys should be tokenized too
+    """
+    return {key: token(key) for key in {**DEFAULT_THEME, **(theme or {})}}
+
+
+class Layout:
+    """Tokenized markup of one card, split once into static text and color keys."""
+
+    def __init__(self, markup: str):
+        parts = _TOKEN_RE.split(markup)
+        self._static = parts[0::2]
+        self.keys = tuple(parts[1::2])
+
+    def paint(self, palette: dict) -> str:
+        """Return the SVG with every token replaced by its palette color.
+
+        Raises:
+            KeyError: if the palette lacks a color the layout uses
+        """
+        pieces = [None] * (2 * len(self.keys) + 1)
+        pieces[0::2] = self._static
+        pieces[1::2] = [palette[key] for key in self.keys]
+        return "".join(pieces)
@@ -0,0 +1,182 @@
+"""Background refresher for serve mode (stale-while-revalidate).
+
+Attached to a ProfileService, it lets expired datasets be served at once
+while they are refetched in the background, so request latency never
+includes a GitHub round trip once a user has been seen.
+
+Refreshes wait in a heap ordered by priority, highest first:
+
+    priority = requests for the user * (1 + seconds stale / dataset TTL)
+
+so popular profiles are refreshed first and long-stale ones catch up. The
+worker only refreshes while the source's rate limit has more than
+``reserve`` calls left (kept for first-time requests), otherwise it sleeps
+until the budget resets. Users not requested for ``idle_after`` seconds are
+evicted from the caches.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from generator.sources import FETCH_ERRORS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESERVE = 100
+DEFAULT_IDLE_AFTER = 24 * 3600
+
+
+class Refresher:
+    """Priority-ordered, rate-limit-aware refresh worker for a ProfileService.
+
+    Args:
+        service: ProfileService to refresh; the refresher attaches itself
+        reserve: rate-limit calls left untouched for foreground requests
+        idle_after: seconds without requests before a user is evicted
+        interval: seconds between idle-eviction sweeps of the worker
+    """
+
+    def __init__(self, service, reserve: int = DEFAULT_RESERVE,
+                 idle_after: float = DEFAULT_IDLE_AFTER, interval: float = 60.0):
+        self.service = service
+        self.budget = getattr(service.source, "rate_limit", None)
+        self.reserve = reserve
+        self.idle_after = idle_after
+        self.interval = interval
+        self.clock = service.clock
+        self.counters = {"refreshed": 0, "failed": 0, "evicted": 0, "budget_waits": 0}
+        self._heap = []  # (-priority, seq, user, dataset)
+        self._queued = set()
+        self._requests = {}  # user -> request count
+        self._last_seen = {}  # user -> clock time of the last request
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = None
+        service.refresher = self
+
+    def record(self, user: str):
+        """Count a request for user (popularity and idle tracking)."""
+        user = user.lower()
+        with self._cond:
+            self._requests[user] = self._requests.get(user, 0) + 1
+            self._last_seen[user] = self.clock()
+
+    def priority(self, user: str, dataset: str, stale_for: float) -> float:
+        requests = self._requests.get(user.lower(), 1)
+        return requests * (1 + max(stale_for, 0) / self.service.ttls[dataset])
+
+    def schedule(self, user: str, dataset: str, stale_for: float = 0.0):
+        """Queue a refresh of a user's dataset (once until it has run)."""
+        key = (user.lower(), dataset)
+        with self._cond:
+            if key in self._queued:
+                return
+            self._queued.add(key)
+            entry = (-self.priority(user, dataset, stale_for), next(self._seq), user, dataset)
+            heapq.heappush(self._heap, entry)
+            self._cond.notify()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def budget_left(self) -> bool:
+        """Whether the rate limit allows a background refresh now."""
+        remaining = self.budget.remaining if self.budget is not None else None
+        return remaining is None or remaining > self.reserve
+
+    def run_once(self) -> bool:
+        """Refresh the highest-priority queued dataset.
+
+        Returns:
+            False if there was nothing to do or the budget is exhausted
+        """
+        if not self.budget_left():
+            return False
+        with self._cond:
+            if not self._heap:
+                return False
+            _, _, user, dataset = heapq.heappop(self._heap)
+            self._queued.discard((user.lower(), dataset))
+        try:
+            self.service.refresh(user, dataset)
+            self.counters["refreshed"] += 1
+        except FETCH_ERRORS as e:
+            # Keep serving the stale copy; the next request schedules it again
+            self.counters["failed"] += 1
+            logger.warning("Background refresh of %s/%s failed: %s", user, dataset, e)
+        except Exception:
+            self.counters["failed"] += 1
+            logger.exception("Background refresh of %s/%s failed", user, dataset)
+        return True
+
+    def evict_idle(self) -> list:
+        """Evict users not requested for idle_after seconds; returns their logins."""
+        cutoff = self.clock() - self.idle_after
+        with self._cond:
+            idle = [user for user, seen in self._last_seen.items() if seen < cutoff]
+            for user in idle:
+                del self._last_seen[user]
+                self._requests.pop(user, None)
+        for user in idle:
+            self.service.evict(user)
+        self.counters["evicted"] += len(idle)
+        return idle
+
+    @property
+    def alive(self) -> bool:
+        """Whether queued refreshes will run.
+
+        True while the worker thread runs, and for a refresher that was never
+        started (driven by calling run_once()); False once stopped or if the
+        thread has died, so the service refetches expired data inline.
+        """
+        if self._thread is not None:
+            return self._thread.is_alive()
+        return not self._stopped.is_set()
+
+    def _run(self):
+        next_sweep = time.monotonic() + self.interval
+        while not self._stopped.is_set():
+            try:
+                if time.monotonic() >= next_sweep:
+                    next_sweep = time.monotonic() + self.interval
+                    self.evict_idle()
+                if self._heap and not self.budget_left():
+                    self.counters["budget_waits"] += 1
+                    wait = max(min(self.budget.reset_in(), next_sweep - time.monotonic()), 0.1)
+                    logger.info("Rate-limit reserve reached; pausing refreshes for %.0fs.", wait)
+                    self._stopped.wait(wait)
+                    continue
+                if not self.run_once():
+                    with self._cond:
+                        if not self._heap:
+                            self._cond.wait(max(next_sweep - time.monotonic(), 0.01))
+            except Exception:
+                # The thread must outlive any one bad iteration, or stale data is served forever
+                self.counters["failed"] += 1
+                logger.exception("Refresher iteration failed")
+                self._stopped.wait(1.0)
+
+    def start(self):
+        """Run the refresh worker on a daemon thread."""
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the worker thread and wait for it."""
+        self._stopped.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {**self.counters, "queued": len(self._heap), "users": len(self._last_seen),
+                    "budget": self.budget.remaining if self.budget is not None else None}
@@ -0,0 +1,467 @@
+"""Serve mode — render cards on demand over HTTP.
+
+    python -m generator.main serve [--host H] [--port P] [--demo] [--roster PATH]
+
+``GET /<user>/<card>.svg`` renders one card through SVGBuilder. Optional
+query parameters: ``theme`` (a preset or a name under ``themes:``) and
+``metrics`` (comma-separated stats card metrics).
+
+Fetched datasets (stats, languages, contributions) are kept in a TTL cache
+with one time-to-live per dataset. Rendered cards are kept in an LRU keyed
+by user, card, theme, metrics and the versions of the datasets they were
+built from, so a refetch invalidates them without any bookkeeping.
+Responses carry a strong ETag (SHA-1 of the SVG) and a Cache-Control
+max-age equal to the time left before their data expires; a request whose
+If-None-Match matches gets an empty 304.
+
+Concurrent requests that miss the same dataset or card are coalesced: one
+fetch or render runs and every waiter gets its result (see singleflight).
+
+With a Refresher attached, expired datasets are served stale at once and
+refreshed in the background (stale-while-revalidate, see refresher); only a
+user's very first request waits for GitHub.
+
+With ``--workers N`` the listening socket is bound once and N forked
+worker processes accept on it, each with its own in-memory caches in
+front of one shared DiskCache (SQLite, WAL mode): data fetched or cards
+rendered by one worker are reused by the others, and throughput scales
+with cores instead of being capped by one interpreter.
+
+``GET /_stats`` returns request and cache counters as JSON (per worker).
+
+Only the standard library's http.server is used on top of the generator's
+own dependencies.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import signal
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+from generator.batch import USERNAME_RE
+from generator.config import ConfigError, validate_config
+from generator.disk_cache import encode_dataset
+from generator.fragment_cache import code_version
+from generator.singleflight import SingleFlight
+from generator.sources import DATASETS, FETCH_ERRORS
+from generator.svg_builder import CARDS, SVGBuilder
+from generator.ttl_cache import DEFAULT_MAXSIZE, TTLCache
+from generator.utils import METRIC_LABELS, resolve_named_theme
+
+logger = logging.getLogger(__name__)
+
+# Seconds each dataset stays fresh
+DEFAULT_TTLS = {"stats": 3600, "languages": 6 * 3600, "contributions": 3600}
+
+CARD_ROUTE = re.compile(r"^/([^/]+)/([a-z-]+)\.svg$")
+SVG_TYPE = "image/svg+xml; charset=utf-8"
+
+# Workers wait this long for another worker's fetch before fetching themselves
+LEASE_SECONDS = 30.0
+LEASE_POLL = 0.05
+
+
+class Response(NamedTuple):
+    status: int
+    headers: dict
+    body: bytes = b""
+
+
+class Dataset(NamedTuple):
+    value: Any
+    version: str  # SHA-1 of the encoded value, part of the render cache key
+    expires: float
+
+
+class RenderedCard(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class RequestError(Exception):
+    """A request that maps to an HTTP error status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _text(status: int, message: str) -> Response:
+    return Response(status, {"Content-Type": "text/plain; charset=utf-8",
+                             "Cache-Control": "no-store"}, message.encode())
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/ prefixes are ignored."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+def _config_digest(config: dict) -> str:
+    """Identity of a user's validated config and the code rendering it."""
+    payload = json.dumps(config, sort_keys=True, default=str) + code_version()
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def load_users(entries: list) -> dict:
+    """Validated per-user configs from roster entries, keyed by lower-cased login.
+
+    Entries whose config is invalid are logged and left out.
+    """
+    users = {}
+    for entry in entries:
+        try:
+            config = validate_config(copy.deepcopy(entry.config))
+        except ConfigError as e:
+            logger.warning("Not serving %s: %s", entry.name, e)
+            continue
+        users[config["username"].lower()] = config
+    return users
+
+
+class ProfileService:
+    """Caching card renderer behind the HTTP handler.
+
+    Args:
+        config: validated base config, used for any user when users is None
+        source: data source with fetch_dataset() (GitHubSource or DemoSource)
+        users: optional dict of lower-cased login -> config; only these are served
+        ttls: per-dataset TTL overrides in seconds (see DEFAULT_TTLS)
+        cache_size: entries kept in each of the data and render caches
+        disk: optional DiskCache shared with other worker processes
+        clock: wall-clock time source (expiry times are shared through disk)
+    """
+
+    def __init__(self, config: dict, source, users: dict = None, ttls: dict = None,
+                 cache_size: int = DEFAULT_MAXSIZE, disk=None, clock=time.time):
+        self.config = config
+        self.source = source
+        self.users = users
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.clock = clock
+        self.disk = disk
+        self.data = TTLCache(cache_size, clock)
+        self.renders = TTLCache(cache_size, clock)
+        self.fetch_flights = SingleFlight()
+        self.render_flights = SingleFlight()
+        self.refresher = None  # set by Refresher to enable stale-while-revalidate
+        self.counters = {"requests": 0, "not_modified": 0, "errors": 0, "stale": 0, "fetches": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def user_config(self, user: str):
+        """Config to render a user with, or None if the user is not served."""
+        if self.users is not None:
+            return self.users.get(user.lower())
+        return {**self.config, "username": user}
+
+    def dataset(self, user: str, name: str) -> Dataset:
+        """A user's dataset from the cache, fetched when missing or expired.
+
+        With a live refresher, an expired dataset is returned as is and
+        queued for a background refresh instead.
+        """
+        key = (user.lower(), name)
+        cached = self.data.get(key)
+        if cached is not None:
+            return cached
+        current = self._peek(key)
+        if current is not None:
+            stale_for = self.clock() - current.expires
+            if stale_for < 0:
+                return current
+            if self.refresher is not None and self.refresher.alive:
+                self._count("stale")
+                self.refresher.schedule(user, name, stale_for)
+                return current
+        return self.refresh(user, name)
+
+    def _peek(self, key: tuple):
+        """The newest known copy of a dataset, fresh or not (None if never fetched).
+
+        A fresher copy stored in the disk cache by another worker replaces
+        the in-memory one.
+        """
+        entry = self.data.entry(key)
+        current = entry.value if entry is not None else None
+        if self.disk is not None and (current is None or current.expires <= self.clock()):
+            shared = self.disk.get_dataset(*key)
+            if shared is not None and (current is None or shared[2] > current.expires):
+                current = Dataset(*shared)
+                self.data.set(key, current, current.expires - self.clock())
+        return current
+
+    def _fetch(self, user: str, name: str) -> Dataset:
+        key = (user.lower(), name)
+        # A flight (or another worker) that just finished may have stored it
+        current = self._peek(key)
+        if current is not None and current.expires > self.clock():
+            return current
+        lease = "/".join(key)
+        claimed = False
+        if self.disk is not None:
+            claimed = self.disk.claim(lease, LEASE_SECONDS)
+            deadline = time.monotonic() + LEASE_SECONDS
+            while not claimed and time.monotonic() < deadline:
+                # Another worker is fetching: wait for its copy, or take over as
+                # soon as it releases the lease without one (its fetch failed)
+                time.sleep(LEASE_POLL)
+                current = self._peek(key)
+                if current is not None and current.expires > self.clock():
+                    return current
+                claimed = self.disk.claim(lease, LEASE_SECONDS)
+        try:
+            self._count("fetches")
+            value = self.source.fetch_dataset(user, name)
+            version = hashlib.sha1(encode_dataset(value).encode()).hexdigest()
+            ttl = self.ttls[name]
+            dataset = Dataset(value, version, self.clock() + ttl)
+            self.data.set(key, dataset, ttl)
+            if self.disk is not None:
+                self.disk.put_dataset(*key, value, version, dataset.expires)
+            return dataset
+        finally:
+            if claimed:
+                self.disk.release(lease)
+
+    def refresh(self, user: str, name: str) -> Dataset:
+        """Fetch an expired or missing dataset (one fetch per key at a time)."""
+        return self.fetch_flights.do((user.lower(), name), lambda: self._fetch(user, name))
+
+    def evict(self, user: str):
+        """Drop everything cached for a user."""
+        user = user.lower()
+        for name in DATASETS:
+            self.data.pop((user, name))
+        self.renders.discard(lambda key: key[0] == user)
+
+    def render(self, user: str, card: str, theme: str = None, metrics: tuple = None):
+        """Render (or reuse) one card.
+
+        Returns:
+            (RenderedCard, expires): the card and when its data goes stale
+
+        Raises:
+            RequestError: for an unknown user, card, theme or metric
+        """
+        config = self.user_config(user)
+        if config is None or card not in CARDS:
+            raise RequestError(404, "Not found")
+        try:
+            palette = resolve_named_theme(theme, config) if theme else None
+        except KeyError:
+            raise RequestError(400, f"Unknown theme '{theme}'") from None
+        if metrics:
+            unknown = [m for m in metrics if m not in METRIC_LABELS]
+            if unknown or len(set(metrics)) != len(metrics):
+                raise RequestError(400, f"Invalid metrics: {','.join(metrics)}")
+            config = {**config, "stats": {**config["stats"], "metrics": list(metrics)}}
+
+        datasets = [self.dataset(user, name) for name in DATASETS]
+        expires = min(d.expires for d in datasets)
+        key = (user.lower(), card, theme, metrics, tuple(d.version for d in datasets))
+        rendered = self.renders.get(key)
+        if rendered is None:
+
+            def build():
+                entry = self.renders.entry(key)
+                if entry is not None and entry.expires > self.clock():
+                    return entry.value
+                stored = None
+                if self.disk is not None:
+                    # Other workers, or earlier runs with another config or code, share the file
+                    disk_key = (key[0], card, json.dumps([theme, metrics]), _config_digest(config))
+                    versions = ",".join(key[-1])
+                    stored = self.disk.get_render(disk_key, versions)
+                if stored is not None:
+                    card_svg = RenderedCard(*stored)
+                else:
+                    builder = SVGBuilder(config, *(d.value for d in datasets))
+                    body = getattr(builder, CARDS[card])(palette).encode("utf-8")
+                    card_svg = RenderedCard(body, f'"{hashlib.sha1(body).hexdigest()}"')
+                    if self.disk is not None:
+                        self.disk.put_render(disk_key, versions, card_svg.body, card_svg.etag)
+                # The data versions in the key invalidate renders; only the LRU bounds them
+                self.renders.set(key, card_svg, float("inf"))
+                return card_svg
+
+            rendered = self.render_flights.do(key, build)
+        return rendered, expires
+
+    def handle(self, target: str, if_none_match: str = None) -> Response:
+        """Answer a GET for target (path and query string)."""
+        self._count("requests")
+        url = urlsplit(target)
+        if url.path == "/_stats":
+            body = json.dumps(self.stats(), indent=2).encode()
+            return Response(200, {"Content-Type": "application/json", "Cache-Control": "no-store"}, body)
+
+        match = CARD_ROUTE.match(url.path)
+        if not match or not USERNAME_RE.match(match.group(1)):
+            return _text(404, "Not found")
+        user, card = match.groups()
+        if self.refresher is not None and self.user_config(user) is not None:
+            # Only served users count, so unknown logins can't fill the popularity table
+            self.refresher.record(user)
+        query = parse_qs(url.query)
+        theme = query.get("theme", [None])[-1]
+        metrics = query.get("metrics", [None])[-1]
+        metrics = tuple(m.strip() for m in metrics.split(",") if m.strip()) if metrics else None
+
+        try:
+            rendered, expires = self.render(user, card, theme, metrics)
+        except RequestError as e:
+            return _text(e.status, str(e))
+        except FETCH_ERRORS as e:
+            self._count("errors")
+            logger.warning("Could not fetch %s: %s", user, e)
+            return _text(502, "Could not fetch profile data")
+        except Exception:
+            self._count("errors")
+            logger.exception("Rendering %s for %s failed", card, user)
+            return _text(500, "Internal error")
+
+        headers = {
+            "ETag": rendered.etag,
+            "Cache-Control": f"public, max-age={max(int(expires - self.clock()), 0)}",
+        }
+        if _etag_matches(if_none_match, rendered.etag):
+            self._count("not_modified")
+            return Response(304, headers)
+        return Response(200, {"Content-Type": SVG_TYPE, **headers}, rendered.body)
+
+    def stats(self) -> dict:
+        """Request counters, cache sizes/hit counts and coalesced requests."""
+        caches = {
+            name: {"entries": len(cache), "hits": cache.hits, "misses": cache.misses,
+                   "coalesced": flights.coalesced}
+            for name, cache, flights in (
+                ("data", self.data, self.fetch_flights),
+                ("renders", self.renders, self.render_flights),
+            )
+        }
+        with self._lock:
+            stats = {**self.counters, **caches}
+        if self.refresher is not None:
+            stats["refresher"] = self.refresher.stats()
+        if self.disk is not None:
+            stats["worker"] = os.getpid()
+        return stats
+
+
+def make_handler(service: ProfileService):
+    """BaseHTTPRequestHandler subclass answering from service."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        server_version = "GalaxyProfile"
+
+        def _respond(self, head: bool):
+            response = service.handle(self.path, self.headers.get("If-None-Match"))
+            self.send_response(response.status)
+            for name, value in response.headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(response.body)))
+            self.end_headers()
+            if not head:
+                self.wfile.write(response.body)
+
+        def do_GET(self):
+            self._respond(head=False)
+
+        def do_HEAD(self):
+            self._respond(head=True)
+
+        def log_message(self, format, *args):
+            logger.debug("%s %s", self.address_string(), format % args)
+
+    return Handler
+
+
+def make_server(service: ProfileService, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+    """Create (but don't start) a threaded HTTP server for service."""
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    return server
+
+
+def run_workers(build_service, host: str = "127.0.0.1", port: int = 8080, workers: int = 2,
+                listener: socket.socket = None):
+    """Pre-fork workers that share one listening socket; returns when interrupted.
+
+    The socket is bound in the parent, then each forked child calls
+    build_service() (so connections and threads are created after the fork)
+    and serves on the inherited socket. Workers that crash are replaced.
+
+    Args:
+        build_service: callable returning the ProfileService for one worker
+        workers: number of worker processes
+        listener: an already listening socket to use instead of binding host:port
+    """
+    if listener is None:
+        listener = socket.create_server((host, port), backlog=128)
+    logger.info("Forking %d workers on http://%s:%d", workers, *listener.getsockname()[:2])
+    children = set()
+
+    def spawn():
+        pid = os.fork()
+        if pid:
+            children.add(pid)
+            return
+        code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.default_int_handler)
+            server = ThreadingHTTPServer(listener.getsockname()[:2], make_handler(build_service()),
+                                         bind_and_activate=False)
+            server.socket = listener
+            server.daemon_threads = True
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            code = 1
+        finally:
+            os._exit(code)
+
+    handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    for _ in range(workers):
+        spawn()
+    try:
+        while children:
+            pid, status = os.wait()
+            children.discard(pid)
+            if status != 0:
+                logger.warning("Worker %d exited with status %d; starting another.", pid, status)
+                time.sleep(1)  # don't spin if workers fail at startup
+                spawn()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Ctrl-C reaches the whole process group; don't let a second one cut the cleanup short
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        listener.close()
+        for sig, handler in handlers.items():
+            signal.signal(sig, handler)
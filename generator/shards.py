@@ -0,0 +1,155 @@
+"""Deterministic sharding of roster runs and merging of shard results.
+
+``--shard i/N`` keeps the roster users whose stable hash falls into shard i
+(1-based). The hash depends only on the lower-cased username, so a user
+lands on the same shard in every run, and with it any per-shard state (the
+work queue, fragment caches, previous outputs).
+
+Each roster run writes ``manifest.json`` next to its ``summary.json`` run
+report: the shard it covered and, per user, the files on disk with their
+size and SHA-1. ``merge_shards`` combines the manifests and reports of all
+shards into one ``index.json``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+from generator.batch import SUMMARY_FILE
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+INDEX_FILE = "index.json"
+
+
+def parse_shard(spec: str) -> tuple:
+    """Parse "i/N" into (i, N), with 1 <= i <= N.
+
+    Raises:
+        ValueError: if spec is not a valid shard
+    """
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N, got '{spec}'.") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Shard index must be between 1 and N, got '{spec}'.")
+    return index, count
+
+
+def shard_of(username: str, count: int) -> int:
+    """1-based shard of a username among count shards (stable across runs and machines)."""
+    digest = hashlib.sha1(username.lower().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def select_shard(entries: list, index: int, count: int) -> list:
+    """Roster entries that belong to shard index of count."""
+    return [entry for entry in entries if shard_of(entry.name, count) == index]
+
+
+def _file_info(path: str) -> dict:
+    with open(path, "rb") as f:
+        data = f.read()
+    return {"bytes": len(data), "sha1": hashlib.sha1(data).hexdigest()}
+
+
+def build_manifest(output_root: str, results: list, shard: tuple = None) -> dict:
+    """Describe a finished run: its shard and each user's files on disk.
+
+    Args:
+        output_root: directory the run wrote into (users in <root>/<user>/)
+        results: batch results (see generator.batch.render_user)
+        shard: (index, count), or None for an unsharded run
+
+    Returns:
+        manifest dict; file keys are paths relative to output_root
+    """
+    index, count = shard or (1, 1)
+    users = {}
+    for result in results:
+        files = {}
+        user_dir = os.path.join(output_root, result["user"])
+        if result["ok"] and os.path.isdir(user_dir):
+            for filename in sorted(os.listdir(user_dir)):
+                path = os.path.join(user_dir, filename)
+                if os.path.isfile(path):
+                    files[f"{result['user']}/{filename}"] = _file_info(path)
+        users[result["user"]] = {"ok": result["ok"], "error": result["error"], "files": files}
+    return {"shard": index, "shards": count, "users": users}
+
+
+def write_manifest(output_root: str, results: list, shard: tuple = None) -> dict:
+    """Build the run's manifest and write it to output_root/manifest.json."""
+    manifest = build_manifest(output_root, results, shard)
+    with open(os.path.join(output_root, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def merge_shards(shard_dirs: list, output_dir: str) -> dict:
+    """Combine the manifests and run reports of shard runs into output_dir/index.json.
+
+    Shards that are absent are listed under "missing" rather than failing
+    the merge, so one broken runner does not hide the others' results.
+
+    Raises:
+        ValueError: if the shards disagree on N, a shard appears twice or a
+            user appears in more than one shard
+    """
+    count = None
+    seen = {}
+    users = {}
+    for shard_dir in shard_dirs:
+        with open(os.path.join(shard_dir, MANIFEST_FILE), "r") as f:
+            manifest = json.load(f)
+        if count is None:
+            count = manifest["shards"]
+        elif manifest["shards"] != count:
+            raise ValueError(f"{shard_dir} is shard {manifest['shard']}/{manifest['shards']}, "
+                             f"expected N={count}.")
+        if manifest["shard"] in seen:
+            raise ValueError(f"Shard {manifest['shard']}/{count} given twice "
+                             f"({seen[manifest['shard']]} and {shard_dir}).")
+        seen[manifest["shard"]] = shard_dir
+
+        report = {}
+        report_path = os.path.join(shard_dir, SUMMARY_FILE)
+        if os.path.exists(report_path):
+            with open(report_path, "r") as f:
+                report = {row["user"]: row for row in json.load(f)}
+
+        for name, entry in manifest["users"].items():
+            if name in users:
+                raise ValueError(f"User '{name}' appears in shards {users[name]['shard']} "
+                                 f"and {manifest['shard']}.")
+            row = report.get(name, {})
+            users[name] = {
+                "shard": manifest["shard"],
+                **entry,
+                "skipped": row.get("skipped", False),
+                "fetch_s": row.get("fetch_s", 0.0),
+                "render_s": row.get("render_s", 0.0),
+            }
+
+    missing = [i for i in range(1, (count or 0) + 1) if i not in seen]
+    if missing:
+        logger.warning("Merging without shard(s) %s of %d.", ", ".join(map(str, missing)), count)
+    index = {
+        "shards": count,
+        "missing": missing,
+        "totals": {
+            "users": len(users),
+            "ok": sum(1 for u in users.values() if u["ok"]),
+            "failed": sum(1 for u in users.values() if not u["ok"]),
+            "files": sum(len(u["files"]) for u in users.values()),
+            "bytes": sum(f["bytes"] for u in users.values() for f in u["files"].values()),
+        },
+        "users": dict(sorted(users.items())),
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, INDEX_FILE), "w") as f:
+        json.dump(index, f, indent=2)
+    return index
@@ -0,0 +1,61 @@
+"""Request coalescing — one in-flight computation per key.
+
+When many threads ask for the same key at once (a popular profile being
+viewed), only the first runs the computation; the others wait for it and
+receive the same result, or the same exception.
+"""
+
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key.
+
+    ``coalesced`` counts the calls that were answered by another caller's
+    computation instead of running their own.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Number of computations currently in flight."""
+        return len(self._calls)
+
+    def do(self, key, func):
+        """Return func(), sharing one execution among concurrent callers of key."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
@@ -0,0 +1,50 @@
+"""Precompiled SVG skeletons — static segments joined with dynamic slot values."""
+
+from string import Template
+
+
+class Skeleton:
+    """A document template split once, at import time, into segments and slots.
+
+    Slots use ``string.Template`` syntax (``$name`` or ``${name}``), so CSS
+    and other literal braces need no escaping. Slots given as keyword
+    arguments to the constructor are bound immediately and folded into the
+    static segments.
+
+    The remaining segments and slots are compiled into a single f-string
+    function, so ``render(**slots)`` only joins the precompiled segments with
+    the slot values and never re-parses or re-formats the static markup.
+    """
+
+    def __init__(self, source: str, **bound):
+        segments = [""]
+        slots = []
+        pos = 0
+        for match in Template.pattern.finditer(source):
+            segments[-1] += source[pos:match.start()]
+            pos = match.end()
+            if match.group("escaped") is not None:
+                segments[-1] += "$"
+                continue
+            name = match.group("named") or match.group("braced")
+            if name is None:
+                raise ValueError(f"Invalid placeholder in skeleton at offset {match.start()}")
+            if name in bound:
+                segments[-1] += str(bound[name])
+            else:
+                slots.append(name)
+                segments.append("")
+        segments[-1] += source[pos:]
+
+        self.slots = tuple(slots)
+        self.segments = tuple(segments)
+        self.render = self._compile()
+
+    def _compile(self):
+        # Adjacent literals are merged by the compiler: 'a' f'{x}' 'b' is one f-string
+        pieces = [repr(self.segments[0])]
+        for name, segment in zip(self.slots, self.segments[1:]):
+            pieces.append(f"f'{{{name}}}'")
+            pieces.append(repr(segment))
+        params = ", ".join(dict.fromkeys(self.slots))
+        return eval(f"lambda {params}: {' '.join(pieces)}", {})
@@ -0,0 +1,159 @@
+"""Profile data sources — where stats, languages and contributions come from.
+
+A source's ``fetch(username)`` returns a ``ProfileData``. ``GitHubSource``
+talks to the GitHub API through one shared ``requests.Session`` (so batch
+runs reuse connections across users); ``DemoSource`` returns the built-in
+demo data without any network access.
+"""
+
+import datetime
+import logging
+from typing import NamedTuple
+
+import requests
+
+from generator.contrib_calendar import ContributionCalendar
+from generator.github_api import GitHubAPI, RateLimit
+from generator.utils import deterministic_random
+
+logger = logging.getLogger(__name__)
+
+DEMO_STATS = {"commits": 1847, "stars": 342, "prs": 156, "issues": 89, "repos": 42}
+DEMO_LANGUAGES = {
+    "Python": 450000,
+    "TypeScript": 380000,
+    "JavaScript": 120000,
+    "Go": 95000,
+    "Rust": 45000,
+    "Shell": 30000,
+    "Dockerfile": 15000,
+    "CSS": 10000,
+}
+
+DEMO_MEMBERS = ("nova", "quasar", "pulsar", "nebula", "comet")
+
+EMPTY_STATS = {"commits": 0, "stars": 0, "prs": 0, "issues": 0, "repos": 0}
+
+# Errors a fetch may raise for one user without affecting the others
+FETCH_ERRORS = (requests.exceptions.RequestException, ValueError, KeyError)
+
+
+class ProfileData(NamedTuple):
+    """Everything the templates need besides the config."""
+
+    stats: dict
+    languages: dict
+    contributions: ContributionCalendar
+
+
+# Datasets a source can fetch one at a time (the ProfileData fields)
+DATASETS = ProfileData._fields
+
+
+def encode_profile(data: ProfileData) -> dict:
+    """JSON-serializable form of a ProfileData (see decode_profile)."""
+    calendar = data.contributions
+    return {
+        "stats": data.stats,
+        "languages": data.languages,
+        "start": calendar.start.isoformat() if calendar.start else None,
+        "counts": list(calendar.counts),
+        "total_count": calendar.total_count,
+    }
+
+
+def decode_profile(raw: dict) -> ProfileData:
+    start = datetime.date.fromisoformat(raw["start"]) if raw["start"] else None
+    calendar = ContributionCalendar(start, raw["counts"], raw["total_count"])
+    return ProfileData(raw["stats"], raw["languages"], calendar)
+
+
+def empty_dataset(dataset: str):
+    """Fallback value for a dataset that could not be fetched."""
+    if dataset == "stats":
+        return dict(EMPTY_STATS)
+    if dataset == "languages":
+        return {}
+    return ContributionCalendar()
+
+
+def demo_contributions() -> ContributionCalendar:
+    """Generate synthetic contribution calendar data for demo mode."""
+    today = datetime.date.today()
+    # Go back ~52 weeks, align to Sunday
+    start = today - datetime.timedelta(weeks=52)
+    start = start - datetime.timedelta(days=(start.weekday() + 1) % 7)
+
+    total_days = 52 * 7
+    counts = [int(c) for c in deterministic_random("demo_contributions", total_days, 0, 15)]
+    for day_idx in range(total_days):
+        # Reduce weekend activity
+        if day_idx % 7 in (0, 6):
+            counts[day_idx] = int(counts[day_idx] * 0.3)
+
+    return ContributionCalendar(start, counts)
+
+
+class DemoSource:
+    """Serves the demo profile for every username (no API calls)."""
+
+    rate_limit = None  # no budget to respect
+
+    def fetch(self, username: str, strict: bool = False) -> ProfileData:
+        return ProfileData(DEMO_STATS, DEMO_LANGUAGES, demo_contributions())
+
+    def fetch_dataset(self, username: str, dataset: str):
+        return getattr(self.fetch(username), dataset)
+
+    def org_members(self, org: str) -> list:
+        return list(DEMO_MEMBERS)
+
+
+class GitHubSource:
+    """Fetches profiles from GitHub over one shared HTTP session.
+
+    Args:
+        token: GitHub token (default: GITHUB_TOKEN from the environment)
+        session: requests.Session to share; one is created if omitted
+    """
+
+    def __init__(self, token: str = None, session: requests.Session = None):
+        self.token = token
+        self.session = session or requests.Session()
+        # Shared by every GitHubAPI below, so it reflects the whole process
+        self.rate_limit = RateLimit()
+
+    def api(self, username: str) -> GitHubAPI:
+        return GitHubAPI(username, self.token, session=self.session, rate_limit=self.rate_limit)
+
+    def org_members(self, org: str) -> list:
+        """Logins of an organization's (visible) members."""
+        return self.api(org).fetch_org_members()
+
+    def fetch_dataset(self, username: str, dataset: str):
+        """Fetch one dataset ("stats", "languages" or "contributions") of a user."""
+        api = self.api(username)
+        return getattr(api, f"fetch_{dataset}")()
+
+    def fetch(self, username: str, strict: bool = False) -> ProfileData:
+        """Fetch one user's stats, languages and contributions.
+
+        Args:
+            username: GitHub login
+            strict: raise fetch errors instead of falling back to empty data
+
+        Raises:
+            requests.exceptions.RequestException, ValueError, KeyError:
+                when strict and a fetch fails
+        """
+        data = {}
+        for dataset in DATASETS:
+            logger.info("Fetching %s...", dataset)
+            try:
+                data[dataset] = self.fetch_dataset(username, dataset)
+            except FETCH_ERRORS as e:
+                if strict:
+                    raise
+                logger.warning("Could not fetch %s (%s). Using defaults.", dataset, e)
+                data[dataset] = empty_dataset(dataset)
+        return ProfileData(**data)
@@ -0,0 +1,135 @@
+"""Starfield engine — deterministic star positions shared by all templates.
+
+Each template describes its starfield as a tuple of ``StarLayer`` specs;
+``generate()`` computes every layer's x/y/r/opacity/duration columns in one
+batch and caches the result by layers, canvas size and placement.
+
+Placement modes:
+    uniform  independent uniform positions (the classic look)
+    poisson  density-based Poisson-disk placement: each star keeps its
+             uniform position unless it lands within ``spacing`` of an
+             earlier star, in which case deterministic retries look for a
+             free spot. A spatial grid keeps the neighbour test O(1).
+"""
+
+import functools
+import math
+import random
+from typing import NamedTuple
+
+from generator.utils import PLACEMENTS, deterministic_random
+
+# Poisson-disk spacing as a fraction of the mean distance between stars
+DENSITY_SPACING = 0.5
+MAX_ATTEMPTS = 30
+
+
+class StarLayer(NamedTuple):
+    """One depth layer of a starfield.
+
+    Every column (x, y, r, o, d) has its own random stream, seeded with
+    ``seed + axis + seed_suffix``, e.g. ``"const-bg-x"``.
+    """
+
+    seed: str
+    count: int
+    margin: float
+    r: tuple
+    o: tuple
+    d: tuple
+    seed_suffix: str = ""
+
+    def axis_seed(self, axis: str) -> str:
+        return f"{self.seed}{axis}{self.seed_suffix}"
+
+
+class Stars(NamedTuple):
+    """Columns of one generated layer; each is a tuple of floats."""
+
+    x: tuple
+    y: tuple
+    r: tuple
+    o: tuple
+    d: tuple
+
+
+def _uniform(layer, width, height):
+    m = layer.margin
+    seed = layer.axis_seed
+    n = layer.count
+    return Stars(
+        x=tuple(deterministic_random(seed("x"), n, m, width - m)),
+        y=tuple(deterministic_random(seed("y"), n, m, height - m)),
+        r=tuple(deterministic_random(seed("r"), n, *layer.r)),
+        o=tuple(deterministic_random(seed("o"), n, *layer.o)),
+        d=tuple(deterministic_random(seed("d"), n, *layer.d)),
+    )
+
+
+class _Grid:
+    """Uniform grid of accepted points with cell size equal to the spacing."""
+
+    def __init__(self, spacing):
+        self.spacing = spacing
+        self.cells = {}
+
+    def _cell(self, x, y):
+        return int(x // self.spacing), int(y // self.spacing)
+
+    def nearest(self, x, y):
+        """Distance to the nearest accepted point within one cell, else spacing."""
+        cx, cy = self._cell(x, y)
+        best = self.spacing
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for px, py in self.cells.get((gx, gy), ()):
+                    best = min(best, math.hypot(px - x, py - y))
+        return best
+
+    def add(self, x, y):
+        self.cells.setdefault(self._cell(x, y), []).append((x, y))
+
+
+def _poisson(layers, uniform, width, height):
+    total = sum(layer.count for layer in layers)
+    spacing = DENSITY_SPACING * math.sqrt(width * height / max(total, 1))
+    grid = _Grid(spacing)
+    placed = []
+    for layer, stars in zip(layers, uniform):
+        rng = random.Random(layer.axis_seed("poisson"))
+        m = layer.margin
+        xs, ys = [], []
+        for x, y in zip(stars.x, stars.y):
+            best, best_gap = (x, y), grid.nearest(x, y)
+            attempts = 0
+            while best_gap < spacing and attempts < MAX_ATTEMPTS:
+                cand = (rng.uniform(m, width - m), rng.uniform(m, height - m))
+                gap = grid.nearest(*cand)
+                if gap > best_gap:
+                    best, best_gap = cand, gap
+                attempts += 1
+            grid.add(*best)
+            xs.append(best[0])
+            ys.append(best[1])
+        placed.append(stars._replace(x=tuple(xs), y=tuple(ys)))
+    return tuple(placed)
+
+
+@functools.lru_cache(maxsize=128)
+def generate(layers: tuple, width: float, height: float, placement: str = "uniform") -> tuple:
+    """Generate every layer of a starfield in one batch.
+
+    Args:
+        layers: tuple of StarLayer specs, back to front
+        width, height: canvas size
+        placement: "uniform" or "poisson"
+
+    Returns:
+        tuple of Stars, one per layer (cached; treat as read-only)
+    """
+    if placement not in PLACEMENTS:
+        raise ValueError(f"Unknown starfield placement '{placement}'")
+    uniform = tuple(_uniform(layer, width, height) for layer in layers)
+    if placement == "poisson":
+        return _poisson(layers, uniform, width, height)
+    return uniform
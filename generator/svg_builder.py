@@ -1,76 +1,189 @@
 """SVG Builder — orchestrator connecting config, stats, and templates."""
 
+from generator import lite as lite_pass
+from generator.bundle import build_bundle
+from generator.contrib_analytics import ContributionIndex
+from generator.contrib_calendar import ContributionCalendar
+from generator.paint import Layout, theme_tokens
 from generator.templates import (
     galaxy_header, stats_card, tech_stack, projects_constellation,
     contribution_heatmap, skill_constellation, coding_timeline,
 )
 
+# Card name (output filename without .svg) -> SVGBuilder render method
+CARDS = {
+    "galaxy-header": "render_galaxy_header",
+    "stats-card": "render_stats_card",
+    "tech-stack": "render_tech_stack",
+    "projects-constellation": "render_projects_constellation",
+    "contribution-heatmap": "render_contribution_heatmap",
+    "skill-constellation": "render_skill_constellation",
+    "coding-timeline": "render_coding_timeline",
+}
+
 
 class SVGBuilder:
     """Builds all SVG assets from config and GitHub data.
 
     Expects a config dict that has already been through validate_config(),
     which resolves theme defaults and applies missing optional fields.
+
+    Each card is laid out once against placeholder color tokens and cached;
+    rendering it with a palette is then only a paint pass, so theme
+    variants share all geometry and string building.
+
+    With ``lite=True`` every layout also goes through the lite pass (capped
+    infinite animations, gradient halos instead of filters, reduced-motion
+    CSS); ``lite_report`` then holds before/after counts per card.
     """
 
-    def __init__(self, config: dict, stats: dict, languages: dict, contributions: dict = None):
+    def __init__(
+        self, config: dict, stats: dict, languages: dict, contributions=None,
+        lite: bool = False,
+    ):
         self.config = config
         self.stats = stats
         self.languages = languages
-        self.contributions = contributions or {}
+        self.contributions = ContributionCalendar.coerce(contributions)
+        self.analytics = ContributionIndex(self.contributions)
         self.theme = config["theme"]
         self.galaxy_arms = config.get("galaxy_arms", [])
         self.projects = config.get("projects", [])
         self.timeline = config.get("timeline", [])
+        self.lite = lite
+        self.lite_report = {}
+        self._tokens = theme_tokens(self.theme)
+        self._layouts = {}
+
+    def render_all(self, theme: dict = None) -> dict:
+        """Render every card, returning a dict of output filename -> SVG.
+
+        Args:
+            theme: palette to paint with (defaults to the config theme)
+        """
+        return {f"{name}.svg": getattr(self, method)(theme) for name, method in CARDS.items()}
+
+    def render_files(self, palettes: dict = None, bundle: bool = False) -> dict:
+        """Render every output file for a profile.
+
+        Args:
+            palettes: optional dict of theme name -> palette; each variant
+                is written as <card>-<name>.svg (default: config theme only)
+            bundle: pack each variant's cards into bundle[-<name>].svg
+
+        Returns:
+            dict of output filename -> SVG
+        """
+        files = {}
+        # One layout per card, painted once per theme: galaxy-header-light.svg, ...
+        for name, palette in (palettes.items() if palettes else [(None, None)]):
+            suffix = f"-{name}" if name else ""
+            cards = {
+                filename[:-len(".svg")]: svg
+                for filename, svg in self.render_all(palette).items()
+            }
+            if bundle:
+                files[f"bundle{suffix}.svg"] = build_bundle(cards)
+            else:
+                files.update((f"{card}{suffix}.svg", svg) for card, svg in cards.items())
+        return files
+
+    def layout(self, card: str) -> Layout:
+        """Return the cached theme-independent layout of a card."""
+        layout = self._layouts.get(card)
+        if layout is None:
+            build = getattr(self, "_build_" + CARDS[card][len("render_"):])
+            markup = build(self._tokens)
+            if self.lite:
+                before = lite_pass.measure(markup)
+                markup = lite_pass.simplify(markup)
+                self.lite_report[card] = {"before": before, "after": lite_pass.measure(markup)}
+            layout = self._layouts[card] = Layout(markup)
+        return layout
+
+    def reset(self):
+        """Drop cached layouts, e.g. after changing config or data in place."""
+        self._layouts.clear()
+
+    def _paint(self, card: str, theme: dict) -> str:
+        palette = self.theme if theme is None else {**self.theme, **theme}
+        return self.layout(card).paint(palette)
+
+    def render_galaxy_header(self, theme: dict = None) -> str:
+        return self._paint("galaxy-header", theme)
+
+    def render_stats_card(self, theme: dict = None) -> str:
+        return self._paint("stats-card", theme)
+
+    def render_tech_stack(self, theme: dict = None) -> str:
+        return self._paint("tech-stack", theme)
+
+    def render_projects_constellation(self, theme: dict = None) -> str:
+        return self._paint("projects-constellation", theme)
+
+    def render_contribution_heatmap(self, theme: dict = None) -> str:
+        return self._paint("contribution-heatmap", theme)
+
+    def render_skill_constellation(self, theme: dict = None) -> str:
+        return self._paint("skill-constellation", theme)
+
+    def render_coding_timeline(self, theme: dict = None) -> str:
+        return self._paint("coding-timeline", theme)
 
-    def render_galaxy_header(self) -> str:
+    def _build_galaxy_header(self, theme: dict) -> str:
         return galaxy_header.render(
             config=self.config,
-            theme=self.theme,
+            theme=theme,
             galaxy_arms=self.galaxy_arms,
             projects=self.projects,
         )
 
-    def render_stats_card(self) -> str:
+    def _build_stats_card(self, theme: dict) -> str:
         metrics = self.config["stats"]["metrics"]
         return stats_card.render(
-            stats=self.stats,
+            stats={**self.stats, **self.analytics.metrics()},
             metrics=metrics,
-            theme=self.theme,
+            theme=theme,
         )
 
-    def render_tech_stack(self) -> str:
+    def _build_tech_stack(self, theme: dict) -> str:
         lang_config = self.config.get("languages", {})
         return tech_stack.render(
             languages=self.languages,
             galaxy_arms=self.galaxy_arms,
-            theme=self.theme,
+            theme=theme,
             exclude=lang_config.get("exclude", []),
             max_display=lang_config.get("max_display", 8),
         )
 
-    def render_projects_constellation(self) -> str:
+    def _build_projects_constellation(self, theme: dict) -> str:
         return projects_constellation.render(
             projects=self.projects,
             galaxy_arms=self.galaxy_arms,
-            theme=self.theme,
+            theme=theme,
+            placement=self.config["starfield"]["placement"],
         )
 
-    def render_contribution_heatmap(self) -> str:
+    def _build_contribution_heatmap(self, theme: dict) -> str:
         return contribution_heatmap.render(
             contributions=self.contributions,
-            theme=self.theme,
+            theme=theme,
+            compact=self.config["heatmap"]["compact"],
+            month_totals=self.analytics.month_totals if self.config["heatmap"]["month_totals"] else None,
         )
 
-    def render_skill_constellation(self) -> str:
+    def _build_skill_constellation(self, theme: dict) -> str:
         return skill_constellation.render(
             galaxy_arms=self.galaxy_arms,
-            theme=self.theme,
+            theme=theme,
+            placement=self.config["starfield"]["placement"],
+            links=self.config["constellation"]["links"],
+            max_items_per_arm=self.config["constellation"]["max_items_per_arm"],
         )
 
-    def render_coding_timeline(self) -> str:
+    def _build_coding_timeline(self, theme: dict) -> str:
         return coding_timeline.render(
             timeline=self.timeline,
             galaxy_arms=self.galaxy_arms,
-            theme=self.theme,
+            theme=theme,
         )
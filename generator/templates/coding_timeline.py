@@ -1,5 +1,8 @@
 """SVG template: Coding Timeline — evolution trail with comet animation (850x200)."""
 
+from generator.defs import DefsRegistry
+from generator.labels import Candidate, LabelPlacer, text_box
+from generator.skeleton import Skeleton
 from generator.utils import esc, resolve_arm_colors
 
 WIDTH, HEIGHT = 850, 200
@@ -7,45 +10,13 @@ TIMELINE_Y = 100
 LEFT_MARGIN = 60
 RIGHT_MARGIN = 60
 NODE_RADIUS = 5
+# Label baselines relative to the timeline: above, below, then further below
+LABEL_ROWS = (-22, 32, 46, 60, 74, 88)
+# Space left between a connector's end and its label's text
+CONNECTOR_GAP = 4
 
 
-def _build_defs(arm_colors, theme):
-    """Build comet gradient, glow filters, and CSS animations."""
-    parts = []
-
-    # Comet trail gradient
-    cyan = theme.get("synapse_cyan", "#00d4ff")
-    parts.append(f'''    <linearGradient id="comet-trail-grad" x1="0" y1="0" x2="1" y2="0">
-      <stop offset="0%" stop-color="{cyan}" stop-opacity="0"/>
-      <stop offset="70%" stop-color="{cyan}" stop-opacity="0.3"/>
-      <stop offset="100%" stop-color="#ffffff" stop-opacity="0.8"/>
-    </linearGradient>''')
-
-    # Glow filters per arm color
-    for i, color in enumerate(arm_colors):
-        parts.append(f'''    <filter id="tl-glow-{i}" x="-100%" y="-100%" width="300%" height="300%">
-      <feGaussianBlur stdDeviation="3" in="SourceGraphic" result="blur"/>
-      <feFlood flood-color="{color}" flood-opacity="0.6" result="color"/>
-      <feComposite in="color" in2="blur" operator="in" result="glow"/>
-      <feMerge>
-        <feMergeNode in="glow"/>
-        <feMergeNode in="SourceGraphic"/>
-      </feMerge>
-    </filter>''')
-
-    # Comet glow
-    parts.append(f'''    <filter id="comet-glow" x="-200%" y="-200%" width="500%" height="500%">
-      <feGaussianBlur stdDeviation="4" result="blur"/>
-      <feFlood flood-color="{cyan}" flood-opacity="0.8" result="color"/>
-      <feComposite in="color" in2="blur" operator="in" result="glow"/>
-      <feMerge>
-        <feMergeNode in="glow"/>
-        <feMergeNode in="SourceGraphic"/>
-      </feMerge>
-    </filter>''')
-
-    # CSS animations
-    parts.append('''    <style>
+_STYLE = '''    <style>
       @keyframes tl-node-activate {
         0%, 80% { opacity: 0.3; }
         85% { opacity: 1; }
@@ -59,9 +30,29 @@ def _build_defs(arm_colors, theme):
         0%, 100% { opacity: 0.6; }
         50% { opacity: 1; }
       }
-    </style>''')
+    </style>'''
 
-    return "\n".join(parts)
+
+def _build_defs(defs, theme):
+    """Register the comet gradient and glow filters; return (node_glow, comet_glow).
+
+    Node halos share one glow filter across all arm colors; the comet keeps
+    its own cyan-tinted glow because its core is white.
+    """
+    cyan = theme.get("synapse_cyan", "#00d4ff")
+    starlight = theme.get("starlight", "#ffffff")
+
+    # Comet trail gradient
+    defs.add("comet-trail-grad", (
+        f'    <linearGradient id="{{id}}" x1="0" y1="0" x2="1" y2="0">\n'
+        f'      <stop offset="0%" stop-color="{cyan}" stop-opacity="0"/>\n'
+        f'      <stop offset="70%" stop-color="{cyan}" stop-opacity="0.3"/>\n'
+        f'      <stop offset="100%" stop-color="{starlight}" stop-opacity="0.8"/>\n'
+        f'    </linearGradient>'
+    ))
+    node_glow = defs.glow_filter(3, opacity=0.6, prefix="tl-glow")
+    comet_glow = defs.glow_filter(4, opacity=0.8, region=200, color=cyan, prefix="comet-glow")
+    return node_glow, comet_glow
 
 
 def _build_comet_trail(usable_width, theme):
@@ -84,11 +75,17 @@ def _build_comet_trail(usable_width, theme):
     return "\n".join(parts)
 
 
-def _build_nodes_and_labels(entries, usable_width, arm_colors, theme):
+def _build_nodes_and_labels(entries, usable_width, arm_colors, theme, glow_filter):
     """Build nodes and labels for each timeline entry."""
     parts = []
+    starlight = theme.get("starlight", "#ffffff")
     comet_dur = 6  # seconds for comet to traverse
 
+    # Labels must stay clear of the year markers and inside the card
+    placer = LabelPlacer(bounds=(0, 40, WIDTH, HEIGHT - 5))
+    for year, x in {entry["year"]: entry["x"] for entry in reversed(entries)}.items():
+        placer.block(text_box(str(year), 10, x, TIMELINE_Y - 42))
+
     for i, entry in enumerate(entries):
         x = entry["x"]
         arm_idx = entry.get("arm", 0)
@@ -98,12 +95,18 @@ def _build_nodes_and_labels(entries, usable_width, arm_colors, theme):
         t = (x - LEFT_MARGIN) / max(usable_width, 1)
         node_delay = t * comet_dur
 
-        # Decide label position: alternate above/below
-        above = (i % 2 == 0)
-        label_y = TIMELINE_Y - 22 if above else TIMELINE_Y + 32
-        connector_y2 = TIMELINE_Y - 10 if above else TIMELINE_Y + 10
+        # Decide label position: alternate above/below, then stack further down
+        rows = LABEL_ROWS if i % 2 == 0 else (LABEL_ROWS[1], LABEL_ROWS[0], *LABEL_ROWS[2:])
+        _, label_y, _ = placer.place(
+            entry["label"], 10, [Candidate(x, TIMELINE_Y + dy) for dy in rows]
+        )
+        _, text_top, _, text_bottom = text_box(entry["label"], 10, x, label_y)
+        if label_y < TIMELINE_Y:
+            connector_y2 = text_bottom + CONNECTOR_GAP
+        else:
+            connector_y2 = text_top - CONNECTOR_GAP
 
-        # Connector line from node to label area
+        # Connector line from node to its label
         parts.append(
             f'  <line x1="{x:.1f}" y1="{TIMELINE_Y}" x2="{x:.1f}" y2="{connector_y2:.1f}" '
             f'stroke="{color}" stroke-width="0.8" opacity="0" '
@@ -113,7 +116,7 @@ def _build_nodes_and_labels(entries, usable_width, arm_colors, theme):
         # Glow halo
         parts.append(
             f'  <circle cx="{x:.1f}" cy="{TIMELINE_Y}" r="{NODE_RADIUS + 4}" '
-            f'fill="{color}" opacity="0" filter="url(#tl-glow-{arm_idx})" '
+            f'fill="{color}" opacity="0" filter="url(#{glow_filter})" '
             f'style="animation: tl-node-activate 1s ease {node_delay:.1f}s forwards"/>'
         )
 
@@ -126,7 +129,7 @@ def _build_nodes_and_labels(entries, usable_width, arm_colors, theme):
         # White center
         parts.append(
             f'  <circle cx="{x:.1f}" cy="{TIMELINE_Y}" r="2" '
-            f'fill="#ffffff" opacity="0" '
+            f'fill="{starlight}" opacity="0" '
             f'style="animation: tl-node-activate 1s ease {node_delay:.1f}s forwards"/>'
         )
 
@@ -168,9 +171,10 @@ def _build_year_markers(entries, theme):
     return "\n".join(parts)
 
 
-def _build_comet(usable_width, theme):
+def _build_comet(usable_width, theme, glow_filter):
     """Build the animated comet that sweeps left-to-right."""
     cyan = theme.get("synapse_cyan", "#00d4ff")
+    starlight = theme.get("starlight", "#ffffff")
     comet_dur = 6
 
     # Comet path (horizontal line)
@@ -178,7 +182,7 @@ def _build_comet(usable_width, theme):
 
     return (
         f'  <g transform="translate({LEFT_MARGIN},{TIMELINE_Y})">'
-        f'\n    <circle r="4" fill="#ffffff" opacity="0.9" filter="url(#comet-glow)">'
+        f'\n    <circle r="4" fill="{starlight}" opacity="0.9" filter="url(#{glow_filter})">'
         f'\n      <animateMotion path="{path}" dur="{comet_dur}s" repeatCount="indefinite"/>'
         f'\n    </circle>'
         f'\n    <circle r="2" fill="{cyan}" opacity="0.6">'
@@ -188,6 +192,40 @@ def _build_comet(usable_width, theme):
     )
 
 
+# Document skeleton: static markup is compiled once at import time
+_SKELETON = Skeleton('''<svg xmlns="http://www.w3.org/2000/svg" width="$WIDTH" height="$HEIGHT" viewBox="0 0 $WIDTH $HEIGHT">
+  <defs>
+$defs_str
+  </defs>
+
+  <!-- Background -->
+  <rect x="0.5" y="0.5" width="$INNER_W" height="$INNER_H" rx="12" ry="12"
+        fill="$nebula" stroke="$star_dust" stroke-width="1"/>
+
+  <!-- Title -->
+$title
+$status_dot
+$status_text
+
+  <!-- Timeline track -->
+$trail_str
+
+  <!-- Year markers -->
+$years_str
+
+  <!-- Nodes and labels -->
+$nodes_str
+
+  <!-- Comet -->
+$comet_str
+</svg>''',
+    WIDTH=WIDTH,
+    HEIGHT=HEIGHT,
+    INNER_W=WIDTH - 1,
+    INNER_H=HEIGHT - 1,
+)
+
+
 def render(timeline: list, galaxy_arms: list, theme: dict) -> str:
     """Render the coding timeline SVG.
 
@@ -227,11 +265,13 @@ def render(timeline: list, galaxy_arms: list, theme: dict) -> str:
             entries[i]["x"] = entries[i - 1]["x"] + 20
 
     # Build layers
-    defs_str = _build_defs(arm_colors, theme)
+    defs = DefsRegistry()
+    node_glow, comet_glow = _build_defs(defs, theme)
+    defs_str = defs.render() + "\n" + _STYLE
     trail_str = _build_comet_trail(usable_width, theme)
     years_str = _build_year_markers(entries, theme)
-    nodes_str = _build_nodes_and_labels(entries, usable_width, arm_colors, theme)
-    comet_str = _build_comet(usable_width, theme)
+    nodes_str = _build_nodes_and_labels(entries, usable_width, arm_colors, theme, node_glow)
+    comet_str = _build_comet(usable_width, theme, comet_glow)
 
     # Title
     title = (
@@ -250,29 +290,15 @@ def render(timeline: list, galaxy_arms: list, theme: dict) -> str:
         f'{min_year} — {max_year}</text>'
     )
 
-    return f'''<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" viewBox="0 0 {WIDTH} {HEIGHT}">
-  <defs>
-{defs_str}
-  </defs>
-
-  <!-- Background -->
-  <rect x="0.5" y="0.5" width="{WIDTH - 1}" height="{HEIGHT - 1}" rx="12" ry="12"
-        fill="{theme['nebula']}" stroke="{theme['star_dust']}" stroke-width="1"/>
-
-  <!-- Title -->
-{title}
-{status_dot}
-{status_text}
-
-  <!-- Timeline track -->
-{trail_str}
-
-  <!-- Year markers -->
-{years_str}
-
-  <!-- Nodes and labels -->
-{nodes_str}
-
-  <!-- Comet -->
-{comet_str}
-</svg>'''
+    return _SKELETON.render(
+        defs_str=defs_str,
+        nebula=theme["nebula"],
+        star_dust=theme["star_dust"],
+        title=title,
+        status_dot=status_dot,
+        status_text=status_text,
+        trail_str=trail_str,
+        years_str=years_str,
+        nodes_str=nodes_str,
+        comet_str=comet_str,
+    )
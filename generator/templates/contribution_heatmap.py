@@ -1,5 +1,9 @@
 """SVG template: Contribution Nebula — cosmic heatmap calendar (850x~185)."""
 
+from generator.contrib_calendar import ContributionCalendar
+from generator.defs import DefsRegistry
+from generator.fragment_cache import fragment
+from generator.skeleton import Skeleton
 from generator.utils import esc, format_number
 
 WIDTH = 850
@@ -10,6 +14,7 @@ LEFT_MARGIN = 45
 TOP_MARGIN = 55
 BOTTOM_MARGIN = 35
 DAYS_PER_WEEK = 7
+GLOW_THRESHOLD = 12
 
 MONTH_NAMES = [
     "Jan", "Feb", "Mar", "Apr", "May", "Jun",
@@ -32,24 +37,7 @@ def _cell_color_and_opacity(count, theme):
     return theme["synapse_cyan"], 1.0
 
 
-def _build_defs(theme):
-    """Build CSS animations and glow filter."""
-    cyan = theme.get("synapse_cyan", "#00d4ff")
-    parts = []
-
-    # Cell glow filter for high-activity cells
-    parts.append(f'''    <filter id="cell-glow" x="-100%" y="-100%" width="300%" height="300%">
-      <feGaussianBlur stdDeviation="2" in="SourceGraphic" result="blur"/>
-      <feFlood flood-color="{cyan}" flood-opacity="0.5" result="color"/>
-      <feComposite in="color" in2="blur" operator="in" result="glow"/>
-      <feMerge>
-        <feMergeNode in="glow"/>
-        <feMergeNode in="SourceGraphic"/>
-      </feMerge>
-    </filter>''')
-
-    # CSS animations
-    parts.append('''    <style>
+_STYLE = '''    <style>
       @keyframes hm-cell-appear {
         from { opacity: 0; transform: scale(0.5); }
         to { opacity: var(--cell-op, 0.3); transform: scale(1); }
@@ -62,37 +50,52 @@ def _build_defs(theme):
         0%, 100% { opacity: 0.8; }
         50% { opacity: 1; }
       }
-    </style>''')
+    </style>'''
 
-    return "\n".join(parts)
 
+def _build_defs(defs):
+    """Register the glow filter for high-activity cells and return its id."""
+    return defs.glow_filter(2, prefix="cell-glow")
 
-def _build_month_labels(weeks, theme):
-    """Build month name labels positioned above the correct week columns."""
-    parts = []
+
+def _build_month_labels(weeks, theme, month_totals=None):
+    """Build month name labels positioned above the correct week columns.
+
+    With month_totals ({(year, month): total}), each label also shows its
+    month's total when there is room before the next label.
+    """
     if not weeks:
         return ""
 
+    # (column, week start date) of the first week of each month
+    starts = []
     last_month = -1
-    for col, week in enumerate(weeks):
-        if not week:
-            continue
+    for col, (week_start, _) in enumerate(weeks):
         # Use the first day of each week to determine month
-        date_str = week[0].get("date", "")
-        if len(date_str) >= 7:
-            month = int(date_str[5:7]) - 1  # 0-indexed
-            if month != last_month:
-                last_month = month
-                x = LEFT_MARGIN + col * (CELL_SIZE + CELL_GAP)
-                parts.append(
-                    f'  <text x="{x}" y="{TOP_MARGIN - 8}" fill="{theme["text_faint"]}" '
-                    f'font-size="9" font-family="monospace" opacity="0.7">'
-                    f'{MONTH_NAMES[month]}</text>'
-                )
+        if week_start.month != last_month:
+            last_month = week_start.month
+            starts.append((col, week_start))
+
+    parts = []
+    for i, (col, week_start) in enumerate(starts):
+        month = week_start.month - 1  # 0-indexed
+        x = LEFT_MARGIN + col * (CELL_SIZE + CELL_GAP)
+        label = MONTH_NAMES[month]
+        if month_totals is not None:
+            total = format_number(month_totals.get((week_start.year, week_start.month), 0))
+            next_col = starts[i + 1][0] if i + 1 < len(starts) else len(weeks)
+            if (len(label) + 1 + len(total)) * 9 * 0.6 < (next_col - col) * (CELL_SIZE + CELL_GAP):
+                label += f' <tspan fill="{theme["synapse_cyan"]}">{total}</tspan>'
+        parts.append(
+            f'  <text x="{x}" y="{TOP_MARGIN - 8}" fill="{theme["text_faint"]}" '
+            f'font-size="9" font-family="monospace" opacity="0.7">'
+            f'{label}</text>'
+        )
 
     return "\n".join(parts)
 
 
+@fragment
 def _build_day_labels(theme):
     """Build Mon/Wed/Fri labels on the left side."""
     parts = []
@@ -106,14 +109,12 @@ def _build_day_labels(theme):
     return "\n".join(parts)
 
 
-def _build_cells(weeks, theme):
+def _build_cells(weeks, theme, glow_filter):
     """Build all day cells with staggered fade-in animation."""
     parts = []
 
-    for col, week in enumerate(weeks):
-        for day in week:
-            row = day.get("weekday", 0)
-            count = day.get("count", 0)
+    for col, (_, days) in enumerate(weeks):
+        for row, count in days:
             fill, opacity = _cell_color_and_opacity(count, theme)
 
             x = LEFT_MARGIN + col * (CELL_SIZE + CELL_GAP)
@@ -121,9 +122,9 @@ def _build_cells(weeks, theme):
             delay = col * 0.015
 
             # High activity cells get glow filter
-            filter_attr = ' filter="url(#cell-glow)"' if count >= 12 else ""
+            filter_attr = f' filter="url(#{glow_filter})"' if count >= GLOW_THRESHOLD else ""
             pulse = ""
-            if count >= 12:
+            if count >= GLOW_THRESHOLD:
                 pulse = f" animation: hm-cell-pulse 3s ease {delay + 1}s infinite;"
 
             parts.append(
@@ -136,6 +137,55 @@ def _build_cells(weeks, theme):
     return "\n".join(parts)
 
 
+def _cell_subpath(x, y):
+    """Return a rounded-rect subpath matching one calendar cell at (x, y)."""
+    r = CELL_RADIUS
+    side = CELL_SIZE - 2 * r
+    return (
+        f"M{x + r},{y}h{side}a{r},{r} 0 0 1 {r},{r}v{side}"
+        f"a{r},{r} 0 0 1 -{r},{r}h-{side}a{r},{r} 0 0 1 -{r},-{r}"
+        f"v-{side}a{r},{r} 0 0 1 {r},-{r}z"
+    )
+
+
+def _build_cell_paths(weeks, theme, glow_filter):
+    """Build compact cells: one <path> per intensity level.
+
+    Every cell of a level becomes a subpath of that level's path, so the
+    element count no longer grows with the number of days. Glowing
+    high-activity cells stay separate so they keep their filter and pulse.
+    """
+    levels = {}
+    glowing = []
+
+    for col, (_, days) in enumerate(weeks):
+        for row, count in days:
+            x = LEFT_MARGIN + col * (CELL_SIZE + CELL_GAP)
+            y = TOP_MARGIN + row * (CELL_SIZE + CELL_GAP)
+
+            if count >= GLOW_THRESHOLD:
+                fill, _ = _cell_color_and_opacity(count, theme)
+                delay = col * 0.015 + 1
+                glowing.append(
+                    f'  <rect x="{x}" y="{y}" width="{CELL_SIZE}" height="{CELL_SIZE}" '
+                    f'rx="{CELL_RADIUS}" ry="{CELL_RADIUS}" fill="{fill}" filter="url(#{glow_filter})" '
+                    f'style="animation: hm-cell-pulse 3s ease {delay:.2f}s infinite"/>'
+                )
+                continue
+
+            levels.setdefault(_cell_color_and_opacity(count, theme), []).append(
+                _cell_subpath(x, y)
+            )
+
+    parts = [
+        f'  <path d="{"".join(subpaths)}" fill="{fill}" opacity="{opacity}"/>'
+        for (fill, opacity), subpaths in levels.items()
+    ]
+    parts.extend(glowing)
+    return "\n".join(parts)
+
+
+@fragment
 def _build_legend(y_pos, theme):
     """Build the intensity legend at the bottom."""
     parts = []
@@ -170,15 +220,53 @@ def _build_legend(y_pos, theme):
     return "\n".join(parts)
 
 
-def render(contributions: dict, theme: dict) -> str:
+# Document skeleton: static markup is compiled once at import time
+_SKELETON = Skeleton('''<svg xmlns="http://www.w3.org/2000/svg" width="$WIDTH" height="$height" viewBox="0 0 $WIDTH $height">
+  <defs>
+$defs_str
+  </defs>
+
+  <!-- Background -->
+  <rect x="0.5" y="0.5" width="$INNER_W" height="$inner_h" rx="12" ry="12"
+        fill="$nebula" stroke="$star_dust" stroke-width="1"/>
+
+  <!-- Title -->
+$title
+$status_dot
+$total_str
+
+  <!-- Month labels -->
+$months_str
+
+  <!-- Day labels -->
+$days_str
+
+  <!-- Contribution cells -->
+$cells_str
+
+  <!-- Legend -->
+$legend_str
+</svg>''',
+    WIDTH=WIDTH,
+    INNER_W=WIDTH - 1,
+)
+
+
+def render(contributions, theme: dict, compact: bool = False, month_totals: dict = None) -> str:
     """Render the contribution heatmap SVG.
 
     Args:
-        contributions: dict with total_count (int) and weeks (list of week lists)
+        contributions: ContributionCalendar, or a dict with total_count (int)
+            and weeks (list of week lists)
         theme: color palette dict
+        compact: merge cells into one static path per intensity level
+            instead of one animated <rect> per day
+        month_totals: optional {(year, month): total} to print next to the
+            month labels (see ContributionIndex.month_totals)
     """
-    weeks = contributions.get("weeks", [])
-    total_count = contributions.get("total_count", 0)
+    calendar = ContributionCalendar.coerce(contributions)
+    weeks = list(calendar.iter_weeks())
+    total_count = calendar.total_count
 
     n_weeks = len(weeks)
     if n_weeks == 0:
@@ -194,10 +282,15 @@ def render(contributions: dict, theme: dict) -> str:
     height = TOP_MARGIN + DAYS_PER_WEEK * (CELL_SIZE + CELL_GAP) + BOTTOM_MARGIN
 
     # Build layers
-    defs_str = _build_defs(theme)
-    months_str = _build_month_labels(weeks, theme)
+    defs = DefsRegistry()
+    glow_filter = _build_defs(defs)
+    defs_str = defs.render() + "\n" + _STYLE
+    months_str = _build_month_labels(weeks, theme, month_totals)
     days_str = _build_day_labels(theme)
-    cells_str = _build_cells(weeks, theme)
+    if compact:
+        cells_str = _build_cell_paths(weeks, theme, glow_filter)
+    else:
+        cells_str = _build_cells(weeks, theme, glow_filter)
     legend_y = TOP_MARGIN + DAYS_PER_WEEK * (CELL_SIZE + CELL_GAP) + 12
     legend_str = _build_legend(legend_y, theme)
 
@@ -223,29 +316,17 @@ def render(contributions: dict, theme: dict) -> str:
         f'</circle>'
     )
 
-    return f'''<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{height}" viewBox="0 0 {WIDTH} {height}">
-  <defs>
-{defs_str}
-  </defs>
-
-  <!-- Background -->
-  <rect x="0.5" y="0.5" width="{WIDTH - 1}" height="{height - 1}" rx="12" ry="12"
-        fill="{theme['nebula']}" stroke="{theme['star_dust']}" stroke-width="1"/>
-
-  <!-- Title -->
-{title}
-{status_dot}
-{total_str}
-
-  <!-- Month labels -->
-{months_str}
-
-  <!-- Day labels -->
-{days_str}
-
-  <!-- Contribution cells -->
-{cells_str}
-
-  <!-- Legend -->
-{legend_str}
-</svg>'''
+    return _SKELETON.render(
+        height=height,
+        defs_str=defs_str,
+        inner_h=height - 1,
+        nebula=theme["nebula"],
+        star_dust=theme["star_dust"],
+        title=title,
+        status_dot=status_dot,
+        total_str=total_str,
+        months_str=months_str,
+        days_str=days_str,
+        cells_str=cells_str,
+        legend_str=legend_str,
+    )
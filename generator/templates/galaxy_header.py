@@ -1,7 +1,13 @@
 """SVG template: Galaxy Header — the signature spiral galaxy banner (850x280)."""
 
 import math
-from generator.utils import spiral_points, deterministic_random, esc, resolve_arm_colors
+from generator import geometry, starfield
+from generator.defs import DefsRegistry
+from generator.fragment_cache import fragment
+from generator.labels import Candidate, LabelPlacer
+from generator.skeleton import Skeleton
+from generator.starfield import StarLayer
+from generator.utils import esc, resolve_arm_colors
 
 # ── Module-level constants ──
 WIDTH, HEIGHT = 850, 280
@@ -11,95 +17,63 @@ SPIRAL_TURNS = 0.85
 NUM_POINTS = 30
 X_SCALE, Y_SCALE = 1.5, 0.38
 START_ANGLES = [25, 150, 265]
+# Tech label candidates, best first: (px outward from the dot, px down)
+LABEL_OFFSETS = ((18, 0), (18, -10), (18, 10), (30, 0), (42, 0), (30, -10), (30, 10))
 
 
-def _build_glow_filters(galaxy_arms, arm_colors):
-    """Build the star glow filters, one per arm."""
-    glow_filters = []
-    for i, arm in enumerate(galaxy_arms):
-        color = arm_colors[i]
-        glow_filters.append(
-            f'    <filter id="star-glow-{i}" x="-100%" y="-100%" width="300%" height="300%">\n'
-            f'      <feGaussianBlur stdDeviation="3" result="blur"/>\n'
-            f'      <feFlood flood-color="{color}" flood-opacity="0.5" result="color"/>\n'
-            f'      <feComposite in="color" in2="blur" operator="in" result="glow"/>\n'
-            f'      <feMerge>\n'
-            f'        <feMergeNode in="glow"/>\n'
-            f'        <feMergeNode in="SourceGraphic"/>\n'
-            f'      </feMerge>\n'
-            f'    </filter>'
-        )
-    return "\n".join(glow_filters)
+# Star depth layers, back to front: (label, count, radius, opacity, twinkle duration)
+STAR_LAYERS = (
+    ("bg", 40, (0.3, 0.8), (0.08, 0.3), (5.0, 9.0)),
+    ("mid", 20, (0.6, 1.2), (0.15, 0.5), (3.5, 7.0)),
+    ("fg", 10, (1.0, 1.8), (0.4, 0.7), (2.0, 4.5)),
+)
 
 
-def _build_starfield(username, width, height, theme):
+@fragment
+def _build_starfield(username, width, height, theme, placement="uniform"):
     """Build all 3 star depth layers (bg, mid, fg)."""
-    star_layers = [
-        {
-            "count": 40, "label": "bg",
-            "r_min": 0.3, "r_max": 0.8,
-            "o_min": 0.08, "o_max": 0.3,
-            "dur_min": 5.0, "dur_max": 9.0,
-        },
-        {
-            "count": 20, "label": "mid",
-            "r_min": 0.6, "r_max": 1.2,
-            "o_min": 0.15, "o_max": 0.5,
-            "dur_min": 3.5, "dur_max": 7.0,
-        },
-        {
-            "count": 10, "label": "fg",
-            "r_min": 1.0, "r_max": 1.8,
-            "o_min": 0.4, "o_max": 0.7,
-            "dur_min": 2.0, "dur_max": 4.5,
-        },
-    ]
+    layers = tuple(
+        StarLayer(f"{username}_s", count, 10, r, o, d, f"_{lbl}")
+        for lbl, count, r, o, d in STAR_LAYERS
+    )
+    accent_colors = {
+        0: theme.get("synapse_cyan", "#00d4ff"),
+        4: theme.get("dendrite_violet", "#a78bfa"),
+        8: theme.get("axon_amber", "#ffb020"),
+    }
+    starlight = theme.get("starlight", "#ffffff")
 
     stars = []
-    for layer in star_layers:
-        n = layer["count"]
-        lbl = layer["label"]
-        sx = deterministic_random(f"{username}_sx_{lbl}", n, 10, width - 10)
-        sy = deterministic_random(f"{username}_sy_{lbl}", n, 10, height - 10)
-        sr = deterministic_random(f"{username}_sr_{lbl}", n, layer["r_min"], layer["r_max"])
-        so = deterministic_random(f"{username}_so_{lbl}", n, layer["o_min"], layer["o_max"])
-        sd = deterministic_random(f"{username}_sd_{lbl}", n, layer["dur_min"], layer["dur_max"])
-
-        accent_colors = {
-            0: theme.get("synapse_cyan", "#00d4ff"),
-            4: theme.get("dendrite_violet", "#a78bfa"),
-            8: theme.get("axon_amber", "#ffb020"),
-        }
-        for i in range(n):
-            fill = accent_colors.get(i % 12, "#ffffff")
-
-            delay = f"{sd[i] * 0.3:.1f}s"
+    for (lbl, *_), layer in zip(STAR_LAYERS, starfield.generate(layers, width, height, placement)):
+        for i, (x, y, r, o, d) in enumerate(zip(*layer)):
+            fill = accent_colors.get(i % 12, starlight)
             stars.append(
-                f'    <circle cx="{sx[i]:.1f}" cy="{sy[i]:.1f}" r="{sr[i]:.2f}" '
-                f'fill="{fill}" opacity="{so[i]:.2f}" class="star-{lbl}" '
-                f'style="animation-delay: {delay}"/>'
+                f'    <circle cx="{x:.1f}" cy="{y:.1f}" r="{r:.2f}" '
+                f'fill="{fill}" opacity="{o:.2f}" class="star-{lbl}" '
+                f'style="animation-delay: {d * 0.3:.1f}s"/>'
             )
     return "\n".join(stars)
 
 
-def _build_nebulae(cx, cy, theme):
+@fragment
+def _build_nebulae(cx, cy, theme, outer_filter, inner_filter):
     """Return the outer_nebula and inner_nebula SVG strings."""
     outer_nebula = (
-        f'    <circle cx="{cx - 180}" cy="{cy - 30}" r="120" fill="{theme["dendrite_violet"]}" opacity="0.015" filter="url(#nebula-outer)"/>\n'
-        f'    <circle cx="{cx + 200}" cy="{cy + 20}" r="100" fill="{theme["axon_amber"]}" opacity="0.012" filter="url(#nebula-outer)"/>\n'
-        f'    <circle cx="{cx}" cy="{cy + 40}" r="140" fill="{theme["synapse_cyan"]}" opacity="0.01" filter="url(#nebula-outer)"/>'
+        f'    <circle cx="{cx - 180}" cy="{cy - 30}" r="120" fill="{theme["dendrite_violet"]}" opacity="0.015" filter="url(#{outer_filter})"/>\n'
+        f'    <circle cx="{cx + 200}" cy="{cy + 20}" r="100" fill="{theme["axon_amber"]}" opacity="0.012" filter="url(#{outer_filter})"/>\n'
+        f'    <circle cx="{cx}" cy="{cy + 40}" r="140" fill="{theme["synapse_cyan"]}" opacity="0.01" filter="url(#{outer_filter})"/>'
     )
 
     inner_nebula = (
-        f'    <circle cx="{cx}" cy="{cy}" r="70" fill="{theme["synapse_cyan"]}" opacity="0.04" filter="url(#nebula-inner)"/>\n'
-        f'    <circle cx="{cx - 60}" cy="{cy - 20}" r="50" fill="{theme["dendrite_violet"]}" opacity="0.035" filter="url(#nebula-inner)"/>\n'
-        f'    <circle cx="{cx + 70}" cy="{cy + 15}" r="45" fill="{theme["axon_amber"]}" opacity="0.03" filter="url(#nebula-inner)"/>'
+        f'    <circle cx="{cx}" cy="{cy}" r="70" fill="{theme["synapse_cyan"]}" opacity="0.04" filter="url(#{inner_filter})"/>\n'
+        f'    <circle cx="{cx - 60}" cy="{cy - 20}" r="50" fill="{theme["dendrite_violet"]}" opacity="0.035" filter="url(#{inner_filter})"/>\n'
+        f'    <circle cx="{cx + 70}" cy="{cy + 15}" r="45" fill="{theme["axon_amber"]}" opacity="0.03" filter="url(#{inner_filter})"/>'
     )
 
     return outer_nebula, inner_nebula
 
 
-def _build_shooting_stars():
+def _build_shooting_stars(gradient):
     """Build the shooting star lines."""
     shoot_stars = []
     shoot_data = [
@@ -110,7 +84,7 @@ def _build_shooting_stars():
     for idx, (sx_pos, sy_pos, tx, ty, dur) in enumerate(shoot_data):
         shoot_stars.append(
             f'    <line x1="{sx_pos}" y1="{sy_pos}" x2="{sx_pos + 20}" y2="{sy_pos + 5}" '
-            f'stroke="url(#shoot-grad)" stroke-width="1.2" stroke-linecap="round" '
+            f'stroke="url(#{gradient})" stroke-width="1.2" stroke-linecap="round" '
             f'class="shooting-star" style="animation-delay: {idx * 2.5}s; '
             f'--shoot-tx: {tx}px; --shoot-ty: {ty}px; animation-duration: {dur}s"/>'
         )
@@ -185,19 +159,17 @@ def _build_spiral_arms(galaxy_arms, arm_colors, all_arm_points):
     return "\n".join(arm_paths), "\n".join(arm_particles)
 
 
-def _build_tech_labels(galaxy_arms, arm_colors, all_arm_points, cx, cy):
+def _build_tech_labels(galaxy_arms, arm_colors, all_arm_points, cx, cy, label_filter):
     """Build tech dots, leader lines, and labels with radial placement."""
     arm_dots = []
     outer_start = 8  # Only use outer 65% of spiral (indices 8-27 of 30)
 
+    # Dot positions first, so labels can steer clear of every dot
+    dots = []  # (arm_idx, i, item, px, py)
     for arm_idx, arm in enumerate(galaxy_arms):
-        color = arm_colors[arm_idx]
         points = all_arm_points[arm_idx]
         items = arm.get("items", [])
 
-        if not items:
-            continue
-
         # Distribute items across outer portion of spiral
         available = len(points) - outer_start - 2  # leave last 2 points free
         spacing = max(1, available // max(len(items), 1))
@@ -205,56 +177,68 @@ def _build_tech_labels(galaxy_arms, arm_colors, all_arm_points, cx, cy):
         for i, item in enumerate(items):
             pt_idx = min(outer_start + i * spacing, len(points) - 1)
             px, py = points[pt_idx]
+            dots.append((arm_idx, i, item, px, py))
 
-            # Radial direction from core (Step 3)
-            dx = px - cx
-            dy = py - cy
-            dist = math.sqrt(dx * dx + dy * dy) or 1
-            nx = dx / dist
-            ny = dy / dist
-
-            # Label position: 18px outward from dot
-            label_x = px + nx * 18
-            label_y = py + ny * 18
-
-            # Dynamic text-anchor based on position
-            if dx > 20:
-                anchor = "start"
-            elif dx < -20:
-                anchor = "end"
-            else:
-                anchor = "middle"
-
-            # Dot with opacity pulse animation (Step 7)
-            arm_dots.append(
-                f'    <circle cx="{px:.1f}" cy="{py:.1f}" r="2.5" fill="{color}" opacity="0.85">\n'
-                f'      <animate attributeName="opacity" values="0.85;1;0.85" dur="5s" begin="{i * 0.7}s" repeatCount="indefinite"/>\n'
-                f'    </circle>'
-            )
+    placer = LabelPlacer(bounds=(0, 0, WIDTH, HEIGHT))
+    for _, _, _, px, py in dots:
+        placer.block((px - 2.5, py - 2.5, px + 2.5, py + 2.5))
 
-            # Leader line — dashed, subtle (Step 3)
-            arm_dots.append(
-                f'    <line x1="{px:.1f}" y1="{py:.1f}" x2="{label_x:.1f}" y2="{label_y:.1f}" '
-                f'stroke="{color}" stroke-width="0.5" opacity="0.25" stroke-dasharray="2 2"/>'
-            )
+    for arm_idx, i, item, px, py in dots:
+        color = arm_colors[arm_idx]
 
-            # Label glow (blurred duplicate behind — Step 9)
-            arm_dots.append(
-                f'    <text x="{label_x:.1f}" y="{label_y + 3:.1f}" text-anchor="{anchor}" '
-                f'fill="{color}" font-size="9" font-family="monospace" opacity="0.2" '
-                f'filter="url(#label-glow)">{esc(item)}</text>'
-            )
+        # Radial direction from core (Step 3)
+        dx = px - cx
+        dy = py - cy
+        dist = math.sqrt(dx * dx + dy * dy) or 1
+        nx = dx / dist
+        ny = dy / dist
+
+        # Dynamic text-anchor based on position
+        if dx > 20:
+            anchor = "start"
+        elif dx < -20:
+            anchor = "end"
+        else:
+            anchor = "middle"
+
+        # Label position: 18px outward from dot, further out or shifted if taken
+        candidates = [
+            Candidate(px + nx * out, py + ny * out + 3 + shift, anchor)
+            for out, shift in LABEL_OFFSETS
+        ]
+        label_x, text_y, _ = placer.place(item, 9, candidates)
+        label_y = text_y - 3
+
+        # Dot with opacity pulse animation (Step 7)
+        arm_dots.append(
+            f'    <circle cx="{px:.1f}" cy="{py:.1f}" r="2.5" fill="{color}" opacity="0.85">\n'
+            f'      <animate attributeName="opacity" values="0.85;1;0.85" dur="5s" begin="{i * 0.7}s" repeatCount="indefinite"/>\n'
+            f'    </circle>'
+        )
 
-            # Main label (Step 9)
-            arm_dots.append(
-                f'    <text x="{label_x:.1f}" y="{label_y + 3:.1f}" text-anchor="{anchor}" '
-                f'fill="{color}" font-size="9" font-family="monospace" opacity="0.85">{esc(item)}</text>'
-            )
+        # Leader line — dashed, subtle (Step 3)
+        arm_dots.append(
+            f'    <line x1="{px:.1f}" y1="{py:.1f}" x2="{label_x:.1f}" y2="{label_y:.1f}" '
+            f'stroke="{color}" stroke-width="0.5" opacity="0.25" stroke-dasharray="2 2"/>'
+        )
+
+        # Label glow (blurred duplicate behind — Step 9)
+        arm_dots.append(
+            f'    <text x="{label_x:.1f}" y="{label_y + 3:.1f}" text-anchor="{anchor}" '
+            f'fill="{color}" font-size="9" font-family="monospace" opacity="0.2" '
+            f'filter="url(#{label_filter})">{esc(item)}</text>'
+        )
+
+        # Main label (Step 9)
+        arm_dots.append(
+            f'    <text x="{label_x:.1f}" y="{label_y + 3:.1f}" text-anchor="{anchor}" '
+            f'fill="{color}" font-size="9" font-family="monospace" opacity="0.85">{esc(item)}</text>'
+        )
 
     return "\n".join(arm_dots)
 
 
-def _build_project_stars(projects, galaxy_arms, arm_colors, all_arm_points):
+def _build_project_stars(projects, galaxy_arms, arm_colors, all_arm_points, glow_filter):
     """Build project star circles."""
     project_stars = []
     for proj in projects[:3]:
@@ -268,7 +252,7 @@ def _build_project_stars(projects, galaxy_arms, arm_colors, all_arm_points):
         delay = f"{arm_idx * 0.8}s"
 
         project_stars.append(
-            f'    <circle cx="{px:.1f}" cy="{py:.1f}" r="4" fill="{color}" filter="url(#star-glow-{arm_idx})">\n'
+            f'    <circle cx="{px:.1f}" cy="{py:.1f}" r="4" fill="{color}" filter="url(#{glow_filter})">\n'
             f'      <animate attributeName="opacity" values="0.6;1;0.6" dur="4s" begin="{delay}" repeatCount="indefinite"/>\n'
             f'    </circle>'
         )
@@ -276,6 +260,7 @@ def _build_project_stars(projects, galaxy_arms, arm_colors, all_arm_points):
     return "\n".join(project_stars)
 
 
+@fragment
 def _build_orbital_rings(cx, cy, theme):
     """Build the orbital ring ellipses."""
     return (
@@ -294,13 +279,13 @@ def _build_orbital_rings(cx, cy, theme):
     )
 
 
-def _build_galaxy_core(cx, cy, theme, initial):
+def _build_galaxy_core(cx, cy, theme, initial, glow_filter, haze_gradient, inner_gradient):
     """Build the core layers (haze, glow, rings, solid core, initial)."""
     return (
         f'    <!-- Outer haze -->\n'
-        f'    <circle cx="{cx}" cy="{cy}" r="40" fill="url(#core-haze-gradient)" opacity="0.4"/>\n'
+        f'    <circle cx="{cx}" cy="{cy}" r="40" fill="url(#{haze_gradient})" opacity="0.4"/>\n'
         f'    <!-- Inner glow -->\n'
-        f'    <circle cx="{cx}" cy="{cy}" r="24" fill="url(#core-inner-gradient)" opacity="0.6"/>\n'
+        f'    <circle cx="{cx}" cy="{cy}" r="24" fill="url(#{inner_gradient})" opacity="0.6"/>\n'
         f'    <!-- Outer ring -->\n'
         f'    <ellipse cx="{cx}" cy="{cy}" rx="20" ry="18" fill="none" '
         f'stroke="{theme["synapse_cyan"]}" stroke-width="1.2" opacity="0.55" '
@@ -313,188 +298,209 @@ def _build_galaxy_core(cx, cy, theme, initial):
         f'stroke="{theme["star_dust"]}" stroke-width="0.5"/>\n'
         f'    <!-- Bright center dot -->\n'
         f'    <circle cx="{cx}" cy="{cy}" r="3" fill="{theme["synapse_cyan"]}" '
-        f'filter="url(#core-bright-glow)" opacity="0.9"/>\n'
+        f'filter="url(#{glow_filter})" opacity="0.9"/>\n'
         f'    <!-- Initial -->\n'
         f'    <text x="{cx}" y="{cy + 5}" text-anchor="middle" fill="{theme["synapse_cyan"]}" '
         f'font-size="14" font-weight="bold" font-family="monospace">{initial}</text>'
     )
 
 
-def render(
-    config: dict,
-    theme: dict,
-    galaxy_arms: list,
-    projects: list,
-) -> str:
-    """Render the galaxy header SVG.
-
-    Args:
-        config: full profile config dict
-        theme: color palette dict
-        galaxy_arms: list of arm configs
-        projects: list of project dicts
-    """
-    username = config.get("username", "user")
-    profile = config.get("profile", {})
-    name = profile.get("name", username)
-    tagline = profile.get("tagline", "")
-    philosophy = profile.get("philosophy", "")
-    initial = name[0].upper() if name else "?"
-
-    arm_colors = resolve_arm_colors(galaxy_arms, theme)
-
-    # ── Spiral geometry (Step 2) ──
-    # Generate arm points for all arms
-    all_arm_points = [
-        spiral_points(
-            CENTER_X, CENTER_Y, START_ANGLES[arm_idx % len(START_ANGLES)],
-            NUM_POINTS, MAX_RADIUS, SPIRAL_TURNS, X_SCALE, Y_SCALE
-        )
-        for arm_idx in range(len(galaxy_arms))
-    ]
-
-    # ── Defs: filters, gradients, animations ──
-
-    # Glow filters for project stars
-    glow_filters_str = _build_glow_filters(galaxy_arms, arm_colors)
-
-    # Label glow filter (Step 9)
-    label_glow_filter = (
-        '    <filter id="label-glow" x="-20%" y="-20%" width="140%" height="140%">\n'
-        '      <feGaussianBlur stdDeviation="2" result="blur"/>\n'
-        '    </filter>'
-    )
-
-    # Core glow filter
-    core_glow_filter = (
-        '    <filter id="core-bright-glow" x="-100%" y="-100%" width="300%" height="300%">\n'
-        '      <feGaussianBlur stdDeviation="4"/>\n'
-        '    </filter>'
-    )
-
-    # ── Build all layers via helper functions ──
-    stars_str = _build_starfield(username, WIDTH, HEIGHT, theme)
-    outer_nebula, inner_nebula = _build_nebulae(CENTER_X, CENTER_Y, theme)
-    shoot_stars_str = _build_shooting_stars()
-    arm_paths_str, arm_particles_str = _build_spiral_arms(galaxy_arms, arm_colors, all_arm_points)
-    arm_dots_str = _build_tech_labels(galaxy_arms, arm_colors, all_arm_points, CENTER_X, CENTER_Y)
-    project_stars_str = _build_project_stars(projects, galaxy_arms, arm_colors, all_arm_points)
-    orbital_rings = _build_orbital_rings(CENTER_X, CENTER_Y, theme)
-    core = _build_galaxy_core(CENTER_X, CENTER_Y, theme, initial)
-
-    # ── Assemble SVG ──
-    return f'''<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" viewBox="0 0 {WIDTH} {HEIGHT}">
+# Document skeleton: static markup is compiled once at import time
+_SKELETON = Skeleton('''<svg xmlns="http://www.w3.org/2000/svg" width="$WIDTH" height="$HEIGHT" viewBox="0 0 $WIDTH $HEIGHT">
   <defs>
     <style>
-      .star-bg {{
+      .star-bg {
         animation: twinkle-slow 7s ease-in-out infinite;
-      }}
-      .star-mid {{
+      }
+      .star-mid {
         animation: twinkle-mid 5s ease-in-out infinite;
-      }}
-      .star-fg {{
+      }
+      .star-fg {
         animation: twinkle-fast 3s ease-in-out infinite;
-      }}
-      @keyframes twinkle-slow {{
-        0%, 100% {{ opacity: 0.08; }}
-        50% {{ opacity: 0.3; }}
-      }}
-      @keyframes twinkle-mid {{
-        0%, 100% {{ opacity: 0.15; }}
-        50% {{ opacity: 0.5; }}
-      }}
-      @keyframes twinkle-fast {{
-        0%, 100% {{ opacity: 0.4; }}
-        50% {{ opacity: 0.8; }}
-      }}
-      .core-ring {{
+      }
+      @keyframes twinkle-slow {
+        0%, 100% { opacity: 0.08; }
+        50% { opacity: 0.3; }
+      }
+      @keyframes twinkle-mid {
+        0%, 100% { opacity: 0.15; }
+        50% { opacity: 0.5; }
+      }
+      @keyframes twinkle-fast {
+        0%, 100% { opacity: 0.4; }
+        50% { opacity: 0.8; }
+      }
+      .core-ring {
         animation: pulse-core 3s ease-in-out infinite;
-      }}
-      .core-ring-inner {{
+      }
+      .core-ring-inner {
         animation: pulse-core 3s ease-in-out infinite 1.5s;
-      }}
-      @keyframes pulse-core {{
-        0%, 100% {{ stroke-opacity: 0.3; transform: scale(1); transform-origin: {CENTER_X}px {CENTER_Y}px; }}
-        50% {{ stroke-opacity: 0.8; transform: scale(1.06); transform-origin: {CENTER_X}px {CENTER_Y}px; }}
-      }}
-      .shooting-star {{
+      }
+      @keyframes pulse-core {
+        0%, 100% { stroke-opacity: 0.3; transform: scale(1); transform-origin: ${CENTER_X}px ${CENTER_Y}px; }
+        50% { stroke-opacity: 0.8; transform: scale(1.06); transform-origin: ${CENTER_X}px ${CENTER_Y}px; }
+      }
+      .shooting-star {
         opacity: 0;
         animation: shoot linear infinite;
-      }}
-      @keyframes shoot {{
-        0% {{ opacity: 0; transform: translate(0, 0); }}
-        5% {{ opacity: 0.9; }}
-        15% {{ opacity: 0.6; transform: translate(var(--shoot-tx), var(--shoot-ty)); }}
-        20% {{ opacity: 0; transform: translate(var(--shoot-tx), var(--shoot-ty)); }}
-        100% {{ opacity: 0; }}
-      }}
+      }
+      @keyframes shoot {
+        0% { opacity: 0; transform: translate(0, 0); }
+        5% { opacity: 0.9; }
+        15% { opacity: 0.6; transform: translate(var(--shoot-tx), var(--shoot-ty)); }
+        20% { opacity: 0; transform: translate(var(--shoot-tx), var(--shoot-ty)); }
+        100% { opacity: 0; }
+      }
     </style>
 
-    <filter id="nebula-outer">
-      <feGaussianBlur stdDeviation="60"/>
-    </filter>
-    <filter id="nebula-inner">
-      <feGaussianBlur stdDeviation="30"/>
-    </filter>
-
-{label_glow_filter}
-{core_glow_filter}
-
-    <radialGradient id="core-haze-gradient" cx="50%" cy="50%" r="50%">
-      <stop offset="0%" stop-color="{theme['synapse_cyan']}" stop-opacity="0.5"/>
-      <stop offset="50%" stop-color="{theme['dendrite_violet']}" stop-opacity="0.2"/>
-      <stop offset="100%" stop-color="{theme['synapse_cyan']}" stop-opacity="0"/>
-    </radialGradient>
-
-    <radialGradient id="core-inner-gradient" cx="50%" cy="50%" r="50%">
-      <stop offset="0%" stop-color="#ffffff" stop-opacity="0.6"/>
-      <stop offset="40%" stop-color="{theme['synapse_cyan']}" stop-opacity="0.3"/>
-      <stop offset="100%" stop-color="{theme['synapse_cyan']}" stop-opacity="0"/>
-    </radialGradient>
-
-    <linearGradient id="shoot-grad" x1="0%" y1="0%" x2="100%" y2="0%">
-      <stop offset="0%" stop-color="#ffffff" stop-opacity="0.8"/>
-      <stop offset="100%" stop-color="#ffffff" stop-opacity="0"/>
-    </linearGradient>
-
-{glow_filters_str}
+$defs_str
   </defs>
 
   <!-- 1. Background -->
-  <rect x="0" y="0" width="{WIDTH}" height="{HEIGHT}" rx="12" ry="12" fill="{theme['void']}"/>
+  <rect x="0" y="0" width="$WIDTH" height="$HEIGHT" rx="12" ry="12" fill="$void"/>
 
   <!-- 2. Outer nebula -->
-{outer_nebula}
+$outer_nebula
 
   <!-- 3. Star field (3 layers) -->
-{stars_str}
+$stars_str
 
   <!-- 4. Inner nebula -->
-{inner_nebula}
+$inner_nebula
 
   <!-- 5. Shooting stars -->
-{shoot_stars_str}
+$shoot_stars_str
 
   <!-- 6. Spiral arm paths (segmented fade) -->
-{arm_paths_str}
+$arm_paths_str
 
   <!-- 7. Arm particles -->
-{arm_particles_str}
+$arm_particles_str
 
   <!-- 8. Tech dots + leader lines + labels -->
-{arm_dots_str}
+$arm_dots_str
 
   <!-- 9. Project stars -->
-{project_stars_str}
+$project_stars_str
 
   <!-- 10. Orbital rings -->
-{orbital_rings}
+$orbital_rings
 
   <!-- 11. Galaxy core -->
-{core}
+$core
 
   <!-- 12. Profile text -->
-  <text x="{CENTER_X}" y="26" text-anchor="middle" fill="{theme['text_bright']}" font-size="20" font-weight="bold" font-family="sans-serif">{esc(name)}</text>
-  <text x="{CENTER_X}" y="44" text-anchor="middle" fill="{theme['text_dim']}" font-size="12" font-family="sans-serif">{esc(tagline)}</text>
-  <text x="{CENTER_X}" y="{HEIGHT - 12}" text-anchor="middle" fill="{theme['text_faint']}" font-size="11" font-family="monospace" font-style="italic">{esc(philosophy)}</text>
-</svg>'''
+  <text x="$CENTER_X" y="26" text-anchor="middle" fill="$text_bright" font-size="20" font-weight="bold" font-family="sans-serif">$name</text>
+  <text x="$CENTER_X" y="44" text-anchor="middle" fill="$text_dim" font-size="12" font-family="sans-serif">$tagline</text>
+  <text x="$CENTER_X" y="$PHILOSOPHY_Y" text-anchor="middle" fill="$text_faint" font-size="11" font-family="monospace" font-style="italic">$philosophy</text>
+</svg>''',
+    WIDTH=WIDTH,
+    HEIGHT=HEIGHT,
+    CENTER_X=CENTER_X,
+    CENTER_Y=CENTER_Y,
+    PHILOSOPHY_Y=HEIGHT - 12,
+)
+
+
+def render(
+    config: dict,
+    theme: dict,
+    galaxy_arms: list,
+    projects: list,
+) -> str:
+    """Render the galaxy header SVG.
+
+    Args:
+        config: full profile config dict
+        theme: color palette dict
+        galaxy_arms: list of arm configs
+        projects: list of project dicts
+    """
+    username = config.get("username", "user")
+    profile = config.get("profile", {})
+    name = profile.get("name", username)
+    tagline = profile.get("tagline", "")
+    philosophy = profile.get("philosophy", "")
+    initial = esc(name[0].upper()) if name else "?"
+
+    arm_colors = resolve_arm_colors(galaxy_arms, theme)
+
+    # ── Spiral geometry (Step 2) ──
+    # Generate arm points for all arms
+    all_arm_points = geometry.spirals(
+        CENTER_X, CENTER_Y,
+        tuple(START_ANGLES[arm_idx % len(START_ANGLES)] for arm_idx in range(len(galaxy_arms))),
+        NUM_POINTS, MAX_RADIUS, SPIRAL_TURNS, X_SCALE, Y_SCALE
+    )
+
+    # ── Defs: filters and gradients, shared across arms ──
+    defs = DefsRegistry()
+    starlight = theme.get("starlight", "#ffffff")
+    nebula_outer = defs.blur_filter(60, prefix="nebula-outer")
+    nebula_inner = defs.blur_filter(30, prefix="nebula-inner")
+    label_glow = defs.blur_filter(2, region=20, prefix="label-glow")
+    core_glow = defs.blur_filter(4, region=100, prefix="core-bright-glow")
+    core_haze = defs.add("core-haze-gradient", (
+        f'    <radialGradient id="{{id}}" cx="50%" cy="50%" r="50%">\n'
+        f'      <stop offset="0%" stop-color="{theme["synapse_cyan"]}" stop-opacity="0.5"/>\n'
+        f'      <stop offset="50%" stop-color="{theme["dendrite_violet"]}" stop-opacity="0.2"/>\n'
+        f'      <stop offset="100%" stop-color="{theme["synapse_cyan"]}" stop-opacity="0"/>\n'
+        f'    </radialGradient>'
+    ))
+    core_inner = defs.add("core-inner-gradient", (
+        f'    <radialGradient id="{{id}}" cx="50%" cy="50%" r="50%">\n'
+        f'      <stop offset="0%" stop-color="{starlight}" stop-opacity="0.6"/>\n'
+        f'      <stop offset="40%" stop-color="{theme["synapse_cyan"]}" stop-opacity="0.3"/>\n'
+        f'      <stop offset="100%" stop-color="{theme["synapse_cyan"]}" stop-opacity="0"/>\n'
+        f'    </radialGradient>'
+    ))
+    shoot_grad = defs.add("shoot-grad", (
+        f'    <linearGradient id="{{id}}" x1="0%" y1="0%" x2="100%" y2="0%">\n'
+        f'      <stop offset="0%" stop-color="{starlight}" stop-opacity="0.8"/>\n'
+        f'      <stop offset="100%" stop-color="{starlight}" stop-opacity="0"/>\n'
+        f'    </linearGradient>'
+    ))
+    # One glow for every project star: the glow takes each star's own fill
+    star_glow = defs.glow_filter(3, prefix="star-glow")
+
+    # ── Build all layers via helper functions ──
+    placement = config.get("starfield", {}).get("placement", "uniform")
+    stars_str = _build_starfield(username, WIDTH, HEIGHT, theme, placement)
+    outer_nebula, inner_nebula = _build_nebulae(
+        CENTER_X, CENTER_Y, theme, nebula_outer, nebula_inner
+    )
+    shoot_stars_str = _build_shooting_stars(shoot_grad)
+    arm_paths_str, arm_particles_str = _build_spiral_arms(galaxy_arms, arm_colors, all_arm_points)
+    arm_dots_str = _build_tech_labels(
+        galaxy_arms, arm_colors, all_arm_points, CENTER_X, CENTER_Y, label_glow
+    )
+    project_stars_str = _build_project_stars(
+        projects, galaxy_arms, arm_colors, all_arm_points, star_glow
+    )
+    orbital_rings = _build_orbital_rings(CENTER_X, CENTER_Y, theme)
+    core = _build_galaxy_core(
+        CENTER_X, CENTER_Y, theme, initial, core_glow, core_haze, core_inner
+    )
+    defs_str = defs.render()
+
+    # ── Assemble SVG ──
+    return _SKELETON.render(
+        defs_str=defs_str,
+        void=theme["void"],
+        outer_nebula=outer_nebula,
+        stars_str=stars_str,
+        inner_nebula=inner_nebula,
+        shoot_stars_str=shoot_stars_str,
+        arm_paths_str=arm_paths_str,
+        arm_particles_str=arm_particles_str,
+        arm_dots_str=arm_dots_str,
+        project_stars_str=project_stars_str,
+        orbital_rings=orbital_rings,
+        core=core,
+        text_bright=theme["text_bright"],
+        name=esc(name),
+        text_dim=theme["text_dim"],
+        tagline=esc(tagline),
+        text_faint=theme["text_faint"],
+        philosophy=esc(philosophy),
+    )
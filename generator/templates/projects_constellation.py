@@ -1,56 +1,17 @@
 """SVG template: Featured Systems / Projects Constellation (850x220)."""
 
-from generator.utils import wrap_text, deterministic_random, esc, resolve_arm_colors
+from generator import starfield
+from generator.anim_classes import AnimationClasses
+from generator.defs import DefsRegistry, use
+from generator.fragment_cache import fragment
+from generator.skeleton import Skeleton
+from generator.starfield import StarLayer
+from generator.utils import wrap_text, esc, resolve_arm_colors
 
 WIDTH, HEIGHT = 850, 220
 
 
-def _build_defs(n, card_width, gap, card_colors, theme):
-    """Build all defs (filters, gradients, clip paths, CSS)."""
-    defs_parts = []
-
-    # Glow filters per card
-    for i in range(n):
-        color = card_colors[i]
-        defs_parts.append(f'''    <filter id="proj-glow-{i}" x="-80%" y="-80%" width="260%" height="260%">
-      <feGaussianBlur stdDeviation="4" in="SourceGraphic" result="blur"/>
-      <feFlood flood-color="{color}" flood-opacity="0.6" result="color"/>
-      <feComposite in="color" in2="blur" operator="in" result="glow"/>
-      <feMerge>
-        <feMergeNode in="glow"/>
-        <feMergeNode in="SourceGraphic"/>
-      </feMerge>
-    </filter>''')
-
-    # Card nebula filter
-    defs_parts.append('''    <filter id="card-nebula" x="-50%" y="-50%" width="200%" height="200%">
-      <feGaussianBlur stdDeviation="15"/>
-    </filter>''')
-
-    # Card background gradients
-    for i in range(n):
-        color = card_colors[i]
-        defs_parts.append(f'''    <linearGradient id="card-bg-{i}" x1="0" y1="0" x2="0" y2="1">
-      <stop offset="0%" stop-color="{theme['star_dust']}" stop-opacity="0.6"/>
-      <stop offset="100%" stop-color="{theme['nebula']}" stop-opacity="0.9"/>
-    </linearGradient>''')
-
-    # Connection line gradient (between card colors)
-    if n >= 2:
-        defs_parts.append(f'''    <linearGradient id="conn-grad" x1="0" y1="0" x2="1" y2="0">
-      <stop offset="0%" stop-color="{card_colors[0]}" stop-opacity="0.4"/>
-      <stop offset="100%" stop-color="{card_colors[-1]}" stop-opacity="0.4"/>
-    </linearGradient>''')
-
-    # Clip paths per card
-    for i in range(n):
-        card_x = gap + i * (card_width + gap)
-        defs_parts.append(f'''    <clipPath id="card-clip-{i}">
-      <rect x="{card_x}" y="55" width="{card_width}" height="140" rx="8" ry="8"/>
-    </clipPath>''')
-
-    # CSS keyframes
-    defs_parts.append('''    <style>
+_STYLE = '''    <style>
       @keyframes twinkle {
         0%, 100% { opacity: 0.1; }
         50% { opacity: 0.6; }
@@ -67,45 +28,97 @@ def _build_defs(n, card_width, gap, card_colors, theme):
         0% { transform: translateY(0); }
         100% { transform: translateY(160px); }
       }
-    </style>''')
+      @keyframes card-scan {
+        0% { transform: translateY(0); }
+        100% { transform: translateY(140px); }
+      }
+      @keyframes core-pulse {
+        0%, 100% { opacity: 0.5; transform: scale(0.9); }
+        50% { opacity: 0.9; transform: scale(1.1); }
+      }
+      .proj-sweep { animation: scan-sweep 6s linear infinite; }
+      .proj-scan { animation: card-scan 6s linear infinite; }
+      .proj-orbit {
+        transform-box: fill-box;
+        transform-origin: center;
+        animation: orbit 12s linear infinite;
+      }
+      .proj-pulse {
+        transform-box: fill-box;
+        transform-origin: center;
+        animation: core-pulse 3s linear infinite;
+      }
+    </style>'''
 
-    return "\n".join(defs_parts)
 
+def _build_defs(defs, n, card_width, gap, card_colors, theme):
+    """Register filters, gradients, clip paths and shapes; return their ids.
 
-def _build_starfield(n, width, height, card_colors, theme):
-    """Build the 25-star star field (bg + mid-ground stars)."""
+    Filters, the card background and the star core are identical for every
+    card, so they are registered once and shared; only clip paths (which
+    depend on the card position) stay per card.
+    """
+    ids = {
+        "glow": defs.glow_filter(4, opacity=0.6, region=80, prefix="proj-glow"),
+        "nebula": defs.blur_filter(15, region=50, prefix="card-nebula"),
+        "card_bg": defs.add("card-bg", (
+            f'    <linearGradient id="{{id}}" x1="0" y1="0" x2="0" y2="1">\n'
+            f'      <stop offset="0%" stop-color="{theme["star_dust"]}" stop-opacity="0.6"/>\n'
+            f'      <stop offset="100%" stop-color="{theme["nebula"]}" stop-opacity="0.9"/>\n'
+            f'    </linearGradient>'
+        )),
+        "core": defs.add(
+            "proj-core",
+            f'    <circle id="{{id}}" r="2" fill="{theme.get("starlight", "#ffffff")}" opacity="0.9"/>',
+        ),
+        "conn": None,
+        "clips": [],
+    }
+
+    # Connection line gradient (between card colors)
+    if n >= 2:
+        ids["conn"] = defs.add("conn-grad", (
+            f'    <linearGradient id="{{id}}" x1="0" y1="0" x2="1" y2="0">\n'
+            f'      <stop offset="0%" stop-color="{card_colors[0]}" stop-opacity="0.4"/>\n'
+            f'      <stop offset="100%" stop-color="{card_colors[-1]}" stop-opacity="0.4"/>\n'
+            f'    </linearGradient>'
+        ))
+
+    # Clip paths per card
+    for i in range(n):
+        card_x = gap + i * (card_width + gap)
+        ids["clips"].append(defs.add("card-clip", (
+            f'    <clipPath id="{{id}}">\n'
+            f'      <rect x="{card_x}" y="55" width="{card_width}" height="140" rx="8" ry="8"/>\n'
+            f'    </clipPath>'
+        )))
+
+    return ids
+
+
+# Background then mid-ground stars
+STAR_LAYERS = (
+    StarLayer("proj-star-", 15, 10, (0.3, 0.9), (0.05, 0.25), (5.0, 8.0)),
+    StarLayer("proj-mstar-", 10, 15, (0.5, 1.2), (0.10, 0.40), (3.0, 6.0)),
+)
+# Twinkle peak per layer: (opacity multiplier, cap)
+STAR_PEAKS = ((3, 0.6), (2.5, 0.8))
+
+
+@fragment
+def _build_starfield(n, width, height, card_colors, theme, placement="uniform"):
+    """Build the 25-star star field (bg + mid-ground stars); return (stars, css)."""
+    anim = AnimationClasses("proj")
     stars = []
-    layers = [
-        {
-            "prefix": "proj-star", "count": 15, "margin": 10,
-            "r": (0.3, 0.9), "o": (0.05, 0.25), "d": (5.0, 8.0),
-            "o_mult": 3, "o_cap": 0.6,
-        },
-        {
-            "prefix": "proj-mstar", "count": 10, "margin": 15,
-            "r": (0.5, 1.2), "o": (0.10, 0.40), "d": (3.0, 6.0),
-            "o_mult": 2.5, "o_cap": 0.8,
-        },
-    ]
-    for layer in layers:
-        count = layer["count"]
-        m = layer["margin"]
-        pfx = layer["prefix"]
-        sx = deterministic_random(f"{pfx}-x", count, m, width - m)
-        sy = deterministic_random(f"{pfx}-y", count, m, height - m)
-        sr = deterministic_random(f"{pfx}-r", count, *layer["r"])
-        so = deterministic_random(f"{pfx}-o", count, *layer["o"])
-        sd = deterministic_random(f"{pfx}-d", count, *layer["d"])
-        for i in range(count):
+    layers = starfield.generate(STAR_LAYERS, width, height, placement)
+    for (mult, cap), layer in zip(STAR_PEAKS, layers):
+        for i, (x, y, r, o, d) in enumerate(zip(*layer)):
             fill = card_colors[i % n] if i % 4 == 0 else theme["text_dim"]
             stars.append(
-                f'  <circle cx="{sx[i]:.1f}" cy="{sy[i]:.1f}" r="{sr[i]:.1f}" '
-                f'fill="{fill}" opacity="{so[i]:.2f}">'
-                f'<animate attributeName="opacity" values="{so[i]:.2f};{min(so[i] * layer["o_mult"], layer["o_cap"]):.2f};{so[i]:.2f}" '
-                f'dur="{sd[i]:.1f}s" repeatCount="indefinite"/>'
-                f'</circle>'
+                f'  <circle cx="{x:.1f}" cy="{y:.1f}" r="{r:.1f}" '
+                f'fill="{fill}" opacity="{o:.2f}" class="{anim.twinkle(o, min(o * mult, cap), d)}"/>'
             )
-    return "\n".join(stars)
+    return "\n".join(stars), anim.render()
 
 
 def _build_grid_overlay(width, height, theme):
@@ -128,7 +141,7 @@ def _build_grid_overlay(width, height, theme):
     return "\n".join(grid_lines)
 
 
-def _build_connections(n, card_width, gap):
+def _build_connections(n, card_width, gap, gradient):
     """Build connection lines between cards."""
     conn_lines = []
     if n >= 2:
@@ -137,7 +150,7 @@ def _build_connections(n, card_width, gap):
             x2 = gap + (i + 1) * (card_width + gap) + card_width / 2
             conn_lines.append(
                 f'  <line x1="{x1:.1f}" y1="85" x2="{x2:.1f}" y2="85" '
-                f'stroke="url(#conn-grad)" stroke-width="1" '
+                f'stroke="url(#{gradient})" stroke-width="1" '
                 f'stroke-dasharray="6,4" opacity="0.5"/>'
             )
     return "\n".join(conn_lines)
@@ -181,7 +194,7 @@ def _build_title_area(n, width, height, theme):
     return "\n".join(title_parts)
 
 
-def _build_project_card(i, proj, arm, color, card_width, card_x, theme):
+def _build_project_card(i, proj, arm, color, card_width, card_x, theme, ids):
     """Build a single project card."""
     card_cx = card_x + card_width / 2
     repo_name = proj["repo"].split("/")[-1] if "/" in proj["repo"] else proj["repo"]
@@ -198,26 +211,23 @@ def _build_project_card(i, proj, arm, color, card_width, card_x, theme):
     # Card container
     card_parts.append(
         f'    <rect x="{card_x}" y="55" width="{card_width}" height="140" rx="8" ry="8" '
-        f'fill="url(#card-bg-{i})" stroke="{theme["star_dust"]}" stroke-width="1"/>'
+        f'fill="url(#{ids["card_bg"]})" stroke="{theme["star_dust"]}" stroke-width="1"/>'
     )
 
     # Nebula wisps (clipped inside card)
-    card_parts.append(f'    <g clip-path="url(#card-clip-{i})">')
+    card_parts.append(f'    <g clip-path="url(#{ids["clips"][i]})">')
     card_parts.append(
         f'      <circle cx="{card_x + card_width * 0.3}" cy="90" r="50" '
-        f'fill="{color}" opacity="0.025" filter="url(#card-nebula)"/>'
+        f'fill="{color}" opacity="0.025" filter="url(#{ids["nebula"]})"/>'
     )
     card_parts.append(
         f'      <circle cx="{card_x + card_width * 0.7}" cy="150" r="40" '
-        f'fill="{color}" opacity="0.03" filter="url(#card-nebula)"/>'
+        f'fill="{color}" opacity="0.03" filter="url(#{ids["nebula"]})"/>'
     )
     # Scan line inside card
     card_parts.append(
         f'      <rect x="{card_x}" y="55" width="{card_width}" height="2" '
-        f'fill="{color}" opacity="0.1">'
-        f'<animateTransform attributeName="transform" type="translate" '
-        f'from="0 0" to="0 140" dur="6s" repeatCount="indefinite"/>'
-        f'</rect>'
+        f'fill="{color}" opacity="0.1" class="proj-scan"/>'
     )
     card_parts.append('    </g>')
 
@@ -225,29 +235,21 @@ def _build_project_card(i, proj, arm, color, card_width, card_x, theme):
     # Orbital ring (rotating dashed circle)
     card_parts.append(
         f'    <circle cx="{card_cx}" cy="85" r="14" fill="none" '
-        f'stroke="{color}" stroke-width="0.8" stroke-dasharray="4,3" opacity="0.5">'
-        f'<animateTransform attributeName="transform" type="rotate" '
-        f'from="0 {card_cx} 85" to="360 {card_cx} 85" dur="12s" repeatCount="indefinite"/>'
-        f'</circle>'
+        f'stroke="{color}" stroke-width="0.8" stroke-dasharray="4,3" opacity="0.5" '
+        f'class="proj-orbit"/>'
     )
     # Glow halo
     card_parts.append(
         f'    <circle cx="{card_cx}" cy="85" r="8" fill="{color}" '
-        f'opacity="0.15" filter="url(#proj-glow-{i})"/>'
+        f'opacity="0.15" filter="url(#{ids["glow"]})"/>'
     )
     # Pulsing core
     card_parts.append(
-        f'    <circle cx="{card_cx}" cy="85" r="5" fill="{color}" opacity="0.7">'
-        f'<animate attributeName="opacity" values="0.5;0.9;0.5" dur="3s" '
-        f'begin="{delay}" repeatCount="indefinite"/>'
-        f'<animate attributeName="r" values="4.5;5.5;4.5" dur="3s" '
-        f'begin="{delay}" repeatCount="indefinite"/>'
-        f'</circle>'
+        f'    <circle cx="{card_cx}" cy="85" r="5" fill="{color}" opacity="0.7" '
+        f'class="proj-pulse" style="animation-delay: {delay}"/>'
     )
     # White center dot
-    card_parts.append(
-        f'    <circle cx="{card_cx}" cy="85" r="2" fill="#ffffff" opacity="0.9"/>'
-    )
+    card_parts.append(f'    {use(ids["core"], card_cx, 85)}')
 
     # Project name (centered)
     card_parts.append(
@@ -288,20 +290,50 @@ def _build_scan_line(width, theme):
     cyan = theme.get("synapse_cyan", "#00d4ff")
     return (
         f'  <rect x="12" y="50" width="{width - 24}" height="1.5" '
-        f'fill="{cyan}" opacity="0.08">'
-        f'<animateTransform attributeName="transform" type="translate" '
-        f'from="0 0" to="0 160" dur="6s" repeatCount="indefinite"/>'
-        f'</rect>'
+        f'fill="{cyan}" opacity="0.08" class="proj-sweep"/>'
     )
 
 
-def render(projects: list, galaxy_arms: list, theme: dict) -> str:
+# Document skeleton: static markup is compiled once at import time
+_SKELETON = Skeleton('''<svg xmlns="http://www.w3.org/2000/svg" width="$WIDTH" height="$HEIGHT" viewBox="0 0 $WIDTH $HEIGHT">
+  <defs>
+$defs_str
+  </defs>
+
+  <!-- Background -->
+$bg
+
+  <!-- Star field -->
+$stars_str
+
+  <!-- Grid overlay -->
+$grid_str
+
+  <!-- Connection lines -->
+$conn_str
+
+  <!-- Title area -->
+$title_str
+
+  <!-- Project cards -->
+$cards_str
+
+  <!-- Global scan line -->
+$scan_line
+</svg>''',
+    WIDTH=WIDTH,
+    HEIGHT=HEIGHT,
+)
+
+
+def render(projects: list, galaxy_arms: list, theme: dict, placement: str = "uniform") -> str:
     """Render the projects constellation SVG.
 
     Args:
         projects: list of project dicts with repo, arm, description
         galaxy_arms: list of arm configs for color mapping
         theme: color palette dict
+        placement: starfield placement mode ("uniform" or "poisson")
     """
     all_arm_colors = resolve_arm_colors(galaxy_arms, theme)
 
@@ -335,7 +367,8 @@ def render(projects: list, galaxy_arms: list, theme: dict) -> str:
         card_colors.append(all_arm_colors[arm_idx])
 
     # ── Layer 0: Defs ──
-    defs_str = _build_defs(n, card_width, gap, card_colors, theme)
+    defs = DefsRegistry()
+    ids = _build_defs(defs, n, card_width, gap, card_colors, theme)
 
     # ── Layer 1: Background rect ──
     bg = (
@@ -344,14 +377,15 @@ def render(projects: list, galaxy_arms: list, theme: dict) -> str:
         f'stroke="{theme["star_dust"]}" stroke-width="1"/>'
     )
 
-    # ── Layer 2: Star field (25 particles) ──
-    stars_str = _build_starfield(n, WIDTH, HEIGHT, card_colors, theme)
+    # ── Layer 2: Star field (25 particles, twinkling via shared CSS classes) ──
+    stars_str, stars_css = _build_starfield(n, WIDTH, HEIGHT, card_colors, theme, placement)
+    defs_str = defs.render() + "\n" + _STYLE + "\n" + stars_css
 
     # ── Layer 3: Faint grid overlay ──
     grid_str = _build_grid_overlay(WIDTH, HEIGHT, theme)
 
     # ── Layer 4: Connection lines between cards ──
-    conn_str = _build_connections(n, card_width, gap)
+    conn_str = _build_connections(n, card_width, gap, ids["conn"])
 
     # ── Layer 5: Title area ──
     title_str = _build_title_area(n, WIDTH, HEIGHT, theme)
@@ -364,36 +398,20 @@ def render(projects: list, galaxy_arms: list, theme: dict) -> str:
         color = card_colors[i]
         card_x = gap + i * (card_width + gap)
 
-        cards.append(_build_project_card(i, proj, arm, color, card_width, card_x, theme))
+        cards.append(_build_project_card(i, proj, arm, color, card_width, card_x, theme, ids))
 
     cards_str = "\n".join(cards)
 
     # ── Layer 7: Global scan line ──
     scan_line = _build_scan_line(WIDTH, theme)
 
-    return f'''<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" viewBox="0 0 {WIDTH} {HEIGHT}">
-  <defs>
-{defs_str}
-  </defs>
-
-  <!-- Background -->
-{bg}
-
-  <!-- Star field -->
-{stars_str}
-
-  <!-- Grid overlay -->
-{grid_str}
-
-  <!-- Connection lines -->
-{conn_str}
-
-  <!-- Title area -->
-{title_str}
-
-  <!-- Project cards -->
-{cards_str}
-
-  <!-- Global scan line -->
-{scan_line}
-</svg>'''
+    return _SKELETON.render(
+        defs_str=defs_str,
+        bg=bg,
+        stars_str=stars_str,
+        grid_str=grid_str,
+        conn_str=conn_str,
+        title_str=title_str,
+        cards_str=cards_str,
+        scan_line=scan_line,
+    )
@@ -2,6 +2,13 @@
 
 import math
 
+from generator import geometry, starfield
+from generator.anim_classes import AnimationClasses
+from generator.defs import DefsRegistry, use
+from generator.fragment_cache import fragment
+from generator.labels import Candidate, LabelPlacer
+from generator.skeleton import Skeleton
+from generator.starfield import StarLayer
 from generator.utils import deterministic_random, esc, resolve_arm_colors
 
 WIDTH, HEIGHT = 850, 500
@@ -9,26 +16,11 @@ ZONE_PADDING = 20
 STAR_MAX_RADIUS = 6.0
 STAR_MIN_RADIUS = 3.0
 LINE_OPACITY = 0.2
+# Line-draw animations are spread over at most this many seconds in mst mode
+MAX_DRAW_SECONDS = 8.0
 
 
-def _build_defs(arm_colors, theme):
-    """Build CSS keyframes, glow filters, and gradients."""
-    parts = []
-
-    # Glow filter per arm
-    for i, color in enumerate(arm_colors):
-        parts.append(f'''    <filter id="const-glow-{i}" x="-100%" y="-100%" width="300%" height="300%">
-      <feGaussianBlur stdDeviation="3" in="SourceGraphic" result="blur"/>
-      <feFlood flood-color="{color}" flood-opacity="0.5" result="color"/>
-      <feComposite in="color" in2="blur" operator="in" result="glow"/>
-      <feMerge>
-        <feMergeNode in="glow"/>
-        <feMergeNode in="SourceGraphic"/>
-      </feMerge>
-    </filter>''')
-
-    # CSS animations
-    parts.append('''    <style>
+_STYLE = '''    <style>
       @keyframes const-twinkle {
         0%, 100% { opacity: 0.7; }
         50% { opacity: 1; }
@@ -41,29 +33,39 @@ def _build_defs(arm_colors, theme):
         from { opacity: 0; }
         to { opacity: 1; }
       }
-    </style>''')
+    </style>'''
+
+
+def _build_defs(defs, theme):
+    """Register the shared star glow and star core; return (glow_id, core_id).
+
+    Every arm uses the same glow filter, since the glow takes each halo's
+    own fill color.
+    """
+    glow = defs.glow_filter(3, prefix="const-glow")
+    starlight = theme.get("starlight", "#ffffff")
+    core = defs.add(
+        "const-core", f'  <circle id="{{id}}" r="1.5" fill="{starlight}" opacity="0.9"/>'
+    )
+    return glow, core
 
-    return "\n".join(parts)
 
+STAR_LAYERS = (StarLayer("const-bg-", 30, 5, (0.3, 0.8), (0.05, 0.25), (4.0, 8.0)),)
 
-def _build_starfield(theme):
-    """Build ambient background stars."""
+
+@fragment
+def _build_starfield(theme, placement="uniform"):
+    """Build ambient background stars; return (stars, twinkle class CSS)."""
+    anim = AnimationClasses("const")
     stars = []
-    count = 30
-    sx = deterministic_random("const-bg-x", count, 5, WIDTH - 5)
-    sy = deterministic_random("const-bg-y", count, 5, HEIGHT - 5)
-    sr = deterministic_random("const-bg-r", count, 0.3, 0.8)
-    so = deterministic_random("const-bg-o", count, 0.05, 0.25)
-    sd = deterministic_random("const-bg-d", count, 4.0, 8.0)
-    for i in range(count):
+    (layer,) = starfield.generate(STAR_LAYERS, WIDTH, HEIGHT, placement)
+    for x, y, r, o, d in zip(*layer):
         stars.append(
-            f'  <circle cx="{sx[i]:.1f}" cy="{sy[i]:.1f}" r="{sr[i]:.1f}" '
-            f'fill="{theme["text_dim"]}" opacity="{so[i]:.2f}">'
-            f'<animate attributeName="opacity" values="{so[i]:.2f};{min(so[i] * 3, 0.5):.2f};{so[i]:.2f}" '
-            f'dur="{sd[i]:.1f}s" repeatCount="indefinite"/>'
-            f'</circle>'
+            f'  <circle cx="{x:.1f}" cy="{y:.1f}" r="{r:.1f}" '
+            f'fill="{theme["text_dim"]}" opacity="{o:.2f}" '
+            f'class="{anim.twinkle(o, min(o * 3, 0.5), d)}"/>'
         )
-    return "\n".join(stars)
+    return "\n".join(stars), anim.render()
 
 
 def _compute_star_positions(items, zone_x, zone_y, zone_w, zone_h, arm_idx):
@@ -80,30 +82,16 @@ def _compute_star_positions(items, zone_x, zone_y, zone_w, zone_h, arm_idx):
     usable_w = zone_w - inner_pad * 2
     usable_h = zone_h - inner_pad * 2
 
-    # Compute grid dimensions to spread items evenly
-    cols = math.ceil(math.sqrt(n * (usable_w / max(usable_h, 1))))
-    cols = max(cols, 1)
-    rows = math.ceil(n / cols)
-
-    cell_w = usable_w / max(cols, 1)
-    cell_h = usable_h / max(rows, 1)
+    # Spread items over a grid matching the zone's aspect ratio
+    _, _, cell_w, cell_h = geometry.grid_shape(n, usable_w, usable_h)
 
     # Generate jitter values for natural feel
     jx = deterministic_random(f"const_jx_{arm_idx}", n, -cell_w * 0.25, cell_w * 0.25)
     jy = deterministic_random(f"const_jy_{arm_idx}", n, -cell_h * 0.25, cell_h * 0.25)
+    points = geometry.jittered_grid(zone_x + inner_pad, zone_y + inner_pad, usable_w, usable_h, jx, jy)
 
     positions = []
-    for i, item in enumerate(items):
-        col = i % cols
-        row = i // cols
-
-        x = zone_x + inner_pad + col * cell_w + cell_w / 2 + jx[i]
-        y = zone_y + inner_pad + row * cell_h + cell_h / 2 + jy[i]
-
-        # Clamp within zone bounds
-        x = max(zone_x + inner_pad, min(x, zone_x + zone_w - inner_pad))
-        y = max(zone_y + inner_pad, min(y, zone_y + zone_h - inner_pad))
-
+    for i, (item, (x, y)) in enumerate(zip(items, points)):
         # Size: first items are larger (more prominent)
         t = i / max(n - 1, 1)
         radius = STAR_MAX_RADIUS - t * (STAR_MAX_RADIUS - STAR_MIN_RADIUS)
@@ -113,14 +101,10 @@ def _compute_star_positions(items, zone_x, zone_y, zone_w, zone_h, arm_idx):
     return positions
 
 
-def _build_constellation_group(arm_idx, arm, color, positions, theme):
-    """Build one constellation group: lines, stars, labels."""
+def _chain_lines(positions, color):
+    """Lines joining stars in list order, closing back to the middle at 4+ stars."""
     parts = []
     n = len(positions)
-    if n == 0:
-        return ""
-
-    # Constellation lines (connect stars sequentially)
     for i in range(n - 1):
         x1, y1 = positions[i][0], positions[i][1]
         x2, y2 = positions[i + 1][0], positions[i + 1][1]
@@ -147,6 +131,79 @@ def _build_constellation_group(arm_idx, arm, color, positions, theme):
             f'stroke-dasharray="{line_len:.0f}" stroke-dashoffset="{line_len:.0f}" '
             f'style="--line-len: {line_len:.0f}; animation: const-line-draw 1s ease {delay}s forwards"/>'
         )
+    return parts
+
+
+def _mst_lines(positions, color):
+    """Minimum-spanning-tree lines, drawn outward from the first star."""
+    edges = geometry.minimum_spanning_tree([(x, y) for x, y, _, _ in positions])
+    adjacent = {}
+    for i, j in edges:
+        adjacent.setdefault(i, []).append(j)
+        adjacent.setdefault(j, []).append(i)
+
+    # Breadth-first from the most prominent star, so the tree grows outward
+    order = []
+    seen = {0}
+    queue = [0]
+    for i in queue:
+        for j in adjacent.get(i, ()):
+            if j not in seen:
+                seen.add(j)
+                queue.append(j)
+                order.append((i, j))
+
+    step = min(0.4, MAX_DRAW_SECONDS / max(len(order), 1))
+    parts = []
+    for k, (i, j) in enumerate(order):
+        x1, y1 = positions[i][0], positions[i][1]
+        x2, y2 = positions[j][0], positions[j][1]
+        line_len = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+        parts.append(
+            f'  <line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
+            f'stroke="{color}" stroke-width="0.8" opacity="{LINE_OPACITY}" '
+            f'stroke-dasharray="{line_len:.0f}" stroke-dashoffset="{line_len:.0f}" '
+            f'style="--line-len: {line_len:.0f}; animation: const-line-draw 1s ease {k * step:.2f}s forwards"/>'
+        )
+    return parts
+
+
+def _build_more_cluster(x, y, more, color, theme, placer):
+    """Build the "+N more" cluster standing in for an arm's hidden skills."""
+    parts = [
+        f'  <circle cx="{x + dx:.1f}" cy="{y + dy:.1f}" r="1.5" fill="{color}" opacity="0.5"/>'
+        for dx, dy in ((-3, 1.5), (3, 1.5), (0, -3))
+    ]
+    text = f"+{more} more"
+    label_x, label_y, anchor = placer.place(text, 9, (
+        Candidate(x, y - 10),
+        Candidate(x, y + 14),
+        Candidate(x + 7, y + 3, "start"),
+        Candidate(x - 7, y + 3, "end"),
+    ))
+    parts.append(
+        f'  <text x="{label_x:.1f}" y="{label_y:.1f}" fill="{theme["text_faint"]}" '
+        f'font-size="9" font-family="monospace" text-anchor="{anchor}">{text}</text>'
+    )
+    return parts
+
+
+def _build_constellation_group(
+    arm_idx, arm, color, positions, theme, glow_filter, core_shape, placer, links="chain", more=0
+):
+    """Build one constellation group: lines, stars, labels.
+
+    Labels go above their star when free, else below, right or left
+    (placer is the card-wide LabelPlacer). With more > 0, the last position
+    is drawn as a "+N more" cluster instead of a star.
+    """
+    n = len(positions)
+    if n == 0:
+        return ""
+
+    parts = _mst_lines(positions, color) if links == "mst" else _chain_lines(positions, color)
+    if more:
+        *positions, (cluster_x, cluster_y, _, _) = positions
 
     # Stars and labels
     for i, (x, y, r, item) in enumerate(positions):
@@ -156,7 +213,7 @@ def _build_constellation_group(arm_idx, arm, color, positions, theme):
         # Glow halo
         parts.append(
             f'  <circle cx="{x:.1f}" cy="{y:.1f}" r="{r + 3:.1f}" fill="{color}" '
-            f'opacity="0.08" filter="url(#const-glow-{arm_idx})"/>'
+            f'opacity="0.08" filter="url(#{glow_filter})"/>'
         )
         # Star circle
         parts.append(
@@ -165,19 +222,25 @@ def _build_constellation_group(arm_idx, arm, color, positions, theme):
         )
         # White center for prominent stars
         if r > 4:
-            parts.append(
-                f'  <circle cx="{x:.1f}" cy="{y:.1f}" r="1.5" fill="#ffffff" opacity="0.9"/>'
-            )
+            parts.append(f'  {use(core_shape, x, y)}')
 
         # Label
-        label_y = y - r - 6
+        label_x, label_y, anchor = placer.place(item, 9, (
+            Candidate(x, y - r - 6),
+            Candidate(x, y + r + 10),
+            Candidate(x + r + 4, y + 3, "start"),
+            Candidate(x - r - 4, y + 3, "end"),
+        ))
         parts.append(
-            f'  <text x="{x:.1f}" y="{label_y:.1f}" fill="{theme["text_dim"]}" '
-            f'font-size="9" font-family="monospace" text-anchor="middle" '
+            f'  <text x="{label_x:.1f}" y="{label_y:.1f}" fill="{theme["text_dim"]}" '
+            f'font-size="9" font-family="monospace" text-anchor="{anchor}" '
             f'opacity="0" style="animation: const-label-in 0.5s ease {twinkle_delay + 0.5}s forwards">'
             f'{esc(item)}</text>'
         )
 
+    if more:
+        parts.extend(_build_more_cluster(cluster_x, cluster_y, more, color, theme, placer))
+
     return "\n".join(parts)
 
 
@@ -204,12 +267,56 @@ def _build_group_label(arm_idx, arm, color, zone_x, zone_w, theme):
     return "\n".join(parts)
 
 
-def render(galaxy_arms: list, theme: dict) -> str:
+# Document skeleton: static markup is compiled once at import time
+_SKELETON = Skeleton('''<svg xmlns="http://www.w3.org/2000/svg" width="$WIDTH" height="$HEIGHT" viewBox="0 0 $WIDTH $HEIGHT">
+  <defs>
+$defs_str
+  </defs>
+
+  <!-- Background -->
+  <rect x="0.5" y="0.5" width="$INNER_W" height="$INNER_H" rx="12" ry="12"
+        fill="$nebula" stroke="$star_dust" stroke-width="1"/>
+
+  <!-- Ambient star field -->
+$starfield_str
+
+  <!-- Title -->
+$title
+$status_dot
+$status_text
+
+  <!-- Zone dividers -->
+$dividers_str
+
+  <!-- Constellation groups -->
+$groups_str
+
+  <!-- Group labels -->
+$labels_str
+</svg>''',
+    WIDTH=WIDTH,
+    HEIGHT=HEIGHT,
+    INNER_W=WIDTH - 1,
+    INNER_H=HEIGHT - 1,
+)
+
+
+def render(
+    galaxy_arms: list,
+    theme: dict,
+    placement: str = "uniform",
+    links: str = "chain",
+    max_items_per_arm: int = 0,
+) -> str:
     """Render the skill constellation SVG.
 
     Args:
         galaxy_arms: list of arm configs with name, color, items
         theme: color palette dict
+        placement: starfield placement mode ("uniform" or "poisson")
+        links: how stars are joined ("chain" or "mst")
+        max_items_per_arm: star budget per arm (0 = unlimited); longer arms
+            show their first items plus a "+N more" cluster
     """
     arm_colors = resolve_arm_colors(galaxy_arms, theme)
     n_arms = len(galaxy_arms)
@@ -228,19 +335,35 @@ def render(galaxy_arms: list, theme: dict) -> str:
     zone_h = HEIGHT - 100  # 50px top for title, 50px bottom for labels
 
     # Build SVG layers
-    defs_str = _build_defs(arm_colors, theme)
-    starfield_str = _build_starfield(theme)
+    defs = DefsRegistry()
+    glow_filter, core_shape = _build_defs(defs, theme)
+    starfield_str, starfield_css = _build_starfield(theme, placement)
+    defs_str = defs.render() + "\n" + _STYLE + "\n" + starfield_css
+
+    # Star positions for every arm first, so labels can avoid all stars
+    zones = []
+    placer = LabelPlacer(bounds=(0, zone_y - 10, WIDTH, HEIGHT - 40))
+    for i, arm in enumerate(galaxy_arms):
+        zone_x = ZONE_PADDING + i * zone_w
+        items = arm.get("items", [])
+        more = 0
+        if max_items_per_arm and len(items) > max_items_per_arm:
+            # Keep the first items; the last slot becomes the "+N more" cluster
+            more = len(items) - (max_items_per_arm - 1)
+            items = items[:max_items_per_arm - 1] + [None]
+        positions = _compute_star_positions(items, zone_x, zone_y, zone_w, zone_h, i)
+        for x, y, r, _ in positions:
+            placer.block((x - r, y - r, x + r, y + r))
+        zones.append((zone_x, positions, more))
 
     # Build constellation groups
     groups = []
     labels = []
-    for i, arm in enumerate(galaxy_arms):
-        zone_x = ZONE_PADDING + i * zone_w
-        items = arm.get("items", [])
+    for i, (arm, (zone_x, positions, more)) in enumerate(zip(galaxy_arms, zones)):
         color = arm_colors[i]
-
-        positions = _compute_star_positions(items, zone_x, zone_y, zone_w, zone_h, i)
-        groups.append(_build_constellation_group(i, arm, color, positions, theme))
+        groups.append(_build_constellation_group(
+            i, arm, color, positions, theme, glow_filter, core_shape, placer, links, more
+        ))
         labels.append(_build_group_label(i, arm, color, zone_x, zone_w, theme))
 
     groups_str = "\n".join(groups)
@@ -274,29 +397,15 @@ def render(galaxy_arms: list, theme: dict) -> str:
         f'font-family="monospace" text-anchor="end" opacity="0.5">{total_skills} SKILLS MAPPED</text>'
     )
 
-    return f'''<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" viewBox="0 0 {WIDTH} {HEIGHT}">
-  <defs>
-{defs_str}
-  </defs>
-
-  <!-- Background -->
-  <rect x="0.5" y="0.5" width="{WIDTH - 1}" height="{HEIGHT - 1}" rx="12" ry="12"
-        fill="{theme['nebula']}" stroke="{theme['star_dust']}" stroke-width="1"/>
-
-  <!-- Ambient star field -->
-{starfield_str}
-
-  <!-- Title -->
-{title}
-{status_dot}
-{status_text}
-
-  <!-- Zone dividers -->
-{dividers_str}
-
-  <!-- Constellation groups -->
-{groups_str}
-
-  <!-- Group labels -->
-{labels_str}
-</svg>'''
+    return _SKELETON.render(
+        defs_str=defs_str,
+        nebula=theme["nebula"],
+        star_dust=theme["star_dust"],
+        starfield_str=starfield_str,
+        title=title,
+        status_dot=status_dot,
+        status_text=status_text,
+        dividers_str=dividers_str,
+        groups_str=groups_str,
+        labels_str=labels_str,
+    )
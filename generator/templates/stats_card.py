@@ -1,9 +1,45 @@
 """SVG template: Mission Telemetry stats card (850x180)."""
 
+from generator.defs import DefsRegistry
+from generator.skeleton import Skeleton
 from generator.utils import METRIC_ICONS, METRIC_LABELS, METRIC_COLORS, format_number
 
 WIDTH, HEIGHT = 850, 180
 
+# Document skeleton: static markup is compiled once at import time
+_SKELETON = Skeleton('''<svg xmlns="http://www.w3.org/2000/svg" width="$WIDTH" height="$HEIGHT" viewBox="0 0 $WIDTH $HEIGHT">
+  <defs>
+    <style>
+      .metric-icon {
+        animation: count-glow 4s ease-in-out infinite;
+      }
+      @keyframes count-glow {
+        0%, 100% { fill-opacity: 0.7; }
+        50% { fill-opacity: 1; }
+      }
+    </style>
+$defs_str
+  </defs>
+
+  <!-- Card background -->
+  <rect x="0.5" y="0.5" width="$INNER_W" height="$INNER_H" rx="12" ry="12"
+        fill="$nebula" stroke="$star_dust" stroke-width="1"/>
+
+  <!-- Section title -->
+  <text x="30" y="38" fill="$text_faint" font-size="11" font-family="monospace" letter-spacing="3">MISSION TELEMETRY</text>
+
+  <!-- Dividers -->
+$dividers_str
+
+  <!-- Metric cells -->
+$cells_str
+</svg>''',
+    WIDTH=WIDTH,
+    HEIGHT=HEIGHT,
+    INNER_W=WIDTH - 1,
+    INNER_H=HEIGHT - 1,
+)
+
 
 def render(stats: dict, metrics: list, theme: dict) -> str:
     """Render the stats card SVG.
@@ -15,6 +51,9 @@ def render(stats: dict, metrics: list, theme: dict) -> str:
     """
     cell_width = WIDTH / len(metrics)
 
+    defs = DefsRegistry()
+    num_glow = defs.blur_filter(3, region=30, prefix="num-glow")
+
     # Build metric cells
     cells = []
     dividers = []
@@ -32,7 +71,7 @@ def render(stats: dict, metrics: list, theme: dict) -> str:
           {icon_path}
         </svg>
       </g>
-      <text x="0" y="2" text-anchor="middle" fill="{icon_color}" font-size="28" font-weight="bold" font-family="sans-serif" opacity="0.35" filter="url(#num-glow)">{value}</text>
+      <text x="0" y="2" text-anchor="middle" fill="{icon_color}" font-size="28" font-weight="bold" font-family="sans-serif" opacity="0.35" filter="url(#{num_glow})">{value}</text>
       <text x="0" y="2" text-anchor="middle" fill="{theme['text_bright']}" font-size="28" font-weight="bold" font-family="sans-serif">{value}</text>
       <text x="0" y="24" text-anchor="middle" fill="{theme['text_faint']}" font-size="11" font-family="monospace" letter-spacing="1">{label}</text>
     </g>''')
@@ -48,32 +87,11 @@ def render(stats: dict, metrics: list, theme: dict) -> str:
     cells_str = "\n".join(cells)
     dividers_str = "\n".join(dividers)
 
-    return f'''<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" viewBox="0 0 {WIDTH} {HEIGHT}">
-  <defs>
-    <style>
-      .metric-icon {{
-        animation: count-glow 4s ease-in-out infinite;
-      }}
-      @keyframes count-glow {{
-        0%, 100% {{ fill-opacity: 0.7; }}
-        50% {{ fill-opacity: 1; }}
-      }}
-    </style>
-    <filter id="num-glow" x="-30%" y="-30%" width="160%" height="160%">
-      <feGaussianBlur stdDeviation="3"/>
-    </filter>
-  </defs>
-
-  <!-- Card background -->
-  <rect x="0.5" y="0.5" width="{WIDTH - 1}" height="{HEIGHT - 1}" rx="12" ry="12"
-        fill="{theme['nebula']}" stroke="{theme['star_dust']}" stroke-width="1"/>
-
-  <!-- Section title -->
-  <text x="30" y="38" fill="{theme['text_faint']}" font-size="11" font-family="monospace" letter-spacing="3">MISSION TELEMETRY</text>
-
-  <!-- Dividers -->
-{dividers_str}
-
-  <!-- Metric cells -->
-{cells_str}
-</svg>'''
+    return _SKELETON.render(
+        defs_str=defs.render(),
+        nebula=theme["nebula"],
+        star_dust=theme["star_dust"],
+        text_faint=theme["text_faint"],
+        dividers_str=dividers_str,
+        cells_str=cells_str,
+    )
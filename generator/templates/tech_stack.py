@@ -1,7 +1,7 @@
 """SVG template: Language Telemetry + Focus Sectors radar (dynamic height)."""
 
-import math
-
+from generator import geometry
+from generator.skeleton import Skeleton
 from generator.utils import calculate_language_percentages, esc, svg_arc_path, resolve_arm_colors
 
 WIDTH = 850
@@ -75,20 +75,17 @@ def _build_radar_sectors(sector_data, rcx, rcy, radius, theme):
     """
     parts = []
 
-    # Arc sectors (filled pie slices)
-    for sec in sector_data:
-        d = svg_arc_path(rcx, rcy, radius, sec["start_deg"], sec["end_deg"])
+    # Arc sectors (filled pie slices), all paths in one batch
+    spans = tuple((sec["start_deg"], sec["end_deg"]) for sec in sector_data)
+    for sec, d in zip(sector_data, geometry.arc_paths(rcx, rcy, radius, spans)):
         parts.append(
             f'    <path d="{d}" fill="{sec["color"]}" fill-opacity="0.10" '
             f'stroke="{sec["color"]}" stroke-opacity="0.3" stroke-width="0.5"/>'
         )
 
     # Sector boundary lines (radial lines at sector edges)
-    for i in range(len(sector_data)):
-        angle_deg = i * 120
-        angle_rad = math.radians(angle_deg - 90)
-        lx = rcx + radius * math.cos(angle_rad)
-        ly = rcy + radius * math.sin(angle_rad)
+    edges = geometry.polar_points(rcx, rcy, radius, [i * 120 for i in range(len(sector_data))])
+    for lx, ly in edges:
         parts.append(
             f'    <line x1="{rcx}" y1="{rcy}" x2="{lx:.1f}" y2="{ly:.1f}" '
             f'stroke="{theme["text_faint"]}" stroke-width="0.5" opacity="0.3"/>'
@@ -159,12 +156,9 @@ def _build_radar_labels_and_dots(sector_data, galaxy_arms, rcx, rcy, radius, the
     parts = []
 
     # Labels at outer edge of each sector midpoint
-    for sec in sector_data:
-        mid_deg = (sec["start_deg"] + sec["end_deg"]) / 2
-        mid_rad = math.radians(mid_deg - 90)
-        label_r = radius + 18
-        lx = rcx + label_r * math.cos(mid_rad)
-        ly = rcy + label_r * math.sin(mid_rad)
+    mids = [(sec["start_deg"] + sec["end_deg"]) / 2 for sec in sector_data]
+    label_points = geometry.polar_points(rcx, rcy, radius + 18, mids)
+    for sec, (lx, ly) in zip(sector_data, label_points):
 
         # Determine text-anchor based on position
         if abs(lx - rcx) < 5:
@@ -189,12 +183,13 @@ def _build_radar_labels_and_dots(sector_data, galaxy_arms, rcx, rcy, radius, the
 
     # Dots: one per item per sector, unconditional
     radii_cycle = [24, 40, 56]
+    edge_pad = 10  # degrees of padding from sector edges
+    dots = []  # (sector, angle, ring radius)
     for sec_i, sec in enumerate(sector_data):
         arm = galaxy_arms[sec_i]
         items = arm.get("items", [])
         item_count = len(items)
-        edge_pad = 10  # degrees of padding from sector edges
-        for j, item in enumerate(items):
+        for j in range(item_count):
             # Angular: evenly spread within sector with edge padding
             usable_start = sec["start_deg"] + edge_pad
             usable_end = sec["end_deg"] - edge_pad
@@ -202,24 +197,26 @@ def _build_radar_labels_and_dots(sector_data, galaxy_arms, rcx, rcy, radius, the
                 item_angle = (usable_start + usable_end) / 2
             else:
                 item_angle = usable_start + (usable_end - usable_start) * j / (item_count - 1)
-            item_rad = math.radians(item_angle - 90)
             # Radial: cycle through grid ring radii
-            dot_r = radii_cycle[j % 3]
-            dx = rcx + dot_r * math.cos(item_rad)
-            dy = rcy + dot_r * math.sin(item_rad)
-            # Timing: pulse fires when needle sweeps past this angle
-            pulse_begin = (item_angle / 360) * 8 - 0.3
-            if pulse_begin < 0:
-                pulse_begin += 8
-            parts.append(
-                f'    <circle cx="{dx:.1f}" cy="{dy:.1f}" r="3" '
-                f'fill="{sec["color"]}" opacity="0.35">'
-                f'\n      <animate attributeName="opacity" '
-                f'values="0.35;0.35;1.0;0.35;0.35" '
-                f'keyTimes="0;0.04;0.06;0.10;1" '
-                f'dur="8s" begin="{pulse_begin:.2f}s" repeatCount="indefinite"/>'
-                f'\n    </circle>'
-            )
+            dots.append((sec, item_angle, radii_cycle[j % 3]))
+
+    dot_points = geometry.polar_points(
+        rcx, rcy, [dot_r for _, _, dot_r in dots], [angle for _, angle, _ in dots]
+    )
+    for (sec, item_angle, _), (dx, dy) in zip(dots, dot_points):
+        # Timing: pulse fires when needle sweeps past this angle
+        pulse_begin = (item_angle / 360) * 8 - 0.3
+        if pulse_begin < 0:
+            pulse_begin += 8
+        parts.append(
+            f'    <circle cx="{dx:.1f}" cy="{dy:.1f}" r="3" '
+            f'fill="{sec["color"]}" opacity="0.35">'
+            f'\n      <animate attributeName="opacity" '
+            f'values="0.35;0.35;1.0;0.35;0.35" '
+            f'keyTimes="0;0.04;0.06;0.10;1" '
+            f'dur="8s" begin="{pulse_begin:.2f}s" repeatCount="indefinite"/>'
+            f'\n    </circle>'
+        )
 
     return "\n".join(parts)
 
@@ -283,6 +280,34 @@ def _build_stack_manifest(galaxy_arms, arm_colors, theme, start_y, card_width):
     return "\n".join(parts), y + 5
 
 
+# Document skeleton: static markup is compiled once at import time
+_SKELETON = Skeleton('''<svg xmlns="http://www.w3.org/2000/svg" width="$WIDTH" height="$height" viewBox="0 0 $WIDTH $height">
+  <defs/>
+
+  <!-- Card background -->
+  <rect x="0.5" y="0.5" width="$INNER_W" height="$inner_h" rx="12" ry="12"
+        fill="$nebula" stroke="$star_dust" stroke-width="1"/>
+
+  <!-- Left: Language Telemetry -->
+  <text x="30" y="38" fill="$text_faint" font-size="11" font-family="monospace" letter-spacing="3">LANGUAGE TELEMETRY</text>
+
+  <!-- Vertical divider -->
+  <line x1="425" y1="25" x2="425" y2="$divider_end_y" stroke="$star_dust" stroke-width="1" opacity="0.4"/>
+
+  <!-- Right: Focus Sectors -->
+  <text x="460" y="38" fill="$text_faint" font-size="11" font-family="monospace" letter-spacing="3">FOCUS SECTORS</text>
+
+$bars_str
+
+$radar_str
+
+$manifest_str
+</svg>''',
+    WIDTH=WIDTH,
+    INNER_W=WIDTH - 1,
+)
+
+
 def render(
     languages: dict,
     galaxy_arms: list,
@@ -352,25 +377,14 @@ def render(
     height = max(200, manifest_end_y + 15)
     divider_end_y = main_content_height - 15
 
-    return f'''<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{height}" viewBox="0 0 {WIDTH} {height}">
-  <defs/>
-
-  <!-- Card background -->
-  <rect x="0.5" y="0.5" width="{WIDTH - 1}" height="{height - 1}" rx="12" ry="12"
-        fill="{theme['nebula']}" stroke="{theme['star_dust']}" stroke-width="1"/>
-
-  <!-- Left: Language Telemetry -->
-  <text x="30" y="38" fill="{theme['text_faint']}" font-size="11" font-family="monospace" letter-spacing="3">LANGUAGE TELEMETRY</text>
-
-  <!-- Vertical divider -->
-  <line x1="425" y1="25" x2="425" y2="{divider_end_y}" stroke="{theme['star_dust']}" stroke-width="1" opacity="0.4"/>
-
-  <!-- Right: Focus Sectors -->
-  <text x="460" y="38" fill="{theme['text_faint']}" font-size="11" font-family="monospace" letter-spacing="3">FOCUS SECTORS</text>
-
-{bars_str}
-
-{radar_str}
-
-{manifest_str}
-</svg>'''
+    return _SKELETON.render(
+        height=height,
+        inner_h=height - 1,
+        nebula=theme["nebula"],
+        star_dust=theme["star_dust"],
+        text_faint=theme["text_faint"],
+        divider_end_y=divider_end_y,
+        bars_str=bars_str,
+        radar_str=radar_str,
+        manifest_str=manifest_str,
+    )
@@ -0,0 +1,83 @@
+"""In-memory LRU cache whose entries expire individually.
+
+Used by serve mode for fetched datasets and rendered cards: each entry is
+stored with its own time-to-live, so stats, languages and contributions
+can age at different rates in one cache.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+DEFAULT_MAXSIZE = 1024
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    expires: float  # clock time after which the entry is stale
+
+
+class TTLCache:
+    """Thread-safe LRU of entries with per-entry expiry.
+
+    Args:
+        maxsize: entries kept before the least recently used is evicted
+        clock: monotonic time source (seconds), replaceable in tests
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the fresh value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            self.misses += 1
+            return None
+
+    def entry(self, key):
+        """Return the CacheEntry for key even if expired (None if missing); not counted."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, ttl: float):
+        """Store value for ttl seconds."""
+        with self._lock:
+            self._entries[key] = CacheEntry(value, self.clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        """Remove key if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard(self, predicate):
+        """Remove every key for which predicate(key) is true."""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
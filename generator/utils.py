@@ -1,12 +1,31 @@
 """Utility functions, color maps, math helpers, and SVG icon paths."""
 
 import re
-import math
 import hashlib
+import struct
 from xml.sax.saxutils import escape as xml_escape
 
+from generator import geometry
+
+try:
+    import numpy as np
+except ImportError:  # optional: only deterministic_array needs it
+    np = None
+
 HEX_COLOR_RE = re.compile(r"^#[0-9a-fA-F]{6}$")
 
+# Private-use characters delimiting color tokens in theme-independent layouts
+# (see generator.paint); user text is escaped so it can never contain them.
+PAINT_OPEN = "\ue000"
+PAINT_CLOSE = "\ue001"
+
+_ESC_ENTITIES = {
+    '"': "&quot;",
+    "'": "&apos;",
+    PAINT_OPEN: "&#xe000;",
+    PAINT_CLOSE: "&#xe001;",
+}
+
 # Default deep-space theme palette
 DEFAULT_THEME = {
     "void": "#080c14",
@@ -18,14 +37,63 @@ DEFAULT_THEME = {
     "text_bright": "#f1f5f9",
     "text_dim": "#94a3b8",
     "text_faint": "#64748b",
+    "starlight": "#ffffff",
+}
+
+# Daylight palette for light-mode README variants
+LIGHT_THEME = {
+    "void": "#ffffff",
+    "nebula": "#f6f8fa",
+    "star_dust": "#d0d7de",
+    "synapse_cyan": "#0969da",
+    "dendrite_violet": "#8250df",
+    "axon_amber": "#bf8700",
+    "text_bright": "#1f2328",
+    "text_dim": "#59636e",
+    "text_faint": "#818b98",
+    "starlight": "#57606a",
+}
+
+# Built-in palettes selectable with `generate --themes`
+THEME_PRESETS = {
+    "dark": DEFAULT_THEME,
+    "light": LIGHT_THEME,
 }
 
+# Background star placement modes (config: starfield.placement)
+PLACEMENTS = ("uniform", "poisson")
+
+# How skill constellation stars are joined (config: constellation.links):
+# "chain" links them in list order, "mst" by a minimum spanning tree
+# (readable even with hundreds of skills)
+LINK_MODES = ("chain", "mst")
+
 
 def resolve_theme(user_theme: dict) -> dict:
     """Merge user theme overrides with defaults, returning a complete theme dict."""
     return {**DEFAULT_THEME, **(user_theme or {})}
 
 
+def resolve_named_theme(name: str, config: dict) -> dict:
+    """Return the complete palette for a theme variant name.
+
+    "dark" is the config's own ``theme``; other names start from their
+    built-in preset (or the default palette) and apply ``themes.<name>``
+    overrides from the config.
+
+    Raises:
+        KeyError: if the name is neither a preset nor defined under ``themes``
+    """
+    overrides = config.get("themes", {})
+    if name not in THEME_PRESETS and name not in overrides:
+        raise KeyError(name)
+    if name == "dark":
+        base = config["theme"]
+    else:
+        base = THEME_PRESETS.get(name, DEFAULT_THEME)
+    return {**base, **overrides.get(name, {})}
+
+
 def resolve_arm_colors(galaxy_arms: list, theme: dict) -> list:
     """Return a list of hex color strings, one per arm, resolved from the theme."""
     fallback = theme.get("synapse_cyan", "#00d4ff")
@@ -119,12 +187,33 @@ REPO_ICON = (
     '1.087a.25.25 0 0 0-.3 0L5.4 15.7a.25.25 0 0 1-.4-.2z"/>'
 )
 
+FLAME_ICON = (
+    '<path d="M8 0c.9 2.2 4.5 4.6 4.5 9.5a4.5 4.5 0 0 1-9 0c0-2 1-3.4 2-4.3'
+    '-.1 1.6.6 2.8 1.7 3.3C7.4 5.7 7.2 2.4 8 0z"/>'
+)
+
+TROPHY_ICON = (
+    '<path d="M4 1h8v1.5h2.5V5a3 3 0 0 1-2.7 3A4 4 0 0 1 9 10.4v2.1h2.5V15h-7'
+    'v-2.5H7v-2.1A4 4 0 0 1 4.2 8 3 3 0 0 1 1.5 5V2.5H4zm0 3H3v1a1.5 1.5 0 0 0 '
+    '1 1.4zm8 0v2.4A1.5 1.5 0 0 0 13 5V4z"/>'
+)
+
+CALENDAR_ICON = (
+    '<path d="M4.75 0a.75.75 0 0 1 .75.75V2h5V.75a.75.75 0 0 1 1.5 0V2h1.25'
+    'c.97 0 1.75.78 1.75 1.75v10.5A1.75 1.75 0 0 1 13.25 16H2.75A1.75 1.75 0 0 '
+    '1 1 14.25V3.75C1 2.78 1.78 2 2.75 2H4V.75A.75.75 0 0 1 4.75 0zM2.5 7.5v6.75'
+    'c0 .14.11.25.25.25h10.5a.25.25 0 0 0 .25-.25V7.5z"/>'
+)
+
 METRIC_ICONS = {
     "commits": COMMIT_ICON,
     "stars": STAR_ICON,
     "prs": PR_ICON,
     "issues": ISSUE_ICON,
     "repos": REPO_ICON,
+    "streak": FLAME_ICON,
+    "longest_streak": TROPHY_ICON,
+    "last_30d": CALENDAR_ICON,
 }
 
 METRIC_LABELS = {
@@ -133,6 +222,9 @@ METRIC_LABELS = {
     "prs": "PRs",
     "issues": "Issues",
     "repos": "Repos",
+    "streak": "Streak",
+    "longest_streak": "Best Streak",
+    "last_30d": "Last 30d",
 }
 
 METRIC_COLORS = {
@@ -141,6 +233,9 @@ METRIC_COLORS = {
     "prs": "dendrite_violet",
     "issues": "synapse_cyan",
     "repos": "dendrite_violet",
+    "streak": "axon_amber",
+    "longest_streak": "dendrite_violet",
+    "last_30d": "synapse_cyan",
 }
 
 
@@ -234,42 +329,72 @@ def spiral_points(
     Returns:
         list of (x, y) tuples
     """
-    points = []
-    for i in range(num_points):
-        t = i / max(num_points - 1, 1)
-        angle = math.radians(start_angle) + t * turns * 2 * math.pi
-        r = t * max_radius
-        x = cx + r * math.cos(angle) * x_scale
-        y = cy + r * math.sin(angle) * y_scale
-        points.append((x, y))
-    return points
-
-
-def deterministic_random(seed_str: str, count: int, min_val: float, max_val: float) -> list:
+    arms = geometry.spirals(cx, cy, (start_angle,), num_points, max_radius, turns, x_scale, y_scale)
+    return list(arms[0])
+
+
+def _random_words(seed_str: str, count: int, compat: bool) -> bytes:
+    """Return count big-endian 32-bit words derived from seed_str.
+
+    compat hashes ``"<seed>_<i>"`` once per value and keeps the first word;
+    otherwise each ``"<seed>#<block>"`` digest yields four words.
+    """
+    if compat:
+        # Hash the shared prefix once and only feed each index
+        prefix = hashlib.md5(f"{seed_str}_".encode())
+        words = []
+        for i in range(count):
+            h = prefix.copy()
+            h.update(str(i).encode())
+            words.append(h.digest()[:4])
+        return b"".join(words)
+    blocks = (count + 3) // 4
+    prefix = hashlib.md5(f"{seed_str}#".encode())
+    digests = []
+    for block in range(blocks):
+        h = prefix.copy()
+        h.update(str(block).encode())
+        digests.append(h.digest())
+    return b"".join(digests)[:count * 4]
+
+
+def deterministic_random(
+    seed_str: str, count: int, min_val: float, max_val: float, compat: bool = True
+) -> list:
     """Generate deterministic pseudo-random values from a seed string.
 
     Uses hash-based approach for reproducible star field positions.
+
+    Args:
+        compat: reproduce the original one-digest-per-value stream, so
+            existing layouts don't move. False uses every 32-bit lane of
+            each digest (about 4x fewer hashes) and gives different values.
+    """
+    count = max(count, 0)
+    raw = _random_words(seed_str, count, compat)
+    span = max_val - min_val
+    return [min_val + (w / 0xFFFFFFFF) * span for w in struct.unpack(f">{count}I", raw)]
+
+
+def deterministic_array(
+    seed_str: str, count: int, min_val: float, max_val: float, compat: bool = True
+):
+    """NumPy version of deterministic_random, returning a float64 array.
+
+    Values are identical to deterministic_random with the same arguments.
+    Requires numpy (optional dependency).
     """
-    values = []
-    for i in range(count):
-        h = hashlib.md5(f"{seed_str}_{i}".encode()).hexdigest()
-        normalized = int(h[:8], 16) / 0xFFFFFFFF
-        values.append(min_val + normalized * (max_val - min_val))
-    return values
+    if np is None:
+        raise ImportError("deterministic_array requires numpy (pip install numpy)")
+    words = np.frombuffer(_random_words(seed_str, count, compat), dtype=">u4")
+    return min_val + (words / 0xFFFFFFFF) * (max_val - min_val)
 
 
 def esc(text: str) -> str:
     """Escape text for safe embedding in SVG/XML."""
-    return xml_escape(str(text), entities={'"': "&quot;", "'": "&apos;"})
+    return xml_escape(str(text), entities=_ESC_ENTITIES)
 
 
 def svg_arc_path(cx, cy, r, start_deg, end_deg):
     """Generate SVG path 'd' attribute for a filled arc sector (pie slice)."""
-    start_rad = math.radians(start_deg - 90)  # -90 to start from top
-    end_rad = math.radians(end_deg - 90)
-    x1 = cx + r * math.cos(start_rad)
-    y1 = cy + r * math.sin(start_rad)
-    x2 = cx + r * math.cos(end_rad)
-    y2 = cy + r * math.sin(end_rad)
-    large_arc = 1 if (end_deg - start_deg) > 180 else 0
-    return f"M {cx} {cy} L {x1:.1f} {y1:.1f} A {r} {r} 0 {large_arc} 1 {x2:.1f} {y2:.1f} Z"
+    return geometry.arc_paths(cx, cy, r, ((start_deg, end_deg),))[0]
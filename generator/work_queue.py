@@ -0,0 +1,200 @@
+"""Persistent work queue for batch runs (SQLite).
+
+Each roster user is a row that moves through:
+
+    pending -> fetched -> rendered
+       \\          \\
+        +----------+--> failed
+
+``fetched`` rows keep the fetched profile data, so a resumed run renders
+them without spending API calls again. Transient failures (network errors,
+5xx, rate limits) go back to their previous state with an exponential
+backoff until ``max_attempts`` is reached; anything else fails at once.
+
+A new run resets every row to ``pending`` except users rendered from fresh
+data (fetched less than ``fresh_for`` seconds ago) with an unchanged config
+digest. ``resume`` keeps the states of users whose digest is unchanged,
+renders users whose config changed again from their stored data, and adds
+users that are new to the roster.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from generator.sources import ProfileData, decode_profile, encode_profile
+
+STATES = ("pending", "fetched", "rendered", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    digest TEXT NOT NULL DEFAULT '',
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    data TEXT,
+    fetched_at REAL,
+    rendered_at REAL
+)
+"""
+
+
+class WorkQueue:
+    """SQLite-backed per-user state for a batch run (safe to share across threads).
+
+    Args:
+        path: database file (":memory:" for a throwaway queue)
+        max_attempts: tries per user before a transient failure is final
+        backoff: delay before the first retry, in seconds; doubles per attempt
+        max_backoff: upper bound for the retry delay
+        clock: time source (seconds), replaceable in tests
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3, backoff: float = 2.0,
+                 max_backoff: float = 300.0, clock=time.time):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def _write(self, sql: str, params=()):
+        with self._lock, self._db:
+            self._db.execute(sql, params)
+
+    def _read(self, sql: str, params=()) -> list:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def enqueue(self, digests: dict, resume: bool = False, fresh_for: float = 0.0) -> dict:
+        """Load the roster into the queue.
+
+        Args:
+            digests: username -> digest of everything that shapes its output
+                (config and render options), in roster order
+            resume: keep the states of a previous run instead of resetting them
+                (users whose digest changed are rendered or attempted again)
+            fresh_for: on a new run, skip users rendered from data fetched
+                less than this many seconds ago (0 disables)
+
+        Returns:
+            counts per state after loading
+        """
+        now = self.clock()
+        with self._lock, self._db:
+            known = {
+                name: (state, digest, fetched_at)
+                for name, state, digest, fetched_at in self._db.execute(
+                    "SELECT name, state, digest, fetched_at FROM users"
+                )
+            }
+            self._db.executemany(
+                "DELETE FROM users WHERE name = ?",
+                [(name,) for name in known if name not in digests],
+            )
+            for position, (name, digest) in enumerate(digests.items()):
+                if name not in known:
+                    self._db.execute(
+                        "INSERT INTO users (name, position, digest) VALUES (?, ?, ?)",
+                        (name, position, digest),
+                    )
+                    continue
+                state, old_digest, fetched_at = known[name]
+                fresh = fresh_for > 0 and fetched_at is not None and now - fetched_at < fresh_for
+                if digest == old_digest and (resume or (fresh and state == "rendered")):
+                    self._db.execute("UPDATE users SET position = ? WHERE name = ?", (position, name))
+                elif (resume or fresh) and state in ("fetched", "rendered"):
+                    # The output changed but the data is still usable: render again without refetching
+                    self._db.execute(
+                        "UPDATE users SET position = ?, digest = ?, state = 'fetched', "
+                        "attempts = 0, next_attempt = 0, error = NULL WHERE name = ?",
+                        (position, digest, name),
+                    )
+                else:
+                    self._db.execute(
+                        "UPDATE users SET position = ?, digest = ?, state = 'pending', attempts = 0, "
+                        "next_attempt = 0, error = NULL, data = NULL, fetched_at = NULL WHERE name = ?",
+                        (position, digest, name),
+                    )
+        return self.counts()
+
+    def ready(self) -> list:
+        """Names due for work now (pending or fetched, backoff elapsed), in roster order."""
+        rows = self._read(
+            "SELECT name FROM users WHERE state IN ('pending', 'fetched') AND next_attempt <= ? "
+            "ORDER BY position",
+            (self.clock(),),
+        )
+        return [name for (name,) in rows]
+
+    def next_retry(self):
+        """Seconds until the next backed-off user is due, or None when no work is left."""
+        rows = self._read("SELECT MIN(next_attempt) FROM users WHERE state IN ('pending', 'fetched')")
+        if rows[0][0] is None:
+            return None
+        return max(rows[0][0] - self.clock(), 0.0)
+
+    def state(self, name: str) -> tuple:
+        """(state, attempts, error) of a user."""
+        rows = self._read("SELECT state, attempts, error FROM users WHERE name = ?", (name,))
+        return rows[0] if rows else None
+
+    def counts(self) -> dict:
+        """Number of users per state."""
+        counts = dict.fromkeys(STATES, 0)
+        counts.update(self._read("SELECT state, COUNT(*) FROM users GROUP BY state"))
+        return counts
+
+    def load_data(self, name: str):
+        """Stored ProfileData of a user, or None if it must be fetched."""
+        rows = self._read("SELECT data FROM users WHERE name = ?", (name,))
+        if not rows or rows[0][0] is None:
+            return None
+        return decode_profile(json.loads(rows[0][0]))
+
+    def mark_fetched(self, name: str, data: ProfileData):
+        self._write(
+            "UPDATE users SET state = 'fetched', data = ?, fetched_at = ?, error = NULL WHERE name = ?",
+            (json.dumps(encode_profile(data)), self.clock(), name),
+        )
+
+    def mark_rendered(self, name: str):
+        self._write(
+            "UPDATE users SET state = 'rendered', rendered_at = ?, error = NULL WHERE name = ?",
+            (self.clock(), name),
+        )
+
+    def mark_failed(self, name: str, error: str, transient: bool = False) -> bool:
+        """Record a failure; transient ones are retried with backoff.
+
+        Returns:
+            True if the user will be retried, False if it is now failed
+        """
+        with self._lock, self._db:
+            (attempts,) = self._db.execute(
+                "SELECT attempts FROM users WHERE name = ?", (name,)
+            ).fetchone()
+            attempts += 1
+            if transient and attempts < self.max_attempts:
+                delay = min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+                self._db.execute(
+                    "UPDATE users SET attempts = ?, next_attempt = ?, error = ? WHERE name = ?",
+                    (attempts, self.clock() + delay, error, name),
+                )
+                return True
+            self._db.execute(
+                "UPDATE users SET state = 'failed', attempts = ?, error = ? WHERE name = ?",
+                (attempts, error, name),
+            )
+            return False
@@ -3,9 +3,10 @@
 import copy
 
 import pytest
+import requests
 
 from generator.config import validate_config
-from generator.main import _generate_demo_contributions
+from generator.sources import DemoSource, demo_contributions
 from generator.svg_builder import SVGBuilder
 
 
@@ -82,7 +83,7 @@ def sample_languages():
 @pytest.fixture
 def sample_contributions():
     """Synthetic contribution calendar data."""
-    return _generate_demo_contributions()
+    return demo_contributions()
 
 
 @pytest.fixture
@@ -96,3 +97,43 @@ def svg_builder(sample_config, sample_stats, sample_languages, sample_contributi
     """Create an SVGBuilder from validated sample fixtures."""
     config = validate_config(copy.deepcopy(sample_config))
     return SVGBuilder(config, sample_stats, sample_languages, sample_contributions)
+
+
+class Clock:
+    """Manually advanced time source for cache and queue tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingSource(DemoSource):
+    """DemoSource recording every fetch_dataset() call; set `down` to fail them."""
+
+    def __init__(self):
+        self.calls = []
+        self.down = False
+
+    def fetch_dataset(self, username, dataset):
+        self.calls.append((username, dataset))
+        if self.down:
+            raise requests.exceptions.ConnectionError("unreachable")
+        return super().fetch_dataset(username, dataset)
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def make_source():
+    """Factory of CountingSource instances (one per simulated worker)."""
+    return CountingSource
+
+
+@pytest.fixture
+def source(make_source):
+    return make_source()
@@ -0,0 +1,38 @@
+"""Tests for generator.anim_classes."""
+
+from generator.anim_classes import AnimationClasses, quantize
+
+
+class TestQuantize:
+    def test_rounds_half_up(self):
+        assert quantize(0.15, 0.1) == 0.2
+        assert quantize(0.14, 0.1) == 0.1
+
+    def test_never_below_one_step(self):
+        assert quantize(0.01, 0.1) == 0.1
+
+
+class TestAnimationClasses:
+    def test_similar_params_share_class(self):
+        anim = AnimationClasses("t")
+        assert anim.twinkle(0.11, 0.33, 5.1) == anim.twinkle(0.09, 0.31, 5.8)
+        assert len(anim) == 1
+
+    def test_durations_share_keyframes(self):
+        anim = AnimationClasses("t")
+        anim.twinkle(0.1, 0.3, 4.0)
+        anim.twinkle(0.1, 0.3, 8.0)
+        css = anim.render()
+        assert len(anim) == 2
+        assert css.count("@keyframes") == 1
+
+    def test_render_empty(self):
+        assert AnimationClasses("t").render() == ""
+
+    def test_render_css(self):
+        anim = AnimationClasses("t")
+        name = anim.twinkle(0.1, 0.3, 6.0)
+        css = anim.render()
+        assert name == "t-tw-10-30-6"
+        assert f".{name} {{ animation: t-tw-10-30 6s linear infinite; }}" in css
+        assert "50% { opacity: 0.3; }" in css
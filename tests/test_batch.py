@@ -0,0 +1,161 @@
+"""Tests for generator.batch."""
+
+import json
+
+import pytest
+import requests
+import yaml
+
+from generator.batch import BatchOptions, RosterEntry, load_roster, run_batch
+from generator.config import ConfigError, validate_config
+from generator.sources import DemoSource
+from generator.svg_builder import CARDS, SVGBuilder
+from generator.work_queue import WorkQueue
+
+
+class FailingSource(DemoSource):
+    """Demo data for everyone except the users in `down`."""
+
+    def __init__(self, down):
+        self.down = set(down)
+
+    def fetch(self, username, strict=False):
+        if username in self.down:
+            raise requests.exceptions.ConnectionError("API unreachable")
+        return super().fetch(username, strict)
+
+
+def _entry(cfg, username):
+    return RosterEntry(username, {**cfg, "username": username})
+
+
+class TestLoadRoster:
+    def test_file_with_base_and_overrides(self, tmp_path, sample_config):
+        (tmp_path / "base.yml").write_text(yaml.safe_dump(sample_config))
+        roster = tmp_path / "roster.yml"
+        roster.write_text(yaml.safe_dump({
+            "base": "base.yml",
+            "users": ["alice", {"username": "bob", "profile": {"name": "Bob"}}],
+        }))
+        alice, bob = load_roster(str(roster))
+        assert alice.name == "alice" and alice.config["username"] == "alice"
+        assert alice.config["profile"]["name"] == sample_config["profile"]["name"]
+        assert bob.config["profile"]["name"] == "Bob"
+        # Deep merge keeps the base's other profile fields
+        assert bob.config["profile"]["tagline"] == sample_config["profile"]["tagline"]
+
+    def test_directory_of_configs(self, tmp_path, sample_config):
+        for name in ("carol", "dave"):
+            (tmp_path / f"{name}.yml").write_text(yaml.safe_dump({**sample_config, "username": name}))
+        (tmp_path / "notes.txt").write_text("ignored")
+        assert [e.name for e in load_roster(str(tmp_path))] == ["carol", "dave"]
+
+    def test_malformed_roster_rejected(self, tmp_path):
+        roster = tmp_path / "roster.yml"
+        roster.write_text(yaml.safe_dump({"users": [{"profile": {}}]}))
+        with pytest.raises(ConfigError, match="username"):
+            load_roster(str(roster))
+
+
+class TestRunBatch:
+    def test_renders_each_user_into_own_directory(self, tmp_path, cfg, sample_stats,
+                                                  sample_languages, sample_contributions):
+        entries = [_entry(cfg, "alice"), _entry(cfg, "bob")]
+        results = run_batch(entries, DemoSource(), str(tmp_path), workers=2)
+
+        assert [r["user"] for r in results] == ["alice", "bob"]
+        assert all(r["ok"] and r["files"] == len(CARDS) for r in results)
+        config = validate_config({**cfg, "username": "bob"})
+        expected = SVGBuilder(config, sample_stats, sample_languages, sample_contributions).render_all()
+        for filename, svg in expected.items():
+            assert (tmp_path / "bob" / filename).read_text() == svg
+
+    def test_failures_are_isolated(self, tmp_path, cfg):
+        bad_config = {**cfg, "username": "broken", "galaxy_arms": []}
+        entries = [_entry(cfg, "alice"), RosterEntry("broken", bad_config), _entry(cfg, "offline")]
+        results = run_batch(entries, FailingSource({"offline"}), str(tmp_path))
+
+        status = {r["user"]: r for r in results}
+        assert status["alice"]["ok"]
+        assert not status["broken"]["ok"] and "ConfigError" in status["broken"]["error"]
+        assert not status["offline"]["ok"] and "API unreachable" in status["offline"]["error"]
+        assert not (tmp_path / "offline").exists()
+        assert json.loads((tmp_path / "summary.json").read_text()) == results
+
+    def test_render_errors_are_isolated(self, tmp_path, cfg):
+        class MalformedSource(DemoSource):
+            def fetch(self, username, strict=False):
+                data = super().fetch(username, strict)
+                return data._replace(stats=None) if username == "bob" else data
+
+        entries = [_entry(cfg, "alice"), _entry(cfg, "bob")]
+        results = run_batch(entries, MalformedSource(), str(tmp_path))
+        assert [r["ok"] for r in results] == [True, False]
+        assert "Error" in results[1]["error"]
+        assert (tmp_path / "summary.json").exists()
+
+    def test_theme_variants_and_bundle(self, tmp_path, cfg):
+        options = BatchOptions(themes=("dark", "light"), bundle=True)
+        (result,) = run_batch([_entry(cfg, "alice")], DemoSource(), str(tmp_path), options)
+        assert result["ok"]
+        assert sorted(p.name for p in (tmp_path / "alice").iterdir()) == [
+            "bundle-dark.svg", "bundle-light.svg",
+        ]
+
+    def test_unsafe_username_rejected(self, tmp_path, cfg):
+        (result,) = run_batch([_entry(cfg, "../escape")], DemoSource(), str(tmp_path / "out"))
+        assert not result["ok"]
+        assert not (tmp_path / "escape").exists()
+
+    def test_duplicate_entries_rendered_once(self, tmp_path, cfg):
+        results = run_batch([_entry(cfg, "alice")] * 2, DemoSource(), str(tmp_path))
+        assert len(results) == 1
+
+
+class TestQueuedBatch:
+    def test_transient_failure_retried(self, tmp_path, cfg):
+        class FlakySource(DemoSource):
+            calls = 0
+
+            def fetch(self, username, strict=False):
+                self.calls += 1
+                if self.calls == 1:
+                    raise requests.exceptions.Timeout("slow")
+                return super().fetch(username, strict)
+
+        queue = WorkQueue(":memory:", backoff=0)
+        (result,) = run_batch([_entry(cfg, "alice")], FlakySource(), str(tmp_path), queue=queue)
+        assert result["ok"] and result["attempts"] == 2
+
+    def test_render_error_is_a_permanent_failure(self, tmp_path, cfg):
+        class MalformedSource(DemoSource):
+            def fetch(self, username, strict=False):
+                return super().fetch(username, strict)._replace(languages=None)
+
+        queue = WorkQueue(":memory:", backoff=0)
+        (result,) = run_batch([_entry(cfg, "alice")], MalformedSource(), str(tmp_path), queue=queue)
+        assert not result["ok"] and result["attempts"] == 1
+        assert queue.state("alice")[0] == "failed"
+
+    def test_resume_skips_finished_users_without_refetching(self, tmp_path, cfg):
+        path = str(tmp_path / "queue.sqlite")
+        entries = [_entry(cfg, "alice"), _entry(cfg, "offline")]
+        queue = WorkQueue(path, max_attempts=1)
+        run_batch(entries, FailingSource({"offline"}), str(tmp_path), queue=queue)
+        queue.close()
+
+        # Resumed: alice is already rendered, offline has failed for good
+        queue = WorkQueue(path)
+        results = run_batch(entries, FailingSource({"alice", "offline"}), str(tmp_path),
+                            queue=queue, resume=True)
+        assert [(r["user"], r["ok"], r["skipped"]) for r in results] == [
+            ("alice", True, True), ("offline", False, True),
+        ]
+
+    def test_fresh_users_skipped_on_new_run(self, tmp_path, cfg):
+        queue = WorkQueue(":memory:")
+        entries = [_entry(cfg, "alice")]
+        run_batch(entries, DemoSource(), str(tmp_path), queue=queue)
+        (result,) = run_batch(entries, FailingSource({"alice"}), str(tmp_path), queue=queue,
+                              fresh_for=3600)
+        assert result["ok"] and result["skipped"]
@@ -0,0 +1,65 @@
+"""Tests for generator.bench."""
+
+import os
+import threading
+
+import pytest
+
+from generator import fragment_cache
+from generator.bench import bench_render, bench_serve
+from generator.config import validate_config
+from generator.server import ProfileService, make_server
+from generator.sources import DemoSource
+from generator.svg_builder import CARDS
+
+
+class TestBenchRender:
+    def test_reports_every_card(self):
+        results = bench_render(iterations=1)
+        assert [row["card"] for row in results] == list(CARDS)
+        assert all(row["mean_ms"] >= 0 and row["size"] > 0 for row in results)
+
+    def test_restores_fragment_cache(self):
+        previous = fragment_cache.get_cache()
+        bench_render(iterations=1)
+        assert fragment_cache.get_cache() is previous
+
+
+class TestBenchServe:
+    def test_in_process(self):
+        result = bench_serve(users=5, concurrency=2, duration=0.3, cards=["stats-card"], latency=0)
+        assert result["requests"] > 0 and result["errors"] == 0
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+        assert 0 < result["render_hit_ratio"] <= 1
+        assert result["rss_end_mb"] > 0
+
+    def test_remote_server(self, cfg):
+        server = make_server(ProfileService(validate_config(cfg), DemoSource()), "127.0.0.1", 0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            result = bench_serve(users=3, concurrency=2, duration=0.3, themes=["light"], url=url)
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert result["requests"] > 0 and result["errors"] == 0
+        assert result["data_hit_ratio"] > 0
+        assert result["rss_start_mb"] is None
+
+    def test_unknown_card(self):
+        with pytest.raises(ValueError, match="bogus"):
+            bench_serve(cards=["bogus"])
+
+    def test_refresh_and_disk_cache(self, tmp_path):
+        path = str(tmp_path / "bench.sqlite")
+        result = bench_serve(users=3, concurrency=2, duration=0.3, cards=["stats-card"], latency=0,
+                             disk_cache=path)
+        assert result["requests"] > 0 and result["errors"] == 0
+        assert (tmp_path / "bench.sqlite").exists()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork()")
+    def test_workers(self):
+        result = bench_serve(users=3, concurrency=2, duration=0.5, cards=["stats-card"], latency=0,
+                             workers=2, refresh=False)
+        assert result["requests"] > 0 and result["errors"] == 0
+        assert result["rss_end_mb"] > 0
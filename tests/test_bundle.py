@@ -0,0 +1,56 @@
+"""Tests for generator.bundle."""
+
+import re
+import xml.dom.minidom
+
+from generator.bundle import build_bundle
+
+CARD_A = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="850" height="100" viewBox="0 0 850 100">\n'
+    '  <defs>\n'
+    '    <filter id="glow"><feGaussianBlur stdDeviation="2"/></filter>\n'
+    '    <style>.a { opacity: 1; }</style>\n'
+    '  </defs>\n'
+    '  <rect width="10" height="10" filter="url(#glow)"/>\n'
+    '</svg>'
+)
+CARD_B = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="850" height="50" viewBox="0 0 850 50">\n'
+    '  <defs>\n'
+    '    <filter id="glow"><feGaussianBlur stdDeviation="5"/></filter>\n'
+    '  </defs>\n'
+    '  <circle r="3" filter="url(#glow)"/>\n'
+    '</svg>'
+)
+
+
+def _references(svg):
+    return set(re.findall(r"url\(#([^)]+)\)", svg)) | set(re.findall(r'href="#([^"]+)"', svg))
+
+
+class TestBuildBundle:
+    def test_one_view_per_card(self):
+        svg = build_bundle({"a": CARD_A, "b": CARD_B})
+        assert '<view id="a" viewBox="0 0 850 100"/>' in svg
+        assert '<view id="b" viewBox="0 100 850 50"/>' in svg
+        assert 'height="150"' in svg
+
+    def test_identical_defs_shared(self):
+        svg = build_bundle({"a": CARD_A, "a2": CARD_A})
+        assert svg.count("<filter") == 1
+        assert svg.count("<defs>") == 1
+
+    def test_conflicting_ids_renamed(self):
+        svg = build_bundle({"a": CARD_A, "b": CARD_B})
+        assert 'id="b--glow"' in svg
+        assert "url(#b--glow)" in svg
+        assert _references(svg) <= set(re.findall(r'\bid="([^"]+)"', svg))
+
+    def test_real_cards_well_formed(self, svg_builder):
+        cards = {name[:-4]: svg for name, svg in svg_builder.render_all().items()}
+        svg = build_bundle(cards)
+        xml.dom.minidom.parseString(svg)
+        ids = re.findall(r'\bid="([^"]+)"', svg)
+        assert len(ids) == len(set(ids))
+        assert _references(svg) <= set(ids)
+        assert svg.count("<view ") == len(cards)
@@ -66,6 +66,17 @@ class TestValidateConfig:
         assert "exclude" in result["languages"]
         assert "void" in result["theme"]
 
+    @pytest.mark.parametrize("metrics", [[], "commits"])
+    def test_invalid_stats_metrics(self, cfg, metrics):
+        cfg["stats"] = {"metrics": metrics}
+        with pytest.raises(ConfigError, match="non-empty list"):
+            validate_config(cfg)
+
+    def test_custom_stats_metrics_allowed(self, cfg):
+        # The stats card labels unknown metrics with key.title() and shows them as 0
+        cfg["stats"] = {"metrics": ["stars", "stars", "bogus"]}
+        assert validate_config(cfg)["stats"]["metrics"] == ["stars", "stars", "bogus"]
+
     def test_config_not_dict_fails(self):
         with pytest.raises(ConfigError, match="dict"):
             validate_config("not a dict")
@@ -73,3 +84,53 @@ class TestValidateConfig:
     def test_config_none_fails(self):
         with pytest.raises(ConfigError, match="dict"):
             validate_config(None)
+
+    def test_heatmap_compact_defaults_false(self, cfg):
+        result = validate_config(cfg)
+        assert result["heatmap"]["compact"] is False
+
+    def test_heatmap_compact_must_be_bool(self, cfg):
+        cfg["heatmap"] = {"compact": "yes"}
+        with pytest.raises(ConfigError, match="heatmap.compact"):
+            validate_config(cfg)
+
+    def test_themes_default_empty(self, cfg):
+        result = validate_config(cfg)
+        assert result["themes"] == {}
+
+    def test_themes_invalid_hex(self, cfg):
+        cfg["themes"] = {"light": {"void": "white"}}
+        with pytest.raises(ConfigError, match="themes.light.void"):
+            validate_config(cfg)
+
+    def test_themes_invalid_name(self, cfg):
+        cfg["themes"] = {"my theme": {"void": "#ffffff"}}
+        with pytest.raises(ConfigError, match="theme name"):
+            validate_config(cfg)
+
+    def test_starfield_placement_default(self, cfg):
+        assert validate_config(cfg)["starfield"]["placement"] == "uniform"
+
+    def test_starfield_placement_invalid(self, cfg):
+        cfg["starfield"] = {"placement": "random"}
+        with pytest.raises(ConfigError, match="starfield.placement"):
+            validate_config(cfg)
+
+    def test_heatmap_month_totals_invalid(self, cfg):
+        cfg["heatmap"] = {"month_totals": "yes"}
+        with pytest.raises(ConfigError, match="heatmap.month_totals"):
+            validate_config(cfg)
+
+    def test_constellation_defaults(self, cfg):
+        assert validate_config(cfg)["constellation"] == {"links": "chain", "max_items_per_arm": 0}
+
+    def test_constellation_links_invalid(self, cfg):
+        cfg["constellation"] = {"links": "delaunay"}
+        with pytest.raises(ConfigError, match="constellation.links"):
+            validate_config(cfg)
+
+    @pytest.mark.parametrize("budget", [1, -3, "10", True])
+    def test_constellation_budget_invalid(self, cfg, budget):
+        cfg["constellation"] = {"max_items_per_arm": budget}
+        with pytest.raises(ConfigError, match="constellation.max_items_per_arm"):
+            validate_config(cfg)
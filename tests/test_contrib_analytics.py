@@ -0,0 +1,54 @@
+"""Tests for generator.contrib_analytics."""
+
+import datetime
+
+from generator.contrib_analytics import ContributionIndex
+from generator.contrib_calendar import ContributionCalendar
+
+# Saturday 2024-01-27 through Monday 2024-02-05
+START = datetime.date(2024, 1, 27)
+COUNTS = [1, 0, 2, 3, 0, 1, 1, 1, 4, 0]
+
+
+def _index(counts=COUNTS, start=START):
+    return ContributionIndex(ContributionCalendar(start, counts))
+
+
+class TestContributionIndex:
+    def test_range_totals(self):
+        index = _index()
+        assert index.total() == sum(COUNTS)
+        assert index.total(START, START) == 1
+        assert index.total(datetime.date(2024, 1, 29), datetime.date(2024, 1, 31)) == 5
+        # Clamped to the calendar on both ends
+        assert index.total(datetime.date(2023, 1, 1), datetime.date(2030, 1, 1)) == sum(COUNTS)
+        assert index.total(datetime.date(2024, 2, 3), datetime.date(2024, 2, 1)) == 0
+
+    def test_rolling(self):
+        index = _index()
+        assert index.rolling(3) == 5
+        assert index.rolling(30) == sum(COUNTS)
+
+    def test_streaks(self):
+        index = _index()
+        # Last day is empty (today in progress): the streak ending yesterday counts
+        assert index.current_streak == 4
+        assert index.longest_streak == 4
+        assert index.active_days == 7
+
+    def test_streak_broken(self):
+        assert _index([3, 3, 0, 0]).current_streak == 0
+
+    def test_month_totals(self):
+        assert _index().month_totals == {(2024, 1): 6, (2024, 2): 7}
+
+    def test_weekday_totals(self):
+        index = _index()
+        assert sum(index.weekday_totals) == sum(COUNTS)
+        assert index.weekday_totals[6] == 1 + 1  # Saturdays: Jan 27, Feb 3
+
+    def test_empty(self):
+        index = ContributionIndex(ContributionCalendar())
+        assert index.metrics() == {"streak": 0, "longest_streak": 0, "last_30d": 0}
+        assert index.total() == 0
+        assert index.month_totals == {}
@@ -0,0 +1,71 @@
+"""Tests for generator.contrib_calendar."""
+
+import datetime
+
+import pytest
+
+from generator.contrib_calendar import MAX_COUNT, ContributionCalendar, gh_weekday
+
+# A Wednesday, so the first week is partial
+START = datetime.date(2024, 1, 3)
+
+
+def _weeks(start, counts):
+    """Old dict shape: consecutive days split into Sunday-started weeks."""
+    weeks = []
+    for i, count in enumerate(counts):
+        date = start + datetime.timedelta(days=i)
+        if not weeks or gh_weekday(date) == 0:
+            weeks.append([])
+        weeks[-1].append({"date": date.isoformat(), "count": count, "weekday": gh_weekday(date)})
+    return weeks
+
+
+class TestContributionCalendar:
+    def test_round_trip(self):
+        data = {"total_count": 99, "weeks": _weeks(START, range(20))}
+        calendar = ContributionCalendar.from_dict(data)
+        assert calendar.to_dict() == data
+        assert calendar.counts.typecode == "H"
+
+    def test_round_trip_demo(self, sample_contributions):
+        assert ContributionCalendar.from_dict(sample_contributions.to_dict()) == sample_contributions
+
+    def test_iter_weeks(self):
+        calendar = ContributionCalendar(START, range(10))
+        weeks = list(calendar.iter_weeks())
+        assert calendar.num_weeks == len(weeks) == 2
+        assert weeks[0] == (START, [(3, 0), (4, 1), (5, 2), (6, 3)])
+        assert weeks[1][0] == datetime.date(2024, 1, 7)
+        assert weeks[1][1][0] == (0, 4)
+
+    def test_total_defaults_to_sum(self):
+        calendar = ContributionCalendar(START, [1, 2, 3])
+        assert calendar.total_count == 6
+        assert calendar.end == datetime.date(2024, 1, 5)
+
+    def test_counts_clamped(self):
+        assert list(ContributionCalendar(START, [-1, MAX_COUNT + 5]).counts) == [0, MAX_COUNT]
+
+    def test_empty(self):
+        calendar = ContributionCalendar.coerce({"total_count": 0, "weeks": []})
+        assert len(calendar) == 0
+        assert list(calendar.iter_weeks()) == []
+        assert calendar.to_dict() == {"total_count": 0, "weeks": []}
+        assert ContributionCalendar.coerce(None) == calendar
+
+    def test_coerce_passes_calendars_through(self):
+        calendar = ContributionCalendar(START, [1])
+        assert ContributionCalendar.coerce(calendar) is calendar
+
+    def test_gap_rejected(self):
+        weeks = _weeks(START, range(5))
+        del weeks[0][1]
+        with pytest.raises(ValueError, match="consecutive"):
+            ContributionCalendar.from_weeks(weeks)
+
+    def test_week_not_starting_on_sunday_rejected(self):
+        weeks = _weeks(START, range(10))
+        weeks[1].insert(0, weeks[0].pop())
+        with pytest.raises(ValueError, match="Sunday"):
+            ContributionCalendar.from_weeks(weeks)
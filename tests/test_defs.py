@@ -0,0 +1,74 @@
+"""Tests for generator.defs."""
+
+import copy
+
+from generator.config import validate_config
+from generator.defs import DefsRegistry, use
+from generator.svg_builder import SVGBuilder
+
+
+class TestDefsRegistry:
+    def test_add_returns_prefix_id(self):
+        defs = DefsRegistry()
+        assert defs.add("grad", '<linearGradient id="{id}"/>') == "grad"
+        assert 'id="grad"' in defs.render()
+
+    def test_identical_markup_is_deduplicated(self):
+        defs = DefsRegistry()
+        a = defs.add("grad", '<linearGradient id="{id}"/>')
+        b = defs.add("grad", '<linearGradient id="{id}"/>')
+        assert a == b
+        assert len(defs) == 1
+
+    def test_different_markup_gets_unique_ids(self):
+        defs = DefsRegistry()
+        a = defs.add("clip", '<clipPath id="{id}"><rect x="0"/></clipPath>')
+        b = defs.add("clip", '<clipPath id="{id}"><rect x="10"/></clipPath>')
+        assert a == "clip"
+        assert b == "clip-2"
+        assert len(defs) == 2
+
+    def test_colorless_glow_shared(self):
+        defs = DefsRegistry()
+        ids = {defs.glow_filter(3) for _ in range(10)}
+        assert len(ids) == 1
+        assert defs.render().count("<filter") == 1
+        assert "feFlood" not in defs.render()
+
+    def test_colored_glow_uses_flood(self):
+        defs = DefsRegistry()
+        defs.glow_filter(4, color="#00d4ff")
+        assert 'flood-color="#00d4ff"' in defs.render()
+
+    def test_blur_filter_region(self):
+        defs = DefsRegistry()
+        defs.blur_filter(2, region=20)
+        out = defs.render()
+        assert 'x="-20%"' in out
+        assert 'width="140%"' in out
+
+    def test_use_element(self):
+        assert use("core", 10, 20.55) == '<use href="#core" x="10.0" y="20.6"/>'
+
+
+class TestTemplateDefs:
+    def test_filter_count_independent_of_arms(self, cfg, sample_stats, sample_languages, sample_contributions):
+        counts = []
+        for n_arms in (1, 6):
+            c = copy.deepcopy(cfg)
+            c["galaxy_arms"] = [
+                {"name": f"Arm{i}", "color": "synapse_cyan", "items": ["A", "B"]}
+                for i in range(n_arms)
+            ]
+            c["projects"] = [{"repo": "u/p", "arm": 0}]
+            c["timeline"] = [{"year": 2020 + i, "label": "x", "arm": i} for i in range(n_arms)]
+            builder = SVGBuilder(validate_config(c), sample_stats, sample_languages, sample_contributions)
+            counts.append(sum(
+                svg.count("<filter")
+                for svg in (
+                    builder.render_galaxy_header(),
+                    builder.render_skill_constellation(),
+                    builder.render_coding_timeline(),
+                )
+            ))
+        assert counts[0] == counts[1]
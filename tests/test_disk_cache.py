@@ -0,0 +1,197 @@
+"""Tests for generator.disk_cache."""
+
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+
+from generator.config import validate_config
+from generator.disk_cache import (
+    DEFAULT_KEEP,
+    PRUNE_INTERVAL,
+    DiskCache,
+    decode_dataset,
+    encode_dataset,
+)
+from generator.server import ProfileService
+from generator.sources import DATASETS, DemoSource
+
+
+@pytest.fixture
+def disk(tmp_path, clock):
+    cache = DiskCache(str(tmp_path / "serve.sqlite"), clock=clock)
+    yield cache
+    cache.close()
+
+
+class TestDiskCache:
+    def test_datasets_round_trip(self, disk):
+        source = DemoSource()
+        for name in DATASETS:
+            value = source.fetch_dataset("alice", name)
+            disk.put_dataset("alice", name, value, "v1", 2000.0)
+            stored, version, expires = disk.get_dataset("alice", name)
+            assert encode_dataset(stored) == encode_dataset(value)
+            assert (version, expires) == ("v1", 2000.0)
+        assert disk.get_dataset("bob", "stats") is None
+
+    def test_calendar_codec(self):
+        calendar = DemoSource().fetch_dataset("alice", "contributions")
+        decoded = decode_dataset("contributions", encode_dataset(calendar))
+        assert decoded.start == calendar.start
+        assert list(decoded.counts) == list(calendar.counts)
+        assert decoded.total_count == calendar.total_count
+
+    def test_renders(self, disk):
+        key = ("alice", "stats-card", "[null, null]", "cfg1")
+        disk.put_render(key, "v1,v1,v1", b"<svg/>", '"abc"')
+        assert tuple(disk.get_render(key, "v1,v1,v1")) == (b"<svg/>", '"abc"')
+        assert disk.get_render(key, "v2,v1,v1") is None
+        assert disk.get_render(key[:3] + ("cfg2",), "v1,v1,v1") is None
+
+    def test_new_data_replaces_card(self, disk):
+        key = ("alice", "stats-card", "[null, null]", "cfg1")
+        for version in range(5):
+            disk.put_render(key, str(version), b"<svg/>", '"abc"')
+        assert disk._db().execute("SELECT COUNT(*) FROM cards").fetchone()[0] == 1
+
+    def test_old_schema_replaced(self, tmp_path):
+        path = str(tmp_path / "old.sqlite")
+        with sqlite3.connect(path) as db:
+            db.execute("CREATE TABLE renders (key TEXT PRIMARY KEY, body BLOB)")
+        cache = DiskCache(path)
+        tables = {row[0] for row in cache._db().execute("SELECT name FROM sqlite_master")}
+        assert "renders" not in tables and "cards" in tables
+        cache.close()
+
+    def test_leases(self, disk, clock):
+        assert disk.claim("alice/stats", lease=30)
+        assert not disk.claim("alice/stats", lease=30)
+        clock.now += 31  # an expired lease (crashed worker) can be taken over
+        assert disk.claim("alice/stats", lease=30)
+        disk.release("alice/stats")
+        assert disk.claim("alice/stats", lease=30)
+
+    def test_prune(self, disk, clock):
+        key = ("alice", "stats-card", "", "cfg")
+        disk.put_dataset("alice", "stats", {}, "v1", clock.now)
+        disk.put_render(key, "v1", b"", '""')
+        clock.now += 10
+        disk.prune(keep=60)
+        assert disk.get_dataset("alice", "stats") is not None
+        clock.now += 100
+        disk.prune(keep=60)
+        assert disk.get_dataset("alice", "stats") is None
+        assert disk.get_render(key, "v1") is None
+
+    def test_writes_prune_periodically(self, disk, clock):
+        old = ("alice", "stats-card", "", "cfg")
+        disk.put_render(old, "v1", b"", '""')
+        clock.now += DEFAULT_KEEP + PRUNE_INTERVAL
+        disk.put_render(("bob", "stats-card", "", "cfg"), "v1", b"", '""')
+        assert disk.get_render(old, "v1") is None
+
+
+class TestSharedServices:
+    """Two services on one disk cache stand in for two worker processes."""
+
+    @pytest.fixture
+    def workers(self, cfg, disk, clock, make_source):
+        config = validate_config(cfg)
+        return [ProfileService(config, make_source(), disk=disk, clock=clock) for _ in range(2)]
+
+    def test_data_and_renders_shared(self, workers):
+        first, second = workers
+        body = first.handle("/alice/stats-card.svg").body
+        assert len(first.source.calls) == len(DATASETS)
+        response = second.handle("/alice/stats-card.svg")
+        assert response.body == body
+        assert second.source.calls == []
+        assert second.stats()["renders"]["entries"] == 1
+
+    def test_config_change_rerenders(self, cfg, disk, clock, make_source):
+        first = ProfileService(validate_config(cfg), make_source(), disk=disk, clock=clock)
+        before = first.handle("/alice/stats-card.svg").body
+        changed = validate_config({**cfg, "stats": {"metrics": ["streak"]}})
+        restarted = ProfileService(changed, make_source(), disk=disk, clock=clock)
+        after = restarted.handle("/alice/stats-card.svg").body
+        assert after != before and b"Streak" in after
+
+    def test_expired_data_refetched_once(self, workers, clock):
+        first, second = workers
+        first.handle("/alice/stats-card.svg")
+        second.handle("/alice/stats-card.svg")
+        clock.now += 30000  # past every TTL
+        first.handle("/alice/stats-card.svg")
+        second.handle("/alice/stats-card.svg")
+        assert len(first.source.calls) == 2 * len(DATASETS)
+        assert second.source.calls == []
+
+    def test_waits_for_leaseholder(self, workers, disk, clock, monkeypatch):
+        second = workers[1]
+        disk.claim("alice/stats")  # another worker is fetching
+
+        def fetched_meanwhile(seconds):
+            disk.put_dataset("alice", "stats", {"commits": 7}, "v1", clock.now + 60)
+
+        monkeypatch.setattr(time, "sleep", fetched_meanwhile)
+        assert second.dataset("alice", "stats").value == {"commits": 7}
+        assert second.source.calls == []
+
+    def test_takes_over_when_leaseholder_fails(self, workers, disk, monkeypatch):
+        second = workers[1]
+        disk.claim("alice/stats")
+        polls = []
+
+        def failed_meanwhile(seconds):
+            polls.append(seconds)
+            disk.release("alice/stats")  # the holder's fetch raised
+
+        monkeypatch.setattr(time, "sleep", failed_meanwhile)
+        second.dataset("alice", "stats")
+        assert second.source.calls == [("alice", "stats")]
+        assert len(polls) == 1
+        assert disk.claim("alice/stats")  # released again after the fetch
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork()")
+def test_prefork_workers_share_cache(tmp_path):
+    port = _free_port()
+    db = tmp_path / "serve.sqlite"
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "generator.main", "serve", "--demo", "--workers", "2",
+         "--port", str(port), "--disk-cache", str(db)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}/alice/stats-card.svg"
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                with urllib.request.urlopen(url, timeout=5) as response:
+                    body = response.read()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+        for _ in range(4):
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert response.read() == body
+        cache = DiskCache(str(db))
+        assert all(cache.get_dataset("alice", name) for name in DATASETS)
+        cache.close()
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
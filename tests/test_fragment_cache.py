@@ -0,0 +1,77 @@
+"""Tests for generator.fragment_cache."""
+
+import pytest
+
+from generator import fragment_cache
+from generator.fragment_cache import FragmentCache, fragment
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """Give each test its own process-wide cache and restore the default after."""
+    previous = fragment_cache.get_cache()
+    yield fragment_cache.configure()
+    fragment_cache.set_cache(previous)
+
+
+class TestFragmentCache:
+    def test_lru_eviction(self):
+        cache = FragmentCache(maxsize=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert len(cache) == 2
+
+    def test_hit_and_miss_counters(self):
+        cache = FragmentCache()
+        cache.get("missing")
+        cache.set("k", "v")
+        cache.get("k")
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_disk_persistence(self, tmp_path):
+        FragmentCache(directory=str(tmp_path)).set("k", ("outer", "inner"))
+        reloaded = FragmentCache(directory=str(tmp_path))
+        assert reloaded.get("k") == ("outer", "inner")
+
+
+class TestFragmentDecorator:
+    def test_computes_once_per_arguments(self):
+        calls = []
+
+        @fragment
+        def build(name, theme):
+            calls.append(name)
+            return f"<g>{name}{theme['void']}</g>"
+
+        assert build("a", {"void": "#000000"}) == build("a", {"void": "#000000"})
+        build("b", {"void": "#000000"})
+        assert calls == ["a", "b"]
+
+    def test_template_output_unchanged_by_cache(self, svg_builder):
+        first = svg_builder.render_galaxy_header()
+        svg_builder.reset()
+        second = svg_builder.render_galaxy_header()
+        assert first == second
+        assert fragment_cache.get_cache().hits > 0
+
+    def test_code_version_in_key(self, tmp_path, monkeypatch):
+        fragment_cache.configure(directory=str(tmp_path))
+        calls = []
+
+        def build(name):
+            calls.append(name)
+            return f"<g>{name}</g>"
+
+        fragment(build)("a")
+        fragment(build)("a")
+        monkeypatch.setattr(fragment_cache, "code_version", lambda: "upgraded")
+        fragment(build)("a")  # persisted fragments from older code are not reused
+        assert calls == ["a", "a"]
+
+    def test_code_version_is_stable(self):
+        assert fragment_cache.code_version() == fragment_cache.code_version()
+        assert len(fragment_cache.code_version()) == 16
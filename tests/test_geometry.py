@@ -0,0 +1,118 @@
+"""Tests for generator.geometry."""
+
+import math
+
+import pytest
+
+from generator import geometry
+
+
+class TestSpirals:
+    def test_one_spiral_per_start_angle(self):
+        arms = geometry.spirals(0, 0, (0, 90, 180), 10, 100, 1)
+        assert len(arms) == 3
+        assert all(len(points) == 10 for points in arms)
+
+    def test_starts_at_center_ends_at_max_radius(self):
+        (points,) = geometry.spirals(50, 60, (0,), 5, 100, 1)
+        assert points[0] == (50, 60)
+        assert math.hypot(points[-1][0] - 50, points[-1][1] - 60) == pytest.approx(100)
+
+    def test_memoized(self):
+        args = (425, 155, (25, 150, 265), 30, 220, 0.85, 1.5, 0.38)
+        assert geometry.spirals(*args) is geometry.spirals(*args)
+
+
+class TestPolarPoints:
+    def test_zero_degrees_is_twelve_oclock(self):
+        ((x, y),) = geometry.polar_points(100, 100, 10, [0])
+        assert (x, y) == pytest.approx((100, 90))
+
+    def test_per_point_radii(self):
+        points = geometry.polar_points(0, 0, [1, 2], [90, 180])
+        assert points == [pytest.approx((1, 0)), pytest.approx((0, 2))]
+
+
+class TestArcPaths:
+    def test_batch_matches_single_arcs(self):
+        spans = ((0, 90), (90, 300))
+        paths = geometry.arc_paths(100, 100, 50, spans)
+        assert paths == tuple(geometry.arc_paths(100, 100, 50, (span,))[0] for span in spans)
+        assert " 0 1 " in paths[1]  # > 180 degrees uses the large arc
+
+    def test_int_and_float_center_cached_separately(self):
+        assert geometry.arc_paths(1, 1, 5, ((0, 90),))[0].startswith("M 1 1 ")
+        assert geometry.arc_paths(1.0, 1.0, 5, ((0, 90),))[0].startswith("M 1.0 1.0 ")
+
+
+class TestJitteredGrid:
+    def test_points_stay_in_box(self):
+        jitter = [100.0, -100.0, 0.0, 5.0]
+        points = geometry.jittered_grid(10, 20, 200, 100, jitter, jitter)
+        assert all(10 <= x <= 210 and 20 <= y <= 120 for x, y in points)
+
+    def test_no_jitter_gives_cell_centers(self):
+        assert geometry.grid_shape(4, 200, 100) == (3, 2, 200 / 3, 50)
+        points = geometry.jittered_grid(0, 0, 200, 100, [0.0] * 4, [0.0] * 4)
+        assert points[1] == pytest.approx((100, 25))
+        assert points[3] == pytest.approx((200 / 6, 75))
+
+    def test_empty(self):
+        assert geometry.jittered_grid(0, 0, 10, 10, [], []) == []
+
+
+class TestMinimumSpanningTree:
+    def test_matches_brute_force_length(self):
+        import itertools
+        import random
+
+        rng = random.Random(7)
+        points = [(rng.uniform(0, 200), rng.uniform(0, 300)) for _ in range(40)]
+        tree = geometry.minimum_spanning_tree(points)
+        assert len(tree) == 39
+
+        # Brute-force Kruskal over every pair
+        parent = list(range(40))
+
+        def find(i):
+            while parent[i] != i:
+                i = parent[i]
+            return i
+
+        best = 0.0
+        for d, i, j in sorted(
+            (math.dist(points[i], points[j]), i, j) for i, j in itertools.combinations(range(40), 2)
+        ):
+            if find(i) != find(j):
+                parent[find(i)] = find(j)
+                best += d
+        assert sum(math.dist(points[i], points[j]) for i, j in tree) == pytest.approx(best)
+
+    def test_far_apart_clusters_still_connected(self):
+        points = [(0, 0), (1, 0), (0, 1), (1000, 1000), (1001, 1000)]
+        assert len(geometry.minimum_spanning_tree(points, cell=2)) == 4
+
+    def test_small_inputs(self):
+        assert geometry.minimum_spanning_tree([]) == []
+        assert geometry.minimum_spanning_tree([(5, 5)]) == []
+        assert geometry.minimum_spanning_tree([(0, 0), (0, 0)]) == [(0, 1)]
+
+
+class TestFallback:
+    def test_pure_python_matches_numpy(self, monkeypatch):
+        np = pytest.importorskip("numpy")
+        spans = ((0, 120), (120, 240), (240, 360))
+        with_numpy = (
+            geometry.spirals.__wrapped__(0, 0, (25, 150), 30, 220, 0.85, 1.5, 0.38),
+            geometry.polar_points(10, 10, [24, 40, 56], [15, 100, 300]),
+            geometry.jittered_grid(0, 0, 200, 100, [1.0, -2.0, 3.0], [0.5, 0.0, -0.5]),
+        )
+        monkeypatch.setattr(geometry, "np", None)
+        without = (
+            geometry.spirals.__wrapped__(0, 0, (25, 150), 30, 220, 0.85, 1.5, 0.38),
+            geometry.polar_points(10, 10, [24, 40, 56], [15, 100, 300]),
+            geometry.jittered_grid(0, 0, 200, 100, [1.0, -2.0, 3.0], [0.5, 0.0, -0.5]),
+        )
+        for a, b in zip(with_numpy, without):
+            assert np.allclose(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+        assert geometry.arc_paths.__wrapped__(0, 0, 50, spans) == geometry.arc_paths(0, 0, 50, spans)
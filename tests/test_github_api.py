@@ -0,0 +1,65 @@
+"""Tests for generator.github_api."""
+
+from generator.github_api import GitHubAPI, RateLimit
+
+
+class FakeResponse:
+    status_code = 200
+    text = ""
+
+    def __init__(self, payload=None, headers=None):
+        self.payload = payload
+        self.headers = headers or {}
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Answers a request for page N with pages[N - 1] (page 1 without a page param)."""
+
+    def __init__(self, pages=(None,), headers=None):
+        self.pages = pages
+        self.headers = headers
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        page = kwargs.get("params", {}).get("page", 1)
+        self.calls.append((url, page))
+        return FakeResponse(self.pages[page - 1], self.headers)
+
+
+class TestRateLimit:
+    def test_tracks_tightest_budget(self):
+        limit = RateLimit(clock=lambda: 1000)
+        assert limit.remaining is None
+        limit.update({"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": "2000"})
+        limit.update({"X-RateLimit-Remaining": "30", "X-RateLimit-Reset": "1600",
+                      "X-RateLimit-Resource": "search"})
+        assert limit.remaining == 30
+        assert limit.reset_in() == 600
+
+    def test_reset_budgets_ignored(self):
+        now = [1000]
+        limit = RateLimit(clock=lambda: now[0])
+        limit.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1100"})
+        now[0] = 1200
+        assert limit.remaining is None and limit.reset_in() == 0
+
+    def test_updated_by_requests(self):
+        limit = RateLimit(clock=lambda: 0)
+        session = FakeSession(headers={"X-RateLimit-Remaining": "42", "X-RateLimit-Reset": "60"})
+        GitHubAPI("octocat", token="t", session=session, rate_limit=limit)._request("GET", "url")
+        assert limit.remaining == 42
+
+
+class TestFetchOrgMembers:
+    def test_paginates(self):
+        pages = [[{"login": f"m{i}"} for i in range(100)], [{"login": "last"}]]
+        session = FakeSession(pages)
+        members = GitHubAPI("stellar-labs", token="t", session=session).fetch_org_members()
+        assert len(members) == 101 and members[-1] == "last"
+        assert session.calls[0][0].endswith("/orgs/stellar-labs/members")
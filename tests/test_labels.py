@@ -0,0 +1,46 @@
+"""Tests for generator.labels."""
+
+import pytest
+
+from generator.labels import Candidate, LabelPlacer, text_box
+
+
+class TestTextBox:
+    @pytest.mark.parametrize("anchor,x0", [("start", 100), ("middle", 97), ("end", 94)])
+    def test_anchor(self, anchor, x0):
+        box = text_box("ab", 5, 100, 50, anchor)
+        assert box[0] == pytest.approx(x0)
+        assert box[2] - box[0] == pytest.approx(6)
+        assert box[1] < 50 < box[3]
+
+
+class TestLabelPlacer:
+    def test_first_candidate_when_free(self):
+        placer = LabelPlacer()
+        assert placer.place("label", 10, [Candidate(50, 50), Candidate(50, 80)]) == (50, 50, "middle")
+
+    def test_skips_taken_candidate(self):
+        placer = LabelPlacer()
+        placer.place("label", 10, [Candidate(50, 50)])
+        assert placer.place("label", 10, [Candidate(52, 50), Candidate(52, 80)]) == (52, 80, "middle")
+
+    def test_blocked_area_avoided(self):
+        placer = LabelPlacer()
+        placer.block((40, 40, 60, 60))
+        assert placer.place("x", 10, [Candidate(50, 55), Candidate(50, 75)]).y == 75
+
+    def test_bounds_count_as_collisions(self):
+        placer = LabelPlacer(bounds=(0, 0, 100, 100))
+        assert placer.place("label", 10, [Candidate(99, 50, "start"), Candidate(99, 50, "end")]).anchor == "end"
+
+    def test_least_overlap_when_all_taken(self):
+        placer = LabelPlacer()
+        placer.block((0, 0, 100, 100))
+        placer.block((0, 0, 50, 100))
+        # Both collide; the second only with the first block
+        assert placer.place("x", 10, [Candidate(25, 50), Candidate(75, 50)]).x == 75
+
+    def test_boxes_spanning_cells_are_found(self):
+        placer = LabelPlacer(cell=10)
+        placer.place("a long label here", 10, [Candidate(0, 0, "start")])
+        assert placer.place("b", 10, [Candidate(80, 0), Candidate(80, 40)]).y == 40
@@ -0,0 +1,89 @@
+"""Tests for generator.lite."""
+
+import re
+import xml.dom.minidom
+
+from generator.config import validate_config
+from generator.lite import measure, simplify
+from generator.svg_builder import SVGBuilder
+
+CARD = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100" viewBox="0 0 100 100">\n'
+    '  <defs>\n'
+    '    <style>\n'
+    '      .twinkle { animation: fade 2s infinite; }\n'
+    '      .ghost { opacity: 0; animation: fade 3s infinite; }\n'
+    '    </style>\n'
+    '    <filter id="blur"><feGaussianBlur stdDeviation="10"/></filter>\n'
+    '    <filter id="glow" x="-100%" y="-100%" width="300%" height="300%">\n'
+    '      <feGaussianBlur stdDeviation="3" in="SourceGraphic" result="blur"/>\n'
+    '      <feComponentTransfer in="blur" result="glow">\n'
+    '        <feFuncA type="linear" slope="0.5"/>\n'
+    '      </feComponentTransfer>\n'
+    '      <feMerge><feMergeNode in="glow"/><feMergeNode in="SourceGraphic"/></feMerge>\n'
+    '    </filter>\n'
+    '  </defs>\n'
+    '  <circle cx="50" cy="50" r="20" fill="#00d4ff" opacity="0.1" filter="url(#blur)"/>\n'
+    '  <circle cx="10" cy="10" r="4" fill="#a78bfa" filter="url(#glow)"/>\n'
+    '  <text x="5" y="5" filter="url(#blur)">42</text>\n'
+    '  <text x="5" y="5">42</text>\n'
+    + "".join(f'  <circle cx="{i}" cy="1" r="1" class="twinkle"/>\n' for i in range(10))
+    + '  <line x1="0" y1="0" x2="5" y2="5" class="ghost"/>\n'
+    + "".join(
+        '  <circle r="1"><animateMotion path="M 0,0 L 9,9" dur="3s" repeatCount="indefinite"/></circle>\n'
+        for _ in range(4)
+    )
+    + '</svg>'
+)
+
+
+class TestMeasure:
+    def test_counts(self):
+        counts = measure(CARD)
+        assert counts["animations"] == 15  # 10 twinkles, 1 ghost, 4 motions
+        assert counts["filters"] == 3
+
+
+class TestSimplify:
+    def test_caps_infinite_animations(self):
+        assert measure(simplify(CARD, max_animations=5))["animations"] == 5
+
+    def test_stopped_css_animation_keeps_class(self):
+        svg = simplify(CARD, max_animations=0)
+        assert 'class="ghost" style="animation: none"' in svg
+
+    def test_capped_motion_drops_particle(self):
+        svg = simplify(CARD, max_animations=0)
+        assert "<animateMotion" not in svg
+        assert '<circle r="1">' not in svg
+
+    def test_filters_become_halos(self):
+        svg = simplify(CARD)
+        assert measure(svg)["filters"] == 0
+        assert "<filter" not in svg
+        assert 'r="30" fill="url(#lite-halo-00d4ff)" opacity="0.1"' in svg
+        assert 'r="10" fill="url(#lite-halo-a78bfa)" opacity="0.50"' in svg
+        assert svg.count("<text") == 1
+
+    def test_reduced_motion_rule(self):
+        assert "prefers-reduced-motion: reduce" in simplify(CARD)
+
+    def test_references_resolve(self):
+        svg = simplify(CARD)
+        xml.dom.minidom.parseString(svg)
+        ids = set(re.findall(r'\bid="([^"]+)"', svg))
+        assert set(re.findall(r"url\(#([^)]+)\)", svg)) <= ids
+
+
+class TestBuilderLite:
+    def test_lite_cards_valid_and_report(
+        self, cfg, sample_stats, sample_languages, sample_contributions
+    ):
+        config = validate_config(cfg)
+        builder = SVGBuilder(config, sample_stats, sample_languages, sample_contributions, lite=True)
+        for svg in builder.render_all().values():
+            xml.dom.minidom.parseString(svg)
+            assert 'filter="url(' not in svg
+        report = builder.lite_report["galaxy-header"]
+        assert report["after"]["animations"] < report["before"]["animations"]
+        assert report["after"]["filters"] == 0
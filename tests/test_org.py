@@ -0,0 +1,130 @@
+"""Tests for generator.org."""
+
+import datetime
+import functools
+
+import requests
+
+from generator.contrib_calendar import ContributionCalendar
+from generator.org import EMPTY_PROFILE, OrgAggregate, combine, combine_calendars, fetch_members
+from generator.sources import DemoSource, ProfileData
+from generator.work_queue import WorkQueue
+
+DAY = datetime.date(2024, 3, 1)
+
+
+def _profile(stars, langs, offset, counts):
+    calendar = ContributionCalendar(DAY + datetime.timedelta(days=offset), counts)
+    return ProfileData({"stars": stars, "commits": sum(counts)}, langs, calendar)
+
+
+MEMBERS = {
+    "a": _profile(3, {"Python": 100}, 0, [1, 2, 3]),
+    "b": _profile(5, {"Python": 50, "Go": 10}, 2, [4, 0, 6, 7]),
+    "c": _profile(0, {"Rust": 5}, 10, [1]),
+    "d": _profile(1, {}, 0, []),
+}
+
+
+def _reduce(profiles):
+    return functools.reduce(combine, profiles, EMPTY_PROFILE)
+
+
+class TestCombine:
+    def test_calendars_sum_over_union(self):
+        merged = combine_calendars(MEMBERS["a"].contributions, MEMBERS["b"].contributions)
+        assert merged.start == DAY
+        assert list(merged.counts) == [1, 2, 7, 0, 6, 7]
+        assert merged.total_count == 23
+
+    def test_disjoint_calendars_padded_with_zeros(self):
+        merged = combine_calendars(MEMBERS["a"].contributions, MEMBERS["c"].contributions)
+        assert list(merged.counts) == [1, 2, 3] + [0] * 7 + [1]
+
+    def test_associative_with_identity(self):
+        a, b, c, d = MEMBERS.values()
+        assert combine(combine(a, b), c) == combine(a, combine(b, c))
+        assert combine(EMPTY_PROFILE, a) == a == combine(a, EMPTY_PROFILE)
+        assert combine(d, a) == combine(a, d)
+
+
+class TestOrgAggregate:
+    def test_matches_reduce(self):
+        aggregate = OrgAggregate()
+        for name, data in MEMBERS.items():
+            aggregate.set(name, data)
+        assert aggregate.profile() == _reduce(MEMBERS.values())
+        assert aggregate.profile().stats == {"stars": 9, "commits": 24}
+
+    def test_incremental_update_and_remove(self):
+        aggregate = OrgAggregate()
+        for name, data in MEMBERS.items():
+            aggregate.set(name, data)
+
+        updated = _profile(4, {"Go": 1}, 5, [9])
+        aggregate.set("b", updated)
+        aggregate.remove("c")
+        expected = _reduce([MEMBERS["a"], updated, MEMBERS["d"]])
+        assert aggregate.profile() == expected
+        # Rust left with its only member; the calendar range shrank
+        assert "Rust" not in aggregate.profile().languages
+        assert aggregate.profile().contributions.end == DAY + datetime.timedelta(days=5)
+
+    def test_empty(self):
+        assert OrgAggregate().profile() == EMPTY_PROFILE
+
+    def test_update_applies_only_changes(self):
+        aggregate = OrgAggregate()
+        assert aggregate.update(MEMBERS) == 4
+        assert aggregate.update(MEMBERS) == 0
+        updated = {**MEMBERS, "b": _profile(4, {"Go": 1}, 5, [9])}
+        del updated["c"]
+        assert aggregate.update(updated) == 2
+        assert aggregate.profile() == _reduce(updated.values())
+
+    def test_update_keeps_members_that_failed_to_fetch(self):
+        aggregate = OrgAggregate()
+        aggregate.update(MEMBERS)
+        fetched = {name: data for name, data in MEMBERS.items() if name not in ("b", "d")}
+        assert aggregate.update(fetched, members=["a", "b", "c"]) == 1  # d left the roster
+        assert sorted(aggregate.members) == ["a", "b", "c"]
+        assert aggregate.profile() == _reduce([MEMBERS["a"], MEMBERS["b"], MEMBERS["c"]])
+
+    def test_save_and_load(self, tmp_path):
+        path = str(tmp_path / "org.aggregate.json")
+        aggregate = OrgAggregate()
+        aggregate.update(MEMBERS)
+        aggregate.save(path)
+
+        loaded = OrgAggregate.load(path)
+        assert loaded.members == MEMBERS
+        assert loaded.profile() == aggregate.profile()
+        loaded.remove("a")  # the restored sums stay invertible
+        assert loaded.profile() == _reduce([MEMBERS["b"], MEMBERS["c"], MEMBERS["d"]])
+
+
+class TestFetchMembers:
+    class Source(DemoSource):
+        def __init__(self, down=()):
+            self.down = set(down)
+            self.fetched = []
+
+        def fetch(self, username, strict=False):
+            self.fetched.append(username)
+            if username in self.down:
+                raise requests.exceptions.ConnectionError("unreachable")
+            return super().fetch(username, strict)
+
+    def test_failures_reported_separately(self):
+        profiles, failures = fetch_members(["a", "b", "c"], self.Source({"b"}), workers=2)
+        assert sorted(profiles) == ["a", "c"]
+        assert "unreachable" in failures["b"]
+
+    def test_queue_reuses_fresh_member_data(self):
+        queue = WorkQueue(":memory:")
+        fetch_members(["a", "b"], self.Source(), queue=queue)
+        source = self.Source()
+        profiles, _ = fetch_members(["a", "b", "c"], source, queue=queue, fresh_for=3600)
+        assert source.fetched == ["c"]
+        assert profiles["a"] == DemoSource().fetch("a")
+
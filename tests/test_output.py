@@ -0,0 +1,64 @@
+"""Tests for generator.output."""
+
+import gzip
+import os
+
+from generator.output import resolve_variants, write_if_changed, write_svgs
+
+
+class TestWriteIfChanged:
+    def test_writes_new_file(self, tmp_path):
+        path = tmp_path / "a.svg"
+        assert write_if_changed(str(path), b"<svg/>") is True
+        assert path.read_bytes() == b"<svg/>"
+
+    def test_skips_identical_content(self, tmp_path):
+        path = tmp_path / "a.svg"
+        write_if_changed(str(path), b"<svg/>")
+        assert write_if_changed(str(path), b"<svg/>") is False
+
+    def test_rewrites_changed_content(self, tmp_path):
+        path = tmp_path / "a.svg"
+        write_if_changed(str(path), b"<svg/>")
+        assert write_if_changed(str(path), b"<svg></svg>") is True
+        assert path.read_bytes() == b"<svg></svg>"
+
+
+class TestWriteSvgs:
+    def test_gzip_and_svgz_variants(self, tmp_path):
+        svgs = {"card.svg": "<svg>" + "x" * 500 + "</svg>"}
+        summary = write_svgs(str(tmp_path), svgs, ["gzip", "svgz"])
+        gz = tmp_path / "card.svg.gz"
+        svgz = tmp_path / "card.svgz"
+        assert gzip.decompress(gz.read_bytes()).decode() == svgs["card.svg"]
+        assert gzip.decompress(svgz.read_bytes()).decode() == svgs["card.svg"]
+        assert summary[0]["variants"]["gzip"] < summary[0]["size"]
+
+    def test_unchanged_svg_is_not_recompressed(self, tmp_path):
+        svgs = {"card.svg": "<svg/>"}
+        write_svgs(str(tmp_path), svgs, ["gzip"])
+        gz = tmp_path / "card.svg.gz"
+        os.utime(gz, (0, 0))
+        summary = write_svgs(str(tmp_path), svgs, ["gzip"])
+        assert summary[0]["written"] is False
+        assert os.path.getmtime(gz) == 0
+        assert summary[0]["variants"]["gzip"] == gz.stat().st_size
+
+    def test_gzip_output_is_deterministic(self, tmp_path):
+        svgs = {"card.svg": "<svg/>"}
+        write_svgs(str(tmp_path), svgs, ["gzip"])
+        first = (tmp_path / "card.svg.gz").read_bytes()
+        (tmp_path / "card.svg").unlink()
+        write_svgs(str(tmp_path), svgs, ["gzip"])
+        assert (tmp_path / "card.svg.gz").read_bytes() == first
+
+
+class TestResolveVariants:
+    def test_defaults_to_none(self):
+        assert resolve_variants() == []
+
+    def test_svgz_only(self):
+        assert resolve_variants(svgz=True) == ["svgz"]
+
+    def test_precompress_includes_gzip(self):
+        assert resolve_variants(precompress=True)[0] == "gzip"
@@ -0,0 +1,34 @@
+"""Tests for generator.paint."""
+
+import pytest
+
+from generator.paint import Layout, theme_tokens, token
+from generator.utils import DEFAULT_THEME
+
+
+class TestThemeTokens:
+    def test_covers_default_keys(self):
+        tokens = theme_tokens()
+        assert set(tokens) == set(DEFAULT_THEME)
+
+    def test_includes_extra_keys(self):
+        tokens = theme_tokens({**DEFAULT_THEME, "aurora": "#00ff99"})
+        assert tokens["aurora"] == token("aurora")
+
+
+class TestLayout:
+    def test_paint_replaces_tokens(self):
+        layout = Layout(f'<rect fill="{token("void")}" stroke="{token("nebula")}"/>')
+        svg = layout.paint({"void": "#000000", "nebula": "#111111"})
+        assert svg == '<rect fill="#000000" stroke="#111111"/>'
+
+    def test_keys_in_order(self):
+        layout = Layout(f"{token('a')}x{token('b')}{token('a')}")
+        assert layout.keys == ("a", "b", "a")
+
+    def test_plain_markup_unchanged(self):
+        assert Layout("<svg/>").paint({}) == "<svg/>"
+
+    def test_missing_color(self):
+        with pytest.raises(KeyError):
+            Layout(token("void")).paint({})
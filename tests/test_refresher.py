@@ -0,0 +1,119 @@
+"""Tests for generator.refresher."""
+
+import time
+
+import pytest
+
+from generator.config import validate_config
+from generator.github_api import RateLimit
+from generator.refresher import Refresher
+from generator.server import ProfileService
+
+
+@pytest.fixture
+def service(cfg, source, clock):
+    return ProfileService(validate_config(cfg), source, clock=clock)
+
+
+class TestRefresher:
+    def test_expired_data_served_stale_then_refreshed(self, service, source, clock):
+        refresher = Refresher(service)
+        fresh = service.handle("/alice/stats-card.svg")
+        clock.now = 30000  # past every TTL
+        stale = service.handle("/alice/stats-card.svg")
+
+        assert stale.status == 200 and stale.body == fresh.body
+        assert stale.headers["Cache-Control"] == "public, max-age=0"
+        assert len(source.calls) == 3  # nothing fetched inline
+        assert len(refresher) == 3 and service.stats()["stale"] == 3
+
+        while refresher.run_once():
+            pass
+        assert len(source.calls) == 6
+        refreshed = service.handle("/alice/stats-card.svg")
+        assert refreshed.headers["Cache-Control"].endswith("max-age=3600")
+
+    def test_each_dataset_queued_once(self, service, clock):
+        refresher = Refresher(service)
+        service.handle("/alice/stats-card.svg")
+        clock.now = 30000
+        for _ in range(3):
+            service.handle("/alice/stats-card.svg")
+        assert len(refresher) == 3
+
+    def test_popular_and_stale_users_first(self, service, source):
+        refresher = Refresher(service)
+        for _ in range(5):
+            refresher.record("popular")
+        refresher.record("rare")
+        refresher.schedule("rare", "stats", stale_for=0)
+        refresher.schedule("popular", "stats", stale_for=0)
+        refresher.schedule("rare", "languages", stale_for=100 * 3600)  # very stale
+        while refresher.run_once():
+            pass
+        assert source.calls == [("rare", "languages"), ("popular", "stats"), ("rare", "stats")]
+
+    def test_rate_limit_reserve_pauses_refreshes(self, service, source):
+        source.rate_limit = RateLimit(clock=lambda: 0)
+        source.rate_limit.update({"X-RateLimit-Remaining": "50", "X-RateLimit-Reset": "60"})
+        refresher = Refresher(service, reserve=100)
+        refresher.schedule("alice", "stats")
+        assert refresher.run_once() is False and source.calls == []
+        source.rate_limit.update({"X-RateLimit-Remaining": "500", "X-RateLimit-Reset": "60"})
+        assert refresher.run_once() is True
+
+    def test_idle_users_evicted(self, service, clock):
+        refresher = Refresher(service, idle_after=3600)
+        service.handle("/alice/stats-card.svg")
+        clock.now = 1800
+        service.handle("/bob/stats-card.svg")
+        clock.now = 4000
+        assert refresher.evict_idle() == ["alice"]
+        assert service.data.entry(("alice", "stats")) is None
+        assert service.data.entry(("bob", "stats")) is not None
+        assert all(key[0] != "alice" for key in service.renders._entries)
+
+    def test_worker_thread(self, service, source, clock):
+        refresher = Refresher(service)
+        service.handle("/alice/stats-card.svg")
+        clock.now = 30000
+        refresher.start()
+        try:
+            service.handle("/alice/stats-card.svg")
+            deadline = time.monotonic() + 5
+            while refresher.counters["refreshed"] < 3 and time.monotonic() < deadline:
+                time.sleep(0.005)
+        finally:
+            refresher.stop()
+        assert refresher.counters["refreshed"] == 3
+        assert service.stats()["refresher"]["queued"] == 0
+
+    def test_unexpected_errors_counted(self, service, monkeypatch):
+        refresher = Refresher(service)
+
+        def malformed(user, name):
+            raise TypeError("malformed payload")
+
+        monkeypatch.setattr(service, "refresh", malformed)
+        refresher.schedule("alice", "stats")
+        assert refresher.run_once() is True
+        assert refresher.counters["failed"] == 1
+
+    def test_stopped_refresher_falls_back_to_inline_fetch(self, service, source, clock):
+        refresher = Refresher(service)
+        service.handle("/alice/stats-card.svg")
+        refresher.start()
+        refresher.stop()
+        assert not refresher.alive
+        clock.now = 30000
+        response = service.handle("/alice/stats-card.svg")
+        assert response.headers["Cache-Control"].endswith("max-age=3600")
+        assert len(source.calls) == 6 and len(refresher) == 0
+
+    def test_unserved_users_not_recorded(self, cfg, source, clock):
+        config = validate_config(cfg)
+        service = ProfileService(config, source, users={"alice": config}, clock=clock)
+        refresher = Refresher(service)
+        assert service.handle("/mallory/stats-card.svg").status == 404
+        service.handle("/alice/stats-card.svg")
+        assert refresher.stats()["users"] == 1
@@ -0,0 +1,141 @@
+"""Tests for generator.server."""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from generator.batch import RosterEntry
+from generator.config import validate_config
+from generator.server import ProfileService, load_users, make_server
+from generator.svg_builder import SVGBuilder
+
+
+@pytest.fixture
+def service(cfg, source, clock):
+    return ProfileService(validate_config(cfg), source, ttls={"languages": 100}, clock=clock)
+
+
+class TestProfileService:
+    def test_renders_card_like_builder(self, service, cfg, sample_stats, sample_languages,
+                                       sample_contributions):
+        response = service.handle("/alice/stats-card.svg")
+        assert response.status == 200
+        assert response.headers["Content-Type"].startswith("image/svg+xml")
+        config = validate_config({**cfg, "username": "alice"})
+        expected = SVGBuilder(config, sample_stats, sample_languages, sample_contributions)
+        assert response.body.decode() == expected.render_stats_card()
+
+    def test_theme_and_metrics(self, service):
+        dark = service.handle("/alice/stats-card.svg").body
+        light = service.handle("/alice/stats-card.svg?theme=light").body
+        assert dark != light
+        body = service.handle("/alice/stats-card.svg?metrics=streak,stars").body.decode()
+        assert "Streak" in body and "Commits" not in body
+
+    def test_bad_requests(self, service):
+        assert service.handle("/alice/nope.svg").status == 404
+        assert service.handle("/../etc/stats-card.svg").status == 404
+        assert service.handle("/alice/stats-card.svg?theme=nope").status == 400
+        assert service.handle("/alice/stats-card.svg?metrics=commits,bogus").status == 400
+
+    def test_unexpected_error_is_500(self, service, monkeypatch):
+        def broken(*args):
+            raise TypeError("malformed payload")
+
+        monkeypatch.setattr(service.source, "fetch_dataset", broken)
+        response = service.handle("/alice/stats-card.svg")
+        assert response.status == 500
+        assert response.headers["Cache-Control"] == "no-store"
+        assert service.stats()["errors"] == 1
+
+    def test_etag_and_304(self, service):
+        first = service.handle("/alice/tech-stack.svg")
+        etag = first.headers["ETag"]
+        assert etag.startswith('"') and len(etag) == 42
+        again = service.handle("/alice/tech-stack.svg", if_none_match=f'W/{etag}, "other"')
+        assert again.status == 304 and again.body == b""
+        assert service.stats()["not_modified"] == 1
+
+    def test_datasets_cached_with_own_ttl(self, service, source, clock):
+        service.handle("/alice/tech-stack.svg")
+        service.handle("/alice/galaxy-header.svg")
+        assert len(source.calls) == 3  # one fetch per dataset, shared by both cards
+
+        clock.now = 150  # languages (TTL 100) expired, stats/contributions (3600) not
+        response = service.handle("/alice/tech-stack.svg")
+        assert source.calls[3:] == [("alice", "languages")]
+        assert response.headers["Cache-Control"] == "public, max-age=100"
+
+    def test_render_cache_hit(self, service):
+        service.handle("/alice/tech-stack.svg")
+        service.handle("/alice/tech-stack.svg")
+        stats = service.stats()["renders"]
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_fetch_failure_is_502(self, service, source):
+        source.down = True
+        assert service.handle("/alice/stats-card.svg").status == 502
+        assert service.stats()["errors"] == 1
+
+    def test_roster_restricts_users(self, cfg, source):
+        users = load_users([RosterEntry("Alice", {**cfg, "username": "Alice"})])
+        service = ProfileService(validate_config(cfg), source, users=users)
+        assert service.handle("/alice/stats-card.svg").status == 200
+        assert service.handle("/bob/stats-card.svg").status == 404
+
+
+class TestHTTPServer:
+    def test_round_trip(self, service):
+        server = make_server(service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with urllib.request.urlopen(f"{base}/alice/stats-card.svg") as resp:
+                etag = resp.headers["ETag"]
+                assert resp.status == 200 and resp.read().startswith(b"<svg")
+            request = urllib.request.Request(f"{base}/alice/stats-card.svg",
+                                             headers={"If-None-Match": etag})
+            with pytest.raises(urllib.error.HTTPError) as err:
+                urllib.request.urlopen(request)
+            assert err.value.code == 304
+            with urllib.request.urlopen(f"{base}/_stats") as resp:
+                assert json.load(resp)["requests"] == 3
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestCoalescing:
+    def test_concurrent_requests_fetch_and_render_once(self, cfg, make_source):
+        release = threading.Event()
+
+        class SlowSource(make_source):
+            def fetch_dataset(self, username, dataset):
+                release.wait(5)
+                return super().fetch_dataset(username, dataset)
+
+        source = SlowSource()
+        service = ProfileService(validate_config(cfg), source)
+        responses = []
+        threads = [
+            threading.Thread(target=lambda: responses.append(service.handle("/alice/stats-card.svg")))
+            for _ in range(6)
+        ]
+        for t in threads:
+            t.start()
+        deadline = time.monotonic() + 5
+        while service.fetch_flights.coalesced < 5 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert [r.status for r in responses] == [200] * 6
+        assert len({r.body for r in responses}) == 1
+        assert len(source.calls) == 3  # one per dataset
+        assert service.stats()["data"]["coalesced"] >= 5
@@ -0,0 +1,86 @@
+"""Tests for generator.shards."""
+
+import json
+
+import pytest
+
+from generator.batch import RosterEntry, run_batch
+from generator.shards import (
+    INDEX_FILE,
+    MANIFEST_FILE,
+    merge_shards,
+    parse_shard,
+    select_shard,
+    shard_of,
+    write_manifest,
+)
+from generator.sources import DemoSource
+
+NAMES = [f"user-{i}" for i in range(200)]
+
+
+class TestSharding:
+    def test_parse_shard(self):
+        assert parse_shard("2/5") == (2, 5)
+        for bad in ("0/3", "4/3", "1/0", "x/3", "3", "1/2/3"):
+            with pytest.raises(ValueError):
+                parse_shard(bad)
+
+    def test_shards_partition_the_roster(self):
+        entries = [RosterEntry(name, {}) for name in NAMES]
+        shards = [select_shard(entries, i, 4) for i in range(1, 5)]
+        assert sorted(e.name for shard in shards for e in shard) == sorted(NAMES)
+        # Roughly balanced
+        assert all(25 <= len(shard) <= 75 for shard in shards)
+
+    def test_assignment_is_stable(self):
+        # Pinned values: changing the hash would move every user's caches
+        names = ["octocat", "torvalds", "gvanrossum", "alice"]
+        assert [shard_of(name, 4) for name in names] == [2, 1, 3, 2]
+        assert shard_of("Alice", 8) == shard_of("alice", 8)
+
+
+class TestMerge:
+    def _run_shards(self, tmp_path, cfg, count, names):
+        entries = [RosterEntry(name, {**cfg, "username": name}) for name in names]
+        dirs = []
+        for index in range(1, count + 1):
+            root = tmp_path / f"shard-{index}"
+            results = run_batch(select_shard(entries, index, count), DemoSource(), str(root))
+            write_manifest(str(root), results, (index, count))
+            dirs.append(str(root))
+        return dirs
+
+    def test_merge_combines_all_shards(self, tmp_path, cfg):
+        names = ["alice", "bob", "carol", "dave", "erin"]
+        dirs = self._run_shards(tmp_path, cfg, 3, names)
+        index = merge_shards(dirs, str(tmp_path / "merged"))
+
+        assert sorted(index["users"]) == names
+        assert index["missing"] == []
+        assert index["totals"]["ok"] == 5
+        alice = index["users"]["alice"]
+        assert alice["shard"] == shard_of("alice", 3)
+        assert "alice/galaxy-header.svg" in alice["files"]
+        on_disk = json.loads((tmp_path / "merged" / INDEX_FILE).read_text())
+        assert on_disk == index
+
+    def test_manifest_records_file_hashes(self, tmp_path, cfg):
+        self._run_shards(tmp_path, cfg, 1, ["alice"])
+        manifest = json.loads((tmp_path / "shard-1" / MANIFEST_FILE).read_text())
+        info = manifest["users"]["alice"]["files"]["alice/stats-card.svg"]
+        assert info["bytes"] == len((tmp_path / "shard-1" / "alice" / "stats-card.svg").read_bytes())
+        assert len(info["sha1"]) == 40
+
+    def test_missing_shard_reported(self, tmp_path, cfg):
+        dirs = self._run_shards(tmp_path, cfg, 2, ["alice", "bob", "carol"])
+        index = merge_shards(dirs[:1], str(tmp_path / "merged"))
+        assert index["missing"] == [2]
+
+    def test_mismatched_shards_rejected(self, tmp_path, cfg):
+        dirs = self._run_shards(tmp_path, cfg, 2, ["alice", "bob", "carol"])
+        with pytest.raises(ValueError, match="twice"):
+            merge_shards([dirs[0], dirs[0]], str(tmp_path / "merged"))
+        other = self._run_shards(tmp_path / "other", cfg, 3, ["alice"])
+        with pytest.raises(ValueError, match="expected N=2"):
+            merge_shards([dirs[0], other[0]], str(tmp_path / "merged"))
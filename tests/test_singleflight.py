@@ -0,0 +1,82 @@
+"""Tests for generator.singleflight."""
+
+import threading
+import time
+
+import pytest
+
+from generator.singleflight import SingleFlight
+
+
+def _run_concurrently(n, target):
+    results, errors = [], []
+
+    def worker():
+        try:
+            results.append(target())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+def _wait_for_waiters(flight, count):
+    deadline = time.monotonic() + 5
+    while flight.coalesced < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return "result"
+
+        threads, results, errors = _run_concurrently(8, lambda: flight.do("k", compute))
+        _wait_for_waiters(flight, 7)
+        release.set()
+        for t in threads:
+            t.join()
+        assert results == ["result"] * 8 and not errors
+        assert len(calls) == 1 and flight.coalesced == 7
+        assert len(flight) == 0
+
+    def test_error_shared_then_next_call_retries(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fail():
+            release.wait(5)
+            raise ValueError("boom")
+
+        threads, results, errors = _run_concurrently(3, lambda: flight.do("k", fail))
+        _wait_for_waiters(flight, 2)
+        release.set()
+        for t in threads:
+            t.join()
+        assert len(errors) == 3 and all(isinstance(e, ValueError) for e in errors)
+        assert flight.do("k", lambda: "ok") == "ok"
+
+    def test_distinct_keys_not_coalesced(self):
+        flight = SingleFlight()
+        assert [flight.do(k, lambda k=k: k * 2) for k in (1, 2)] == [2, 4]
+        assert flight.coalesced == 0
+
+    def test_sequential_calls_run_again(self):
+        flight = SingleFlight()
+        calls = []
+        for _ in range(2):
+            flight.do("k", lambda: calls.append(1))
+        assert len(calls) == 2
+
+    def test_leader_error_propagates(self):
+        with pytest.raises(KeyError):
+            SingleFlight().do("k", lambda: {}["missing"])
@@ -0,0 +1,34 @@
+"""Tests for generator.skeleton."""
+
+import pytest
+
+from generator.skeleton import Skeleton
+
+
+class TestSkeleton:
+    def test_render_fills_slots(self):
+        skel = Skeleton('<rect fill="$fill" width="${w}px"/>')
+        assert skel.render(fill="#fff", w=10) == '<rect fill="#fff" width="10px"/>'
+
+    def test_slots_listed_in_order(self):
+        assert Skeleton("$a-$b-$a").slots == ("a", "b", "a")
+
+    def test_bound_slots_are_folded_in(self):
+        skel = Skeleton("<svg width=\"$WIDTH\">$body</svg>", WIDTH=850)
+        assert skel.slots == ("body",)
+        assert skel.render(body="x") == '<svg width="850">x</svg>'
+
+    def test_braces_need_no_escaping(self):
+        skel = Skeleton("@keyframes k { 0% { opacity: $op; } }")
+        assert skel.render(op=0.5) == "@keyframes k { 0% { opacity: 0.5; } }"
+
+    def test_dollar_escape(self):
+        assert Skeleton("$$5 $x").render(x="y") == "$5 y"
+
+    def test_missing_slot_raises(self):
+        with pytest.raises(TypeError):
+            Skeleton("$a").render()
+
+    def test_invalid_placeholder_raises(self):
+        with pytest.raises(ValueError):
+            Skeleton("cost: $ 5")
@@ -0,0 +1,54 @@
+"""Tests for generator.starfield."""
+
+import math
+
+import pytest
+
+from generator import starfield
+from generator.starfield import StarLayer
+from generator.utils import deterministic_random
+
+LAYERS = (
+    StarLayer("test-bg-", 40, 10, (0.3, 0.8), (0.1, 0.3), (4.0, 8.0)),
+    StarLayer("test-fg-", 15, 10, (1.0, 1.8), (0.4, 0.7), (2.0, 4.0)),
+)
+
+
+def _points(layers):
+    return [(x, y) for layer in layers for x, y in zip(layer.x, layer.y)]
+
+
+class TestGenerate:
+    def test_uniform_matches_deterministic_random(self):
+        (bg, _) = starfield.generate(LAYERS, 850, 280)
+        assert bg.x == tuple(deterministic_random("test-bg-x", 40, 10, 840))
+        assert bg.d == tuple(deterministic_random("test-bg-d", 40, 4.0, 8.0))
+
+    def test_seed_suffix(self):
+        layer = StarLayer("{user}_s", 5, 10, (1, 2), (0, 1), (1, 2), "_bg")
+        (stars,) = starfield.generate((layer,), 850, 280)
+        assert stars.y == tuple(deterministic_random("{user}_sy_bg", 5, 10, 270))
+
+    def test_cached(self):
+        assert starfield.generate(LAYERS, 850, 280) is starfield.generate(LAYERS, 850, 280)
+
+    def test_poisson_spreads_stars(self):
+        points = _points(starfield.generate(LAYERS, 850, 280, "poisson"))
+        spacing = starfield.DENSITY_SPACING * math.sqrt(850 * 280 / len(points))
+        nearest = min(
+            math.dist(a, b) for i, a in enumerate(points) for b in points[i + 1:]
+        )
+        assert nearest >= spacing * 0.5
+        assert len(points) == 55
+
+    def test_poisson_keeps_margins_and_columns(self):
+        uniform = starfield.generate(LAYERS, 850, 280)
+        poisson = starfield.generate(LAYERS, 850, 280, "poisson")
+        for u, p in zip(uniform, poisson):
+            assert p.r == u.r and p.o == u.o and p.d == u.d
+            assert all(10 <= x <= 840 for x in p.x)
+            assert all(10 <= y <= 270 for y in p.y)
+
+    def test_unknown_placement(self):
+        with pytest.raises(ValueError):
+            starfield.generate(LAYERS, 850, 280, "hexagonal")
@@ -1,11 +1,14 @@
 """Tests for SVG generation (SVGBuilder + templates)."""
 
 import copy
+import re
 
 import pytest
 
 from generator.config import validate_config
+from generator.labels import text_box
 from generator.svg_builder import SVGBuilder
+from generator.utils import DEFAULT_THEME, LIGHT_THEME, PAINT_CLOSE, PAINT_OPEN
 
 
 class TestSVGBuilder:
@@ -21,6 +24,12 @@ class TestSVGBuilder:
         svg = svg_builder.render_galaxy_header()
         assert "Nyx Orion" in svg
 
+    def test_galaxy_header_username_with_braces(self, sample_config, sample_stats,
+                                                sample_languages, sample_contributions):
+        config = validate_config({**copy.deepcopy(sample_config), "username": "me{x}"})
+        builder = SVGBuilder(config, sample_stats, sample_languages, sample_contributions)
+        assert builder.render_galaxy_header().strip().endswith("</svg>")
+
     def test_galaxy_header_contains_animations(self, svg_builder):
         svg = svg_builder.render_galaxy_header()
         assert "animate" in svg
@@ -151,3 +160,177 @@ class TestEdgeCases:
         svg = builder.render_skill_constellation()
         assert svg.strip().startswith("<svg")
         assert svg.strip().endswith("</svg>")
+
+
+class TestHeatmapCompact:
+    def test_compact_valid_svg(self, cfg, sample_stats, sample_languages, sample_contributions):
+        cfg["heatmap"] = {"compact": True}
+        config = validate_config(cfg)
+        builder = SVGBuilder(config, sample_stats, sample_languages, sample_contributions)
+        svg = builder.render_contribution_heatmap()
+        assert svg.strip().startswith("<svg")
+        assert svg.strip().endswith("</svg>")
+
+    def test_compact_one_path_per_level(self, cfg, sample_stats, sample_languages, sample_contributions):
+        cfg["heatmap"] = {"compact": True}
+        config = validate_config(cfg)
+        builder = SVGBuilder(config, sample_stats, sample_languages, sample_contributions)
+        svg = builder.render_contribution_heatmap()
+        assert svg.count("<path ") <= 5
+        assert "hm-cell-appear 0.4s" not in svg
+
+    def test_compact_is_smaller(self, cfg, sample_stats, sample_languages, sample_contributions):
+        default_svg = SVGBuilder(
+            validate_config(copy.deepcopy(cfg)), sample_stats, sample_languages, sample_contributions
+        ).render_contribution_heatmap()
+        cfg["heatmap"] = {"compact": True}
+        compact_svg = SVGBuilder(
+            validate_config(cfg), sample_stats, sample_languages, sample_contributions
+        ).render_contribution_heatmap()
+        assert len(compact_svg) < len(default_svg)
+
+
+class TestThemeVariants:
+    def test_default_paint_matches_fresh_render(self, svg_builder):
+        first = svg_builder.render_all()
+        svg_builder.reset()
+        assert svg_builder.render_all() == first
+
+    def test_light_variant_uses_light_palette(self, svg_builder):
+        svg = svg_builder.render_stats_card(LIGHT_THEME)
+        assert LIGHT_THEME["text_faint"] in svg
+        assert DEFAULT_THEME["text_faint"] not in svg
+
+    def test_no_tokens_left_after_paint(self, svg_builder):
+        for svg in svg_builder.render_all(LIGHT_THEME).values():
+            assert PAINT_OPEN not in svg
+            assert PAINT_CLOSE not in svg
+
+    def test_layout_computed_once_per_card(self, svg_builder, monkeypatch):
+        calls = []
+        original = svg_builder._build_galaxy_header
+        monkeypatch.setattr(
+            svg_builder, "_build_galaxy_header", lambda theme: calls.append(1) or original(theme)
+        )
+        dark = svg_builder.render_galaxy_header()
+        light = svg_builder.render_galaxy_header(LIGHT_THEME)
+        assert len(calls) == 1
+        assert dark != light
+
+    def test_partial_palette_falls_back_to_config_theme(self, svg_builder):
+        svg = svg_builder.render_stats_card({"text_faint": "#123456"})
+        assert "#123456" in svg
+        assert svg_builder.theme["text_bright"] in svg
+
+
+class TestSharedAnimationClasses:
+    def test_skill_starfield_uses_classes(self, svg_builder):
+        svg = svg_builder.render_skill_constellation()
+        stars = re.findall(r'<circle [^>]*class="const-tw-[^"]+"(/?)>', svg)
+        assert len(stars) == 30
+        assert all(stars)  # self-closing: no per-star <animate> children
+
+    def test_project_cards_have_no_smil_transforms(self, svg_builder):
+        svg = svg_builder.render_projects_constellation()
+        assert "<animateTransform" not in svg
+        assert 'class="proj-orbit"' in svg
+        assert 'class="proj-pulse"' in svg
+
+
+class TestStarfieldPlacement:
+    def test_poisson_changes_only_positions(self, cfg, sample_stats, sample_languages, sample_contributions):
+        uniform = SVGBuilder(
+            validate_config(copy.deepcopy(cfg)), sample_stats, sample_languages, sample_contributions
+        ).render_all()
+        cfg["starfield"] = {"placement": "poisson"}
+        poisson = SVGBuilder(
+            validate_config(cfg), sample_stats, sample_languages, sample_contributions
+        ).render_all()
+        for name in ("galaxy-header.svg", "projects-constellation.svg", "skill-constellation.svg"):
+            assert poisson[name] != uniform[name]
+            assert poisson[name].count("<circle") == uniform[name].count("<circle")
+        assert poisson["stats-card.svg"] == uniform["stats-card.svg"]
+
+
+class TestLabelPlacement:
+    def test_dense_timeline_labels_do_not_share_rows(self, cfg, sample_stats, sample_languages, sample_contributions):
+        cfg["timeline"] = [{"year": 2010 + i % 6, "label": f"Entry{i}", "arm": 0} for i in range(30)]
+        config = validate_config(cfg)
+        svg = SVGBuilder(config, sample_stats, sample_languages, sample_contributions).render_coding_timeline()
+        labels = re.findall(r'<text x="([\d.]+)" y="([\d.]+)"[^>]*>(Entry\d+)</text>', svg)
+        assert len(labels) == 30
+        spots = [(float(x), float(y)) for x, y, _ in labels]
+        for i, (x, y) in enumerate(spots):
+            # 6 characters at 10px monospace are ~36px wide
+            assert not any(abs(x - ox) < 36 and oy == y for ox, oy in spots[:i])
+
+    def test_dense_timeline_connectors_reach_labels(self, cfg, sample_stats, sample_languages,
+                                                    sample_contributions):
+        cfg["timeline"] = [{"year": 2010 + i % 6, "label": f"Entry{i}", "arm": 0} for i in range(30)]
+        config = validate_config(cfg)
+        svg = SVGBuilder(config, sample_stats, sample_languages, sample_contributions).render_coding_timeline()
+        connectors = re.findall(r'<line x1="(\d+\.\d)" y1="100" x2="[\d.]+" y2="([\d.]+)" stroke', svg)
+        labels = re.findall(r'<text x="([\d.]+)" y="([\d.]+)"[^>]*>Entry\d+</text>', svg)
+        assert len(connectors) == len(labels) == 30
+        for (_, end), (x, y) in zip(connectors, labels):
+            _, top, _, bottom = text_box("Entry0", 10, float(x), float(y))
+            gap = bottom - float(end) if float(y) < 100 else top - float(end)
+            assert 0 < abs(gap) <= 5
+
+    def test_dense_skill_labels_do_not_overlap(self, cfg, sample_stats, sample_languages, sample_contributions):
+        cfg["galaxy_arms"][0]["items"] = [f"skill{i:02d}" for i in range(20)]
+        config = validate_config(cfg)
+        svg = SVGBuilder(config, sample_stats, sample_languages, sample_contributions).render_skill_constellation()
+        labels = re.findall(
+            r'<text x="([\d.]+)" y="([\d.]+)"[^>]*text-anchor="(\w+)"[^>]*>(skill\d+)</text>', svg
+        )
+        assert len(labels) == 20
+        boxes = [text_box(text, 9, float(x), float(y), anchor) for x, y, anchor, text in labels]
+        for i, a in enumerate(boxes):
+            for b in boxes[:i]:
+                assert min(a[2], b[2]) <= max(a[0], b[0]) or min(a[3], b[3]) <= max(a[1], b[1])
+
+
+class TestConstellationScaling:
+    def _render(self, cfg, stats, languages, contributions, n, **constellation):
+        cfg["galaxy_arms"][0]["items"] = [f"skill{i}" for i in range(n)]
+        cfg["constellation"] = constellation
+        config = validate_config(cfg)
+        return SVGBuilder(config, stats, languages, contributions).render_skill_constellation()
+
+    def test_mst_draws_one_line_less_than_stars(self, cfg, sample_stats, sample_languages, sample_contributions):
+        chain = self._render(copy.deepcopy(cfg), sample_stats, sample_languages, sample_contributions, 12)
+        mst = self._render(cfg, sample_stats, sample_languages, sample_contributions, 12, links="mst")
+        # Chain mode also closes the loop (n - 1 + 1 lines); the tree has n - 1
+        assert chain.count("const-line-draw 1s") - mst.count("const-line-draw 1s") == 1
+
+    def test_budget_collapses_long_tail(self, cfg, sample_stats, sample_languages, sample_contributions):
+        svg = self._render(cfg, sample_stats, sample_languages, sample_contributions, 40, max_items_per_arm=10)
+        assert ">skill8<" in svg
+        assert ">skill9<" not in svg
+        assert "+31 more" in svg
+
+    def test_budget_not_reached(self, cfg, sample_stats, sample_languages, sample_contributions):
+        svg = self._render(cfg, sample_stats, sample_languages, sample_contributions, 5, max_items_per_arm=10)
+        assert "more</text>" not in svg
+
+
+class TestContributionAnalytics:
+    def test_calendar_metrics_on_stats_card(self, cfg, sample_stats, sample_languages, sample_contributions):
+        cfg["stats"] = {"metrics": ["commits", "streak", "last_30d"]}
+        builder = SVGBuilder(validate_config(cfg), sample_stats, sample_languages, sample_contributions)
+        svg = builder.render_stats_card()
+        assert "Streak" in svg
+        assert "Last 30d" in svg
+        assert f">{builder.analytics.current_streak}</text>" in svg
+
+    def test_heatmap_month_totals_opt_in(self, cfg, sample_stats, sample_languages, sample_contributions):
+        plain = SVGBuilder(
+            validate_config(copy.deepcopy(cfg)), sample_stats, sample_languages, sample_contributions
+        ).render_contribution_heatmap()
+        cfg["heatmap"] = {"month_totals": True}
+        svg = SVGBuilder(
+            validate_config(cfg), sample_stats, sample_languages, sample_contributions
+        ).render_contribution_heatmap()
+        assert "<tspan" not in plain
+        assert svg.count("<tspan") >= 10
@@ -0,0 +1,26 @@
+"""Tests for generator.ttl_cache."""
+
+from generator.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    def test_entries_expire_individually(self, clock):
+        cache = TTLCache(clock=clock)
+        cache.set("short", 1, ttl=10)
+        cache.set("long", 2, ttl=100)
+        clock.now = 50
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+        assert (cache.hits, cache.misses) == (1, 1)
+        # Expired entries stay readable until evicted
+        assert cache.entry("short").value == 1
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        assert len(cache) == 2
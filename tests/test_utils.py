@@ -4,11 +4,15 @@ import pytest
 
 from generator.utils import (
     DEFAULT_THEME,
+    LIGHT_THEME,
+    PAINT_OPEN,
     calculate_language_percentages,
+    deterministic_array,
     deterministic_random,
     esc,
     format_number,
     get_language_color,
+    resolve_named_theme,
     resolve_theme,
     spiral_points,
     wrap_text,
@@ -107,6 +111,36 @@ class TestDeterministicRandom:
         values = deterministic_random("test", 20, 10, 50)
         assert all(10 <= v <= 50 for v in values)
 
+    def test_compat_matches_original_stream(self):
+        import hashlib
+
+        expected = [
+            10 + int(hashlib.md5(f"test_{i}".encode()).hexdigest()[:8], 16) / 0xFFFFFFFF * 40
+            for i in range(20)
+        ]
+        assert deterministic_random("test", 20, 10, 50) == expected
+
+    def test_fast_stream(self):
+        values = deterministic_random("test", 10, 10, 50, compat=False)
+        assert len(values) == 10
+        assert all(10 <= v <= 50 for v in values)
+        assert values == deterministic_random("test", 10, 10, 50, compat=False)
+        assert values != deterministic_random("test", 10, 10, 50)
+
+    def test_fast_stream_prefix_stable(self):
+        # Asking for more values extends the stream without changing it
+        short = deterministic_random("test", 5, 0, 1, compat=False)
+        assert deterministic_random("test", 9, 0, 1, compat=False)[:5] == short
+
+    def test_empty(self):
+        assert deterministic_random("test", 0, 0, 1) == []
+
+    @pytest.mark.parametrize("compat", [True, False])
+    def test_array_matches_list(self, compat):
+        pytest.importorskip("numpy")
+        values = deterministic_array("test", 11, -5, 5, compat=compat)
+        assert values.tolist() == deterministic_random("test", 11, -5, 5, compat=compat)
+
     def test_count(self):
         values = deterministic_random("test", 7, 0, 1)
         assert len(values) == 7
@@ -125,6 +159,9 @@ class TestEsc:
     def test_normal_text(self):
         assert esc("hello") == "hello"
 
+    def test_paint_tokens_escaped(self):
+        assert PAINT_OPEN not in esc(f"{PAINT_OPEN}void")
+
 
 class TestSpiralPoints:
     def test_count(self):
@@ -159,6 +196,28 @@ class TestResolveTheme:
         assert result == DEFAULT_THEME
 
 
+class TestResolveNamedTheme:
+    def test_dark_is_config_theme(self):
+        config = {"theme": resolve_theme({"void": "#112233"}), "themes": {}}
+        assert resolve_named_theme("dark", config)["void"] == "#112233"
+
+    def test_light_preset_with_overrides(self):
+        config = {"theme": DEFAULT_THEME, "themes": {"light": {"synapse_cyan": "#0550ae"}}}
+        result = resolve_named_theme("light", config)
+        assert result["synapse_cyan"] == "#0550ae"
+        assert result["void"] == LIGHT_THEME["void"]
+
+    def test_custom_name_starts_from_default(self):
+        config = {"theme": DEFAULT_THEME, "themes": {"sepia": {"void": "#f4ecd8"}}}
+        result = resolve_named_theme("sepia", config)
+        assert result["void"] == "#f4ecd8"
+        assert result["text_dim"] == DEFAULT_THEME["text_dim"]
+
+    def test_unknown_name(self):
+        with pytest.raises(KeyError):
+            resolve_named_theme("neon", {"theme": DEFAULT_THEME, "themes": {}})
+
+
 class TestGetLanguageColor:
     def test_known_language(self):
         assert get_language_color("Python") == "#3572A5"
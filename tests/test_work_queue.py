@@ -0,0 +1,97 @@
+"""Tests for generator.work_queue."""
+
+import pytest
+
+from generator.sources import DemoSource
+from generator.work_queue import WorkQueue
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    q = WorkQueue(str(tmp_path / "queue.sqlite"), max_attempts=3, backoff=10, clock=clock)
+    yield q
+    q.close()
+
+
+DATA = DemoSource().fetch("anyone")
+
+
+class TestWorkQueue:
+    def test_enqueue_in_roster_order(self, queue):
+        counts = queue.enqueue({"b": "1", "a": "1", "c": "1"})
+        assert counts["pending"] == 3
+        assert queue.ready() == ["b", "a", "c"]
+
+    def test_lifecycle_and_data_round_trip(self, queue):
+        queue.enqueue({"alice": "1"})
+        assert queue.load_data("alice") is None
+        queue.mark_fetched("alice", DATA)
+        assert queue.load_data("alice") == DATA
+        queue.mark_rendered("alice")
+        assert queue.state("alice") == ("rendered", 0, None)
+        assert queue.ready() == []
+        assert queue.next_retry() is None
+
+    def test_transient_failures_back_off_then_fail(self, queue, clock):
+        queue.enqueue({"alice": "1"})
+        assert queue.mark_failed("alice", "timeout", transient=True) is True
+        assert queue.ready() == []
+        assert queue.next_retry() == 10
+        clock.now += 10
+        assert queue.ready() == ["alice"]
+        assert queue.mark_failed("alice", "timeout", transient=True) is True
+        assert queue.next_retry() == 20  # doubled
+        clock.now += 20
+        assert queue.mark_failed("alice", "timeout", transient=True) is False
+        assert queue.state("alice") == ("failed", 3, "timeout")
+
+    def test_permanent_failure_is_final(self, queue):
+        queue.enqueue({"alice": "1"})
+        assert queue.mark_failed("alice", "bad config") is False
+        assert queue.counts()["failed"] == 1
+
+    def test_resume_keeps_states_and_adds_new_users(self, tmp_path, queue, clock):
+        queue.enqueue({"alice": "1", "bob": "1"})
+        queue.mark_fetched("alice", DATA)
+        queue.mark_rendered("bob")
+        queue.close()
+
+        reopened = WorkQueue(str(tmp_path / "queue.sqlite"), clock=clock)
+        reopened.enqueue({"alice": "1", "bob": "1", "carol": "1"}, resume=True)
+        assert reopened.ready() == ["alice", "carol"]
+        assert reopened.load_data("alice") == DATA
+        reopened.close()
+
+    def test_resume_rerenders_users_whose_config_changed(self, queue, clock):
+        queue.enqueue({"alice": "1", "bob": "1"})
+        for name in ("alice", "bob"):
+            queue.mark_fetched(name, DATA)
+            queue.mark_rendered(name)
+
+        queue.enqueue({"alice": "1", "bob": "2"}, resume=True)
+        assert queue.ready() == ["bob"]
+        assert queue.load_data("bob") == DATA
+        queue.mark_rendered("bob")
+
+        # The new digest was recorded once bob was rendered with it
+        queue.enqueue({"alice": "1", "bob": "2"}, fresh_for=3600)
+        assert queue.ready() == []
+
+    def test_new_run_resets_all_but_fresh_users(self, queue, clock):
+        queue.enqueue({"alice": "1", "bob": "1", "carol": "1"})
+        for name in ("alice", "bob", "carol"):
+            queue.mark_fetched(name, DATA)
+            queue.mark_rendered(name)
+        clock.now += 600
+
+        # alice: fresh and unchanged -> skipped; bob: config changed -> re-rendered
+        # from stored data; carol: dropped from the roster
+        queue.enqueue({"alice": "1", "bob": "2"}, fresh_for=3600)
+        assert queue.ready() == ["bob"]
+        assert queue.load_data("bob") == DATA
+        assert queue.state("carol") is None
+
+        clock.now += 3600
+        queue.enqueue({"alice": "1", "bob": "2"}, fresh_for=3600)
+        assert queue.ready() == ["alice", "bob"]
+        assert queue.load_data("alice") is None